@@ -1,3 +1,4 @@
+from src.startup import print_import_report  # first: records process start time
 import signal
 import sys
 import logging
@@ -18,6 +19,10 @@ def signal_handler(sig, frame):
     sys.exit(0)
 
 if __name__ == "__main__":
+    if "--startup-report" in sys.argv:
+        # Import-time report; exits non-zero if a heavy dependency loads eagerly
+        sys.exit(print_import_report())
+
     signal.signal(signal.SIGINT, signal_handler)
     app = YTMusicApp()
     try:
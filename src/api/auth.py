@@ -1,14 +1,16 @@
 import logging
-from typing import Optional, Dict
-from ytmusicapi import YTMusic
+from typing import TYPE_CHECKING, Optional, Dict
+
+if TYPE_CHECKING:
+    from ytmusicapi import YTMusic
 
 class AuthManager:
     def __init__(self):
-        self._api: Optional[YTMusic] = None
+        self._api: Optional["YTMusic"] = None
         self.logger = logging.getLogger(__name__)
 
     @property
-    def api(self) -> YTMusic:
+    def api(self) -> "YTMusic":
         """Returns the authenticated YTMusic instance, initializing it if necessary."""
         if self._api is None:
             self.login_guest()
@@ -18,9 +20,17 @@ class AuthManager:
         """Always True in Guest Mode (we are 'authenticated' as guest)."""
         return self._api is not None
 
+    def has_account(self) -> bool:
+        """True when signed in to an account; guest mode can't rate songs."""
+        from ytmusicapi.auth.types import AuthType
+        return self._api is not None and getattr(self._api, "auth_type", AuthType.UNAUTHORIZED) != AuthType.UNAUTHORIZED
+
     def login_guest(self) -> None:
         """Initialize valid public API for guest usage."""
-        self._api = YTMusic() # No auth works for public search/radio
+        # Imported here: ytmusicapi/requests are not needed to draw the first frame
+        from ytmusicapi import YTMusic
+        from src.api.http import get_session
+        self._api = YTMusic(requests_session=get_session()) # No auth works for public search/radio
 
     def logout(self):
         self._api = None
@@ -0,0 +1,105 @@
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from src.config import get_data_dir
+
+logger = logging.getLogger(__name__)
+
+
+class ResponseCache:
+    """Bounded in-memory + on-disk cache for API responses.
+
+    Entries are fresh for ``ttl`` seconds and may still be served as stale
+    (while the caller revalidates them) for ``stale_ttl`` seconds after that.
+    The least recently used entries are evicted beyond ``max_entries``. The
+    disk copy under ``<data dir>/cache/<name>.json`` is rewritten at most
+    every ``save_interval`` seconds and on ``flush()``.
+    """
+
+    def __init__(self, name, ttl, stale_ttl=86400, max_entries=200, save_interval=5.0):
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_entries = max_entries
+        self.save_interval = save_interval
+        cache_dir = get_data_dir() / "cache"
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        self.path = cache_dir / f"{name}.json"
+        self.stats = {"hits": 0, "stale_hits": 0, "misses": 0}
+        self._entries = OrderedDict()  # key -> {"value": ..., "stored": ts}
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._last_save = 0.0
+        self._load()
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable cache {self.path}: {e}")
+            return
+
+        horizon = time.time() - self.ttl - self.stale_ttl
+        for key, entry in data.items():
+            if entry.get("stored", 0) > horizon:
+                self._entries[key] = entry
+
+    def lookup(self, key):
+        """Return ``(value, fresh)``; value is None on a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                age = time.time() - entry["stored"]
+                if age <= self.ttl:
+                    self.stats["hits"] += 1
+                    self._entries.move_to_end(key)
+                    return entry["value"], True
+                if age <= self.ttl + self.stale_ttl:
+                    self.stats["stale_hits"] += 1
+                    self._entries.move_to_end(key)
+                    return entry["value"], False
+                del self._entries[key]
+            self.stats["misses"] += 1
+            return None, False
+
+    def store(self, key, value):
+        with self._lock:
+            self._entries[key] = {"value": value, "stored": time.time()}
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            self._dirty = True
+            if time.time() - self._last_save >= self.save_interval:
+                self._save()
+
+    def invalidate(self, key):
+        with self._lock:
+            if self._entries.pop(key, None) is not None:
+                self._dirty = True
+
+    def flush(self):
+        """Persist pending changes now."""
+        with self._lock:
+            if self._dirty:
+                self._save()
+
+    def _save(self):
+        """Write atomically so a crash never leaves a torn file. Caller holds _lock."""
+        tmp_path = f"{self.path}.tmp"
+        try:
+            with open(tmp_path, "w") as f:
+                json.dump(self._entries, f)
+            os.replace(tmp_path, self.path)
+            self._dirty = False
+            self._last_save = time.time()
+        except (OSError, TypeError, ValueError) as e:
+            logger.warning(f"Could not persist cache {self.path}: {e}")
+
+    def __len__(self):
+        return len(self._entries)
@@ -1,8 +1,26 @@
+import asyncio
 import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
-from ytmusicapi import YTMusic
+from typing import TYPE_CHECKING
 
 from src.api.auth import AuthManager
+from src.api.cache import ResponseCache
+from src.api.guard import ApiGuard, CircuitOpenError
+from src.api.library import LibraryIndex
+from src.api.ratings import INDIFFERENT, LIKE, RatingQueue
+from src.config import load_settings
+
+if TYPE_CHECKING:
+    import httpx
+    from ytmusicapi import YTMusic
+
+    from src.api.playlists import PlaylistPager
+    from src.api.search import SearchPager
+
+# ytmusicapi, requests and httpx are imported on first use (see src/startup.py)
 
 logger = logging.getLogger(__name__)
 
@@ -10,67 +28,394 @@ logger = logging.getLogger(__name__)
 class YTMusicClient:
     def __init__(self, auth_manager: AuthManager):
         self.auth_manager = auth_manager
-        self._public_api: YTMusic | None = None
+        self._public_api: "YTMusic | None" = None
+
+        settings = load_settings()
+        # Every API request goes through the rate limiter and the breaker of its endpoint
+        self.guard = ApiGuard(
+            rate=settings["api_rate_per_sec"],
+            burst=settings["api_burst"],
+            failure_threshold=settings["breaker_failures"],
+            reset_timeout=settings["breaker_reset"],
+            is_local_error=self._is_permanent_error,
+        )
+        self.search_cache = ResponseCache(
+            "search",
+            ttl=settings["search_cache_ttl"],
+            max_entries=settings["search_cache_size"],
+        )
+        # Last home feed / library playlists, shown at launch without the network
+        self.feed_cache = ResponseCache(
+            "feeds",
+            ttl=settings["feed_cache_ttl"],
+            stale_ttl=30 * 86400,
+            max_entries=8,
+        )
+        self._refreshing: set[str] = set()
+        self._refresh_lock = threading.Lock()
+        self._background = ThreadPoolExecutor(max_workers=2, thread_name_prefix="api-refresh")
+        self._expand_pool = ThreadPoolExecutor(
+            max_workers=settings["home_expand_workers"], thread_name_prefix="home-expand"
+        )
+        self.home_expand_max = settings["home_expand_max"]
+        self.home_playlist_tracks = settings["home_playlist_tracks"]
+        # Continuation state of recent paginated searches (query key -> pager)
+        self._pagers: "OrderedDict[str, SearchPager]" = OrderedDict()
+        self._pagers_lock = threading.Lock()
+        # Every track we see is indexed for offline search
+        self.library = LibraryIndex()
+        self.local_search_limit = settings["local_search_limit"]
+        # Likes are sent in the background; pending ones survive restarts
+        self.ratings = RatingQueue(self._rate, is_permanent=self._is_permanent_error)
 
     @property
     def api(self):
         return self.auth_manager.api
 
     @property
-    def public_api(self) -> YTMusic:
+    def public_api(self) -> "YTMusic":
         """Unauthenticated YTMusic instance used as fallback for search."""
         if self._public_api is None:
-            self._public_api = YTMusic()
+            from ytmusicapi import YTMusic
+            from src.api.http import get_session
+            self._public_api = YTMusic(requests_session=get_session())
         return self._public_api
 
-    def search_songs(self, query, limit=15):
-        """Search for songs. Falls back to unauthenticated search on OAuth 400 errors."""
+    @property
+    def http(self) -> "httpx.AsyncClient":
+        """Shared async HTTP pool for cancellable requests from the event loop."""
+        from src.api.http import get_async_client
+        return get_async_client()
+
+    @staticmethod
+    def _search_key(query, limit):
+        return f"{' '.join(query.lower().split())}|{limit}"
+
+    def search_songs(self, query, limit=15, on_refresh=None):
+        """Search for songs, serving cached results when available.
+
+        A stale cached result is returned immediately and revalidated in the
+        background; ``on_refresh(results)`` is then called from a worker
+        thread with the fresh list.
+        """
+        key = self._search_key(query, limit)
+        cached, fresh = self.search_cache.lookup(key)
+        if cached is not None:
+            if not fresh:
+                self._revalidate(self.search_cache, key, lambda: self._search_remote(query, limit), cached, on_refresh)
+            return cached
+
+        results = self._search_remote(query, limit)
+        self.search_cache.store(key, results)
+        return results
+
+    async def search_songs_async(self, query, limit=15, on_refresh=None):
+        """Async variant of search_songs; cancelling the caller aborts the request."""
+        from src.api.search import search_async
+
+        key = self._search_key(query, limit)
+        cached, fresh = self.search_cache.lookup(key)
+        if cached is not None:
+            if not fresh:
+                self._revalidate(self.search_cache, key, lambda: self._search_remote(query, limit), cached, on_refresh)
+            return cached
+
+        try:
+            results = await self.guard.call_async("search", search_async, self.http, self.api, query, limit)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            if not isinstance(e, CircuitOpenError):
+                logger.warning(f"Authenticated search failed: {e}. Falling back to public search.")
+            results = await self.guard.call_async(
+                "search:public", search_async, self.http, self.public_api, query, limit
+            )
+        results = self._songs_only(results)
+        self.search_cache.store(key, results)
+        self.remember_tracks(results)
+        return results
+
+    def search_local(self, query, limit=None) -> list:
+        """Instant matches from the offline library index (no network)."""
+        return self.library.search(query, limit=limit or self.local_search_limit)
+
+    def remember_tracks(self, tracks):
+        """Index track dicts for offline search, off the caller's thread."""
+        tracks = [t for t in tracks or [] if isinstance(t, dict) and t.get("videoId")]
+        if tracks:
+            self._background.submit(self.library.add_tracks, tracks)
+
+    @staticmethod
+    def _songs_only(results):
+        return [r for r in results if r.get("resultType") in ["song", "video"]]
+
+    def search_more(self, query, shown=(), max_pages=3) -> list:
+        """Fetch the next page of song results for ``query``.
+
+        Continuation state is kept per query, so each call downloads a
+        single page instead of everything shown so far. Songs whose
+        videoId is in ``shown`` (already on screen) are left out, and
+        while that leaves less than half a page the following page is
+        fetched too (up to ``max_pages``): the first page of the songs
+        pager largely repeats what the unfiltered first search showed.
+        """
+        from src.api.search import SearchPager
+
+        key = " ".join(query.lower().split())
+        with self._pagers_lock:
+            pager = self._pagers.get(key)
+            if pager is None:
+                pager = SearchPager(self.api, query)
+                self._pagers[key] = pager
+                while len(self._pagers) > 8:
+                    self._pagers.popitem(last=False)
+            self._pagers.move_to_end(key)
+
+        results = []
+        for _ in range(max_pages):
+            pager, page = self._next_search_page(key, pager)
+            self.remember_tracks(page)
+            new = [r for r in page if r.get("videoId") not in shown]
+            results.extend(new)
+            if not page or pager.exhausted or len(new) * 2 >= len(page):
+                break
+        return results
+
+    def _next_search_page(self, key, pager):
+        """(pager, next page); restarts on the public API if the account search fails."""
+        try:
+            return pager, self._fetch_search_page(pager)
+        except Exception as e:
+            if pager.api is self.public_api:
+                raise
+            # Same OAuth fallback as search_songs; restart on the public API
+            if not isinstance(e, CircuitOpenError):
+                logger.warning(f"Authenticated paging failed: {e}. Falling back to public search.")
+            from src.api.search import SearchPager
+            pager = SearchPager(self.public_api, pager.query)
+            with self._pagers_lock:
+                self._pagers[key] = pager
+            return pager, self._fetch_search_page(pager)
+
+    def _fetch_search_page(self, pager):
+        endpoint = "search:public" if pager.api is self._public_api else "search"
+        return self.guard.call(endpoint, pager.next_page)
+
+    def _revalidate(self, cache, key, fetch, stale, on_refresh):
+        """Refresh a stale cache entry in the background (one refresh per key)."""
+        with self._refresh_lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        def _refresh():
+            try:
+                value = fetch()
+                cache.store(key, value)
+                if on_refresh and value != stale:
+                    on_refresh(value)
+            except CircuitOpenError as e:
+                logger.debug(f"Background refresh skipped for {key!r}: {e}")
+            except Exception as e:
+                logger.warning(f"Background refresh failed for {key!r}: {e}")
+            finally:
+                with self._refresh_lock:
+                    self._refreshing.discard(key)
+
+        self._background.submit(_refresh)
+
+    def _cached(self, cache, key, fetch, on_refresh=None, force=False):
+        """Stale-while-revalidate read; ``force`` goes to the network first.
+
+        If the network fails (or its circuit is open) and a snapshot (even
+        a stale one) exists, the snapshot is returned instead of the error.
+        """
+        cached, fresh = cache.lookup(key)
+        if cached is not None and not force:
+            if not fresh:
+                self._revalidate(cache, key, fetch, cached, on_refresh)
+            return cached
+        try:
+            value = fetch()
+        except Exception as e:
+            if cached is None:
+                raise
+            logger.warning(f"Refreshing {key!r} failed, serving the cached copy: {e}")
+            return cached
+        cache.store(key, value)
+        return value
+
+    def _search_remote(self, query, limit):
+        """Search for songs. Falls back to unauthenticated search when the account search fails.
+
+        While the authenticated endpoint's circuit is open the public API
+        is used directly; when both are open this fails at once with
+        CircuitOpenError instead of waiting on two doomed requests.
+        """
         try:
-            results = self.api.search(query, limit=limit)
-            return [r for r in results if r.get("resultType") in ["song", "video"]]
+            results = self.guard.call("search", self.api.search, query, limit=limit)
         except Exception as e:
             # Fallback to public API on any error (400, 401, 403, or invalid client)
-            logger.warning(f"Authenticated search failed: {e}. Falling back to public search.")
+            if not isinstance(e, CircuitOpenError):
+                logger.warning(f"Authenticated search failed: {e}. Falling back to public search.")
             try:
-                results = self.public_api.search(query, limit=limit)
-                return [r for r in results if r.get("resultType") in ["song", "video"]]
+                results = self.guard.call("search:public", self.public_api.search, query, limit=limit)
             except Exception as fallback_err:
                 logger.error(f"Public search also failed: {fallback_err}")
                 raise fallback_err
+        results = self._songs_only(results)
+        self.remember_tracks(results)
+        return results
+
+    def flush_caches(self):
+        """Persist cached responses to disk (called on quit)."""
+        self.search_cache.flush()
+        self.feed_cache.flush()
+        self.ratings.close()
+
+    def shutdown(self):
+        """Drop queued background refreshes and expansions (called on quit)."""
+        self._background.shutdown(wait=False, cancel_futures=True)
+        self._expand_pool.shutdown(wait=False, cancel_futures=True)
+
+    def cache_stats(self) -> dict:
+        """Hit/miss counters of the client caches, for tuning."""
+        return {
+            "search": dict(self.search_cache.stats, entries=len(self.search_cache)),
+            "feeds": dict(self.feed_cache.stats, entries=len(self.feed_cache)),
+        }
 
-    def get_library_playlists(self):
-        return self.api.get_library_playlists()
+    def api_stats(self) -> dict:
+        """Per-endpoint call/error counters, latency and circuit state."""
+        return {"rate_per_sec": self.guard.bucket.rate, "endpoints": self.guard.stats()}
+
+    def get_library_playlists(self, on_refresh=None, force=False):
+        """Library playlists from the last snapshot, refreshed when stale."""
+        return self._cached(
+            self.feed_cache,
+            "library_playlists",
+            lambda: self.guard.call("library", self.api.get_library_playlists),
+            on_refresh,
+            force,
+        )
+
+    def cached_library_playlists(self):
+        """Last snapshot of the library playlists, or None (never hits the network)."""
+        return self.feed_cache.lookup("library_playlists")[0]
 
     def get_playlist_songs(self, playlist_id):
         """Get tracks from a specific playlist."""
-        return self.api.get_playlist(playlist_id)
+        return self.guard.call("playlist", self.api.get_playlist, playlist_id)
+
+    def playlist_pager(self, playlist_id) -> "PlaylistPager":
+        """Page through a playlist's tracks; ``"liked"`` selects Liked Music.
+
+        Unlike get_playlist_songs/get_liked_songs this is not capped and
+        each ``next_page()`` is a single request, so callers can show
+        tracks while the rest of the playlist is still downloading.
+        """
+        from src.api.playlists import LIKED_PLAYLIST_ID, PlaylistPager
+        if playlist_id == "liked":
+            playlist_id = LIKED_PLAYLIST_ID
+        return PlaylistPager(self.api, playlist_id, on_page=self.remember_tracks, guard=self.guard)
 
     def get_liked_songs(self, limit=50):
         """Get the 'Liked Music' playlist content."""
-        return self.api.get_liked_songs(limit=limit)
+        return self.guard.call("playlist", self.api.get_liked_songs, limit=limit)
 
-    def get_home(self, limit=3):
-        """Get home page sections and flatten them into a list of tracks."""
-        try:
-            home_data = self.api.get_home(limit=limit)
-            tracks = []
-            for section in home_data:
-                # Each section has 'contents' which can be tracks, albums, or playlists
-                for item in section.get("contents", []):
-                    # We only want items that look like tracks (have videoId)
-                    if "videoId" in item:
+    def get_home(self, limit=3, on_refresh=None, force=False, on_tracks=None):
+        """Home feed tracks from the last snapshot, refreshed when stale.
+
+        On a network fetch, ``on_tracks(batch)`` (if given) is called from
+        a worker thread first with the feed's direct tracks and then once
+        per expanded album/playlist, so the caller can show them as they
+        arrive. Errors propagate unless there is a snapshot to fall back on.
+        """
+        return self._cached(
+            self.feed_cache, f"home|{limit}", lambda: self._fetch_home(limit, on_tracks), on_refresh, force
+        )
+
+    def cached_home(self, limit=3):
+        """Last snapshot of the home feed, or None (never hits the network)."""
+        return self.feed_cache.lookup(f"home|{limit}")[0]
+
+    def _fetch_home(self, limit, on_tracks=None):
+        """Get home page sections and flatten them into a list of tracks.
+
+        Albums and playlists are expanded concurrently (bounded by the
+        home-expand pool and home_expand_max); tracks seen in an earlier
+        section are skipped.
+        """
+        home_data = self.guard.call("home", self.api.get_home, limit=limit)
+        tracks, containers, seen = [], [], set()
+        for section in home_data:
+            # Each section has 'contents' which can be tracks, albums, or playlists
+            for item in section.get("contents", []):
+                if item.get("videoId"):
+                    if item["videoId"] not in seen:
+                        seen.add(item["videoId"])
                         tracks.append(item)
-                    # If it's an album or playlist, we could potentially expand it, 
-                    # but for 'Search Home' button, let's keep it to direct tracks found on home
+                elif (item.get("browseId") or "").startswith("MPRE") or item.get("playlistId"):
+                    containers.append(item)
+
+        if on_tracks:
+            on_tracks(list(tracks))
+
+        futures = [self._expand_pool.submit(self._expand, item) for item in containers[:self.home_expand_max]]
+        for future in as_completed(futures):
+            try:
+                expanded = future.result()
+            except Exception as e:
+                logger.warning(f"Could not expand home item: {e}")
+                continue
+            batch = []
+            for track in expanded:
+                video_id = track.get("videoId")
+                if video_id and video_id not in seen:
+                    seen.add(video_id)
+                    batch.append(track)
+            if batch:
+                tracks.extend(batch)
+                if on_tracks:
+                    on_tracks(batch)
+
+        self.remember_tracks(tracks)
+        return tracks
+
+    def _expand(self, item) -> list:
+        """Tracks of a home feed album or playlist."""
+        browse_id = item.get("browseId") or ""
+        if browse_id.startswith("MPRE"):
+            album = self.guard.call("album", self.api.get_album, browse_id)
+            tracks = album.get("tracks", [])
+            # Album tracks come without art or album name; borrow the album's
+            for track in tracks:
+                if not track.get("album"):
+                    track["album"] = {"name": album.get("title"), "id": browse_id}
+                if not track.get("thumbnails"):
+                    track["thumbnails"] = album.get("thumbnails") or item.get("thumbnails")
             return tracks
-        except Exception:
-            return []
+        playlist = self.guard.call(
+            "playlist", self.api.get_playlist, item["playlistId"], limit=self.home_playlist_tracks
+        )
+        return playlist.get("tracks", [])[:self.home_playlist_tracks]
+
+    def set_liked(self, video_id, liked: bool, was_liked: bool):
+        """Queue a like/unlike; returns at once, the request is sent later.
+
+        Guest mode has no account to rate with: the like stays local.
+        """
+        if not self.auth_manager.has_account():
+            return
+        self.ratings.submit(video_id, LIKE if liked else INDIFFERENT, LIKE if was_liked else INDIFFERENT)
 
-    def like_song(self, video_id):
-        """Rate a song as 'LIKE'."""
-        return self.api.rate_song(video_id, rating="LIKE")
+    def _rate(self, video_id, rating):
+        # An open circuit is not permanent: the queue backs off and retries
+        return self.guard.call("rate", self.api.rate_song, video_id, rating=rating)
 
-    def unlike_song(self, video_id):
-        """Remove rating from a song ('INDIFFERENT')."""
-        return self.api.rate_song(video_id, rating="INDIFFERENT")
+    @staticmethod
+    def _is_permanent_error(error) -> bool:
+        # Raised before any request, e.g. rating without an account (guest mode)
+        from ytmusicapi.exceptions import YTMusicUserError
+        return isinstance(error, YTMusicUserError)
 
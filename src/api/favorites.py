@@ -0,0 +1,112 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+from src.config import get_data_dir
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS favorites (
+    video_id TEXT PRIMARY KEY,
+    added REAL NOT NULL,
+    data TEXT NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS favorites_added ON favorites(added);
+"""
+
+
+class FavoritesStore:
+    """Local favorites kept in SQLite (``<data dir>/favorites.db``, WAL mode).
+
+    Each like/unlike is a single-row transaction, so a toggle costs the
+    same with ten favorites or ten thousand and a crash can never leave a
+    half-written file behind. Only the set of ids is read at startup;
+    track metadata is fetched when a favorite is actually displayed.
+    A legacy ``favorites.json`` is imported once and renamed aside.
+    """
+
+    def __init__(self, path=None, legacy_path=None):
+        data_dir = get_data_dir()
+        self.path = path or data_dir / "favorites.db"
+        self.legacy_path = legacy_path or data_dir / "favorites.json"
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+        self._migrate_legacy()
+        self._ids = {row[0] for row in self._conn.execute("SELECT video_id FROM favorites")}
+
+    def _migrate_legacy(self):
+        if not os.path.exists(self.legacy_path):
+            return
+        try:
+            with open(self.legacy_path, "r") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not read legacy favorites {self.legacy_path}: {e}")
+            return
+        # Oldest format was a bare list of ids
+        if isinstance(data, list):
+            data = {vid: {"title": "Unknown", "videoId": vid} for vid in data}
+        now = time.time()
+        rows = [
+            (vid, now + i * 1e-6, json.dumps(dict(song, videoId=vid)))
+            for i, (vid, song) in enumerate(data.items()) if isinstance(song, dict)
+        ]
+        with self._conn:
+            self._conn.executemany("INSERT OR IGNORE INTO favorites VALUES (?, ?, ?)", rows)
+        os.replace(self.legacy_path, f"{self.legacy_path}.migrated")
+        logger.info(f"Imported {len(rows)} favorites from {self.legacy_path}")
+
+    def __contains__(self, video_id):
+        return video_id in self._ids
+
+    def __len__(self):
+        return len(self._ids)
+
+    def add(self, video_id: str, song: dict):
+        data = json.dumps(dict(song, videoId=video_id))
+        with self._lock:
+            with self._conn:
+                self._conn.execute(
+                    "INSERT INTO favorites VALUES (?, ?, ?) "
+                    "ON CONFLICT(video_id) DO UPDATE SET data = excluded.data",
+                    (video_id, time.time(), data),
+                )
+            self._ids.add(video_id)
+
+    def remove(self, video_id: str):
+        with self._lock:
+            with self._conn:
+                self._conn.execute("DELETE FROM favorites WHERE video_id = ?", (video_id,))
+            self._ids.discard(video_id)
+
+    def get(self, video_id: str, default=None):
+        """Metadata of one favorite, read on demand."""
+        if video_id not in self._ids:
+            return default
+        with self._lock:
+            row = self._conn.execute("SELECT data FROM favorites WHERE video_id = ?", (video_id,)).fetchone()
+        return json.loads(row[0]) if row else default
+
+    def video_ids(self) -> list:
+        """Favorite ids, most recently added first."""
+        with self._lock:
+            rows = self._conn.execute("SELECT video_id FROM favorites ORDER BY added DESC").fetchall()
+        return [video_id for (video_id,) in rows]
+
+    def tracks(self) -> list:
+        """All favorites as track dicts, oldest first."""
+        with self._lock:
+            rows = self._conn.execute("SELECT data FROM favorites ORDER BY added").fetchall()
+        return [json.loads(data) for (data,) in rows]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,238 @@
+import asyncio
+import logging
+import re
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half-open"
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling an endpoint whose circuit is open."""
+
+    def __init__(self, endpoint: str, retry_in: float):
+        self.endpoint = endpoint
+        self.retry_in = retry_in
+        super().__init__(f"{endpoint} is unavailable, retrying in {retry_in:.0f}s")
+
+
+# ytmusicapi's YTMusicServerError message for a non-2xx response
+_YTMUSIC_HTTP_429_RE = re.compile(r"Server returned HTTP 429\b")
+
+
+def is_throttled(error) -> bool:
+    """True for HTTP 429 errors.
+
+    httpx and requests errors carry the response; ytmusicapi only puts
+    the status at the start of its message.
+    """
+    status = getattr(getattr(error, "response", None), "status_code", None)
+    if status is not None:
+        return status == 429
+    return bool(_YTMUSIC_HTTP_429_RE.match(str(error)))
+
+
+class TokenBucket:
+    """Adaptive token bucket shared by every API call.
+
+    ``rate`` tokens per second accrue up to ``burst``. A throttling answer
+    from the server halves the rate (down to ``min_rate``); each success
+    adds a little back until the configured rate is reached again (AIMD).
+    """
+
+    def __init__(self, rate: float, burst: int, min_rate: float = 0.5):
+        self.max_rate = rate
+        self.rate = rate
+        self.min_rate = min_rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Take a token; returns how long the caller must wait before using it."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    def acquire(self):
+        wait = self.reserve()
+        if wait:
+            time.sleep(wait)
+
+    async def acquire_async(self):
+        wait = self.reserve()
+        if wait:
+            await asyncio.sleep(wait)
+
+    def throttled(self):
+        with self._lock:
+            self.rate = max(self.min_rate, self.rate / 2)
+        logger.warning(f"Server throttling; API rate lowered to {self.rate:.2f}/s")
+
+    def succeeded(self):
+        if self.rate < self.max_rate:
+            with self._lock:
+                self.rate = min(self.max_rate, self.rate + 0.1)
+
+
+class CircuitBreaker:
+    """Per-endpoint breaker with latency and error counters.
+
+    After ``failure_threshold`` consecutive failures the circuit opens and
+    calls fail fast for ``reset_timeout`` seconds. Then a single probe is
+    let through (half-open): success closes the circuit, failure opens it
+    again with the timeout doubled (up to ``max_reset_timeout``).
+    """
+
+    def __init__(self, name, failure_threshold=5, reset_timeout=15.0, max_reset_timeout=300.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.base_reset_timeout = reset_timeout
+        self.reset_timeout = reset_timeout
+        self.max_reset_timeout = max_reset_timeout
+        self.state = CLOSED
+        self.stats = {"calls": 0, "errors": 0, "rejected": 0, "trips": 0, "latency_ms": 0.0, "max_latency_ms": 0.0}
+        self._consecutive = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def before_call(self):
+        """Raise CircuitOpenError unless a call may go out now."""
+        with self._lock:
+            if self.state == CLOSED:
+                return
+            retry_in = self._opened_at + self.reset_timeout - time.monotonic()
+            if self.state == OPEN and retry_in <= 0:
+                self.state = HALF_OPEN
+            if self.state == HALF_OPEN and not self._probing:
+                self._probing = True  # this caller is the probe
+                return
+            self.stats["rejected"] += 1
+            raise CircuitOpenError(self.name, max(retry_in, 0.0))
+
+    def is_open(self) -> bool:
+        with self._lock:
+            return self.state == OPEN and time.monotonic() < self._opened_at + self.reset_timeout
+
+    def record(self, latency: float, error=None):
+        with self._lock:
+            self.stats["calls"] += 1
+            ms = latency * 1000
+            # Exponentially weighted so the readout follows current conditions
+            avg = self.stats["latency_ms"]
+            self.stats["latency_ms"] = ms if self.stats["calls"] == 1 else 0.8 * avg + 0.2 * ms
+            self.stats["max_latency_ms"] = max(self.stats["max_latency_ms"], ms)
+            was_probe = self._probing
+            self._probing = False
+
+            if error is None:
+                self._consecutive = 0
+                if self.state != CLOSED:
+                    logger.info(f"{self.name} recovered; circuit closed")
+                self.state = CLOSED
+                self.reset_timeout = self.base_reset_timeout
+                return
+
+            self.stats["errors"] += 1
+            self._consecutive += 1
+            if was_probe or self._consecutive >= self.failure_threshold:
+                if was_probe:
+                    self.reset_timeout = min(self.max_reset_timeout, self.reset_timeout * 2)
+                if self.state != OPEN:
+                    self.stats["trips"] += 1
+                self.state = OPEN
+                self._opened_at = time.monotonic()
+                logger.warning(f"{self.name} failing ({error}); circuit open for {self.reset_timeout:.0f}s")
+
+    def release_probe(self):
+        """The probe call was abandoned (e.g. cancelled) without an outcome."""
+        with self._lock:
+            self._probing = False
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return dict(self.stats, state=self.state)
+
+
+class ApiGuard:
+    """Rate limit and per-endpoint circuit breakers for API calls.
+
+    ``call(endpoint, fn, ...)`` fails fast while the endpoint's circuit is
+    open, waits for a token, then runs ``fn`` and records latency and the
+    outcome. ``call_async`` is the same for coroutines. Errors for which
+    ``is_local_error(error)`` is true were raised before any request went
+    out (e.g. an action that needs an account) and are not held against
+    the endpoint.
+    """
+
+    def __init__(self, rate=5.0, burst=10, failure_threshold=5, reset_timeout=15.0, is_local_error=None):
+        self.bucket = TokenBucket(rate, burst)
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.is_local_error = is_local_error
+        self._breakers: dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def breaker(self, endpoint: str) -> CircuitBreaker:
+        with self._lock:
+            breaker = self._breakers.get(endpoint)
+            if breaker is None:
+                breaker = CircuitBreaker(endpoint, self.failure_threshold, self.reset_timeout)
+                self._breakers[endpoint] = breaker
+            return breaker
+
+    def is_open(self, endpoint: str) -> bool:
+        return self.breaker(endpoint).is_open()
+
+    def _finish(self, breaker, started, error):
+        if error is not None and self.is_local_error is not None and self.is_local_error(error):
+            breaker.release_probe()  # no outcome for the endpoint either way
+            return
+        breaker.record(time.monotonic() - started, error)
+        if error is None:
+            self.bucket.succeeded()
+        elif is_throttled(error):
+            self.bucket.throttled()
+
+    def call(self, endpoint: str, fn, *args, **kwargs):
+        breaker = self.breaker(endpoint)
+        breaker.before_call()
+        self.bucket.acquire()
+        started = time.monotonic()
+        try:
+            result = fn(*args, **kwargs)
+        except Exception as e:
+            self._finish(breaker, started, e)
+            raise
+        self._finish(breaker, started, None)
+        return result
+
+    async def call_async(self, endpoint: str, coro_fn, *args, **kwargs):
+        breaker = self.breaker(endpoint)
+        breaker.before_call()
+        started = time.monotonic()
+        try:
+            await self.bucket.acquire_async()
+            result = await coro_fn(*args, **kwargs)
+        except asyncio.CancelledError:
+            breaker.release_probe()
+            raise
+        except Exception as e:
+            self._finish(breaker, started, e)
+            raise
+        self._finish(breaker, started, None)
+        return result
+
+    def stats(self) -> dict:
+        with self._lock:
+            breakers = list(self._breakers.values())
+        return {b.name: b.snapshot() for b in breakers}
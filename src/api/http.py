@@ -0,0 +1,74 @@
+import logging
+import threading
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+
+from src.config import load_settings
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_session: requests.Session | None = None
+_async_client: httpx.AsyncClient | None = None
+
+
+class _Session(requests.Session):
+    """requests.Session with a timeout for the requests that don't set their own."""
+
+    def __init__(self, timeout):
+        super().__init__()
+        self.timeout = timeout
+
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault("timeout", self.timeout)
+        return super().request(method, url, **kwargs)
+
+
+def get_session() -> requests.Session:
+    """App-wide keep-alive requests session shared by every YTMusic instance."""
+    global _session
+    with _lock:
+        if _session is None:
+            settings = load_settings()
+            # Same default timeout YTMusic applies to the sessions it creates itself
+            session = _Session(timeout=30)
+            adapter = HTTPAdapter(
+                pool_connections=settings["http_max_connections"],
+                pool_maxsize=settings["http_max_connections"],
+            )
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _session = session
+        return _session
+
+
+def get_async_client() -> httpx.AsyncClient:
+    """App-wide pooled async client (search, artwork). Use from the event loop only."""
+    global _async_client
+    with _lock:
+        if _async_client is None or _async_client.is_closed:
+            settings = load_settings()
+            limits = httpx.Limits(
+                max_connections=settings["http_max_connections"],
+                max_keepalive_connections=settings["http_max_keepalive"],
+                keepalive_expiry=settings["http_keepalive_expiry"],
+            )
+            http2 = bool(settings["http2"])
+            if http2:
+                try:
+                    import h2  # noqa: F401
+                except ImportError:
+                    logger.debug("h2 not installed; using HTTP/1.1 keep-alive")
+                    http2 = False
+            _async_client = httpx.AsyncClient(limits=limits, http2=http2, timeout=15.0)
+        return _async_client
+
+
+async def close_async_client():
+    """Close the pooled async client (called on quit)."""
+    global _async_client
+    client, _async_client = _async_client, None
+    if client is not None:
+        await client.aclose()
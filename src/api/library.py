@@ -0,0 +1,179 @@
+import difflib
+import json
+import logging
+import re
+import sqlite3
+import threading
+import time
+
+from src.config import get_data_dir
+
+logger = logging.getLogger(__name__)
+
+# Only what the UI needs to list, play and draw art for a track
+TRACK_FIELDS = ("videoId", "title", "artists", "album", "duration", "thumbnails")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tracks (
+    id INTEGER PRIMARY KEY,
+    video_id TEXT NOT NULL UNIQUE,
+    title TEXT NOT NULL,
+    artists TEXT NOT NULL,
+    album TEXT NOT NULL,
+    data TEXT NOT NULL,
+    seen REAL NOT NULL
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS tracks_fts USING fts5(
+    title, artists, album,
+    content='tracks', content_rowid='id',
+    tokenize='unicode61 remove_diacritics 2',
+    prefix='2 3'
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS tracks_vocab USING fts5vocab(tracks_fts, row);
+CREATE TRIGGER IF NOT EXISTS tracks_ai AFTER INSERT ON tracks BEGIN
+    INSERT INTO tracks_fts(rowid, title, artists, album)
+    VALUES (new.id, new.title, new.artists, new.album);
+END;
+CREATE TRIGGER IF NOT EXISTS tracks_ad AFTER DELETE ON tracks BEGIN
+    INSERT INTO tracks_fts(tracks_fts, rowid, title, artists, album)
+    VALUES ('delete', old.id, old.title, old.artists, old.album);
+END;
+CREATE TRIGGER IF NOT EXISTS tracks_au AFTER UPDATE ON tracks BEGIN
+    INSERT INTO tracks_fts(tracks_fts, rowid, title, artists, album)
+    VALUES ('delete', old.id, old.title, old.artists, old.album);
+    INSERT INTO tracks_fts(rowid, title, artists, album)
+    VALUES (new.id, new.title, new.artists, new.album);
+END;
+"""
+
+_UPSERT = """
+INSERT INTO tracks (video_id, title, artists, album, data, seen) VALUES (?, ?, ?, ?, ?, ?)
+ON CONFLICT(video_id) DO UPDATE SET
+    title = excluded.title, artists = excluded.artists, album = excluded.album,
+    data = excluded.data, seen = excluded.seen
+WHERE tracks.data != excluded.data
+"""
+
+_MATCH = """
+SELECT t.video_id, t.data FROM tracks_fts f JOIN tracks t ON t.id = f.rowid
+WHERE tracks_fts MATCH ? ORDER BY bm25(tracks_fts, 10.0, 5.0, 1.0) LIMIT ?
+"""
+
+
+def _artist_names(track) -> str:
+    artists = track.get("artists")
+    if isinstance(artists, list):
+        return ", ".join(a.get("name", "") for a in artists if isinstance(a, dict))
+    return artists if isinstance(artists, str) else ""
+
+
+def _album_name(track) -> str:
+    album = track.get("album")
+    if isinstance(album, dict):
+        return album.get("name") or ""
+    return album if isinstance(album, str) else ""
+
+
+def _terms(query: str) -> list:
+    return re.findall(r"\w+", query.lower())
+
+
+class LibraryIndex:
+    """Offline full-text index of every track the client has seen.
+
+    Tracks from searches, playlists, the home feed and local favorites are
+    upserted into ``<data dir>/library.db``: a plain ``tracks`` table plus
+    an FTS5 index over title, artists and album kept in sync by triggers.
+    ``search()`` does prefix matching on every term and, when that finds
+    nothing, retries with each term replaced by its closest spellings from
+    the index vocabulary, so typos still find songs without the network.
+    Searches use a read-only connection of their own, so they never wait
+    for a bulk ingest to commit (WAL lets readers run beside the writer).
+    """
+
+    def __init__(self, path=None):
+        self.path = path or get_data_dir() / "library.db"
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+        self._read_lock = threading.Lock()
+        self._reader = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._reader.execute("PRAGMA query_only=ON")
+
+    def add_tracks(self, tracks) -> int:
+        """Upsert track dicts; rows without a videoId are skipped."""
+        rows = []
+        now = time.time()
+        for track in tracks or []:
+            video_id = track.get("videoId") if isinstance(track, dict) else None
+            if not video_id:
+                continue
+            data = {k: track[k] for k in TRACK_FIELDS if track.get(k) is not None}
+            rows.append((
+                video_id,
+                track.get("title") or "",
+                _artist_names(track),
+                _album_name(track),
+                json.dumps(data, separators=(",", ":"), sort_keys=True),
+                now,
+            ))
+        if not rows:
+            return 0
+        with self._lock:
+            try:
+                with self._conn:
+                    self._conn.executemany(_UPSERT, rows)
+            except sqlite3.Error as e:
+                logger.warning(f"Could not index {len(rows)} tracks: {e}")
+                return 0
+        return len(rows)
+
+    def search(self, query: str, limit: int = 10) -> list:
+        """Best local matches for ``query`` as track dicts (prefix, then fuzzy)."""
+        terms = _terms(query)
+        if not terms:
+            return []
+        match = " ".join(f'"{t}"*' for t in terms)
+        with self._read_lock:
+            try:
+                rows = self._reader.execute(_MATCH, (match, limit)).fetchall()
+                if not rows:
+                    rows = self._fuzzy(terms, limit)
+            except sqlite3.Error as e:
+                logger.warning(f"Local search failed for {query!r}: {e}")
+                return []
+        return [json.loads(data) for _video_id, data in rows]
+
+    def _fuzzy(self, terms, limit):
+        """Typo-tolerant fallback: swap each term for close index terms. Caller holds _read_lock."""
+        groups = []
+        for term in terms:
+            if len(term) < 3:
+                continue
+            # Indexed terms sharing the first letter (range scan on the vocab table)
+            vocab = [row[0] for row in self._reader.execute(
+                "SELECT term FROM tracks_vocab WHERE term >= ? AND term < ?",
+                (term[0], chr(ord(term[0]) + 1)),
+            )]
+            close = difflib.get_close_matches(term, vocab, n=3, cutoff=0.75)
+            if close:
+                groups.append("(" + " OR ".join(f'"{c}"' for c in close) + ")")
+        if not groups:
+            return []
+        rows = self._reader.execute(_MATCH, (" AND ".join(groups), limit)).fetchall()
+        if not rows and len(groups) > 1:
+            rows = self._reader.execute(_MATCH, (" OR ".join(groups), limit)).fetchall()
+        return rows
+
+    def __len__(self):
+        with self._read_lock:
+            return self._reader.execute("SELECT COUNT(*) FROM tracks").fetchone()[0]
+
+    def close(self):
+        with self._read_lock:
+            self._reader.close()
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,103 @@
+import logging
+
+from ytmusicapi import YTMusic
+from ytmusicapi.continuations import CONTINUATION_ITEMS, get_continuation_token
+from ytmusicapi.navigation import (
+    CONTENT,
+    EDITABLE_PLAYLIST_DETAIL_HEADER,
+    HEADER,
+    RESPONSIVE_HEADER,
+    SECTION,
+    SECTION_LIST_ITEM,
+    TAB_CONTENT,
+    TWO_COLUMN_RENDERER,
+    nav,
+)
+from ytmusicapi.parsers.playlists import parse_playlist_header_meta, parse_playlist_items
+
+logger = logging.getLogger(__name__)
+
+LIKED_PLAYLIST_ID = "LM"
+
+
+class PlaylistPager:
+    """Playlist tracks fetched one page (about 100 tracks) per request.
+
+    ``YTMusic.get_playlist`` walks every continuation before returning, so
+    a large library shows nothing until the last page has arrived. The
+    pager keeps the continuation token instead and hands each page back as
+    soon as it is parsed. With a ``guard`` (ApiGuard) every request is
+    rate limited and counted under the "playlist" endpoint.
+    """
+
+    def __init__(self, api: YTMusic, playlist_id: str, on_page=None, guard=None):
+        self.api = api
+        self.guard = guard
+        self.on_page = on_page
+        self.playlist_id = playlist_id
+        self.browse_id = playlist_id if playlist_id.startswith("VL") else "VL" + playlist_id
+        self.pages_fetched = 0
+        self.tracks_fetched = 0
+        self.exhausted = False
+        self._continuation: str | None = None
+        self._collaborative = False
+
+    def next_page(self) -> list:
+        """Return the next page of tracks, or [] once the playlist is done."""
+        if self.exhausted:
+            return []
+
+        if self.pages_fetched == 0:
+            tracks = self._first_page()
+        else:
+            response = self._call(self.api._send_request, "browse", {"continuation": self._continuation})
+            items = nav(response, CONTINUATION_ITEMS, True) or []
+            tracks = parse_playlist_items(items, is_collaborative=self._collaborative)
+            self._continuation = get_continuation_token(items) if items else None
+
+        self.pages_fetched += 1
+        self.tracks_fetched += len(tracks)
+        if tracks and self.on_page:
+            self.on_page(tracks)
+        if not tracks or not self._continuation:
+            self.exhausted = True
+        return tracks
+
+    def __iter__(self):
+        while not self.exhausted:
+            page = self.next_page()
+            if page:
+                yield page
+
+    def _first_page(self) -> list:
+        response = self._call(self.api._send_request, "browse", {"browseId": self.browse_id})
+        section_list = nav(response, [*TWO_COLUMN_RENDERER, "secondaryContents", *SECTION], True)
+        shelf = nav(section_list, [*CONTENT, "musicPlaylistShelfRenderer"], True) if section_list else None
+        if not shelf:
+            # Layouts we don't page ourselves (e.g. OLA album playlists)
+            logger.debug(f"Unpaged playlist layout for {self.playlist_id}; loading it in one go")
+            self._continuation = None
+            return self._call(self.api.get_playlist, self.playlist_id, limit=None).get("tracks", [])
+
+        self._collaborative = self._is_collaborative(response)
+        contents = shelf.get("contents", [])
+        self._continuation = get_continuation_token(contents) if contents else None
+        return parse_playlist_items(contents, is_collaborative=self._collaborative)
+
+    def _call(self, fn, *args, **kwargs):
+        if self.guard is None:
+            return fn(*args, **kwargs)
+        return self.guard.call("playlist", fn, *args, **kwargs)
+
+    @staticmethod
+    def _is_collaborative(response) -> bool:
+        # Collaborative playlists shift the album column (see get_playlist)
+        try:
+            header_data = nav(response, [*TWO_COLUMN_RENDERER, *TAB_CONTENT, *SECTION_LIST_ITEM])
+            if EDITABLE_PLAYLIST_DETAIL_HEADER[0] in header_data:
+                header = nav(header_data, [*EDITABLE_PLAYLIST_DETAIL_HEADER, *HEADER, *RESPONSIVE_HEADER])
+            else:
+                header = nav(header_data, RESPONSIVE_HEADER)
+            return "collaborators" in parse_playlist_header_meta(header)
+        except Exception:
+            return False
@@ -0,0 +1,164 @@
+import json
+import logging
+import os
+import random
+import threading
+import time
+
+from src.config import get_data_dir
+
+logger = logging.getLogger(__name__)
+
+LIKE = "LIKE"
+INDIFFERENT = "INDIFFERENT"
+
+
+class RatingQueue:
+    """Write-behind queue of like/unlike ratings for YouTube Music.
+
+    ``submit()`` only records intent and returns; a background thread
+    sends it with ``rate(video_id, rating)``. Pending ratings are keyed by
+    videoId, so rapid toggles coalesce into one request, and a rating that
+    ends up back at the state the song had before it was queued is dropped
+    without touching the network. Failures are retried with exponential
+    backoff; errors that retrying cannot fix (``is_permanent(error)``,
+    e.g. no account in guest mode) discard the rating. The queue is saved to
+    ``<data dir>/pending_ratings.json`` (atomically) on every change, so
+    unsent ratings survive a restart.
+    """
+
+    def __init__(self, rate, path=None, batch_delay=1.0, batch_size=20,
+                 max_backoff=300.0, is_permanent=None, on_result=None):
+        self.rate = rate
+        self.path = path or get_data_dir() / "pending_ratings.json"
+        self.batch_delay = batch_delay
+        self.batch_size = batch_size
+        self.max_backoff = max_backoff
+        self.is_permanent = is_permanent or (lambda error: False)
+        self.on_result = on_result
+        self.stats = {"sent": 0, "coalesced": 0, "failed": 0, "dropped": 0}
+        # video_id -> {"rating", "base", "attempts", "next_try"}
+        self._pending: dict[str, dict] = self._load()
+        self._cond = threading.Condition()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="rating-queue", daemon=True)
+        self._thread.start()
+
+    def _load(self) -> dict:
+        try:
+            with open(self.path, "r") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(data, dict):
+            return {}
+        # Whatever backoff was running before the restart, try again now
+        for entry in data.values():
+            entry["next_try"] = 0.0
+            entry.pop("inflight", None)
+        return data
+
+    def _save(self):
+        """Atomic rewrite of the (small) pending set. Caller holds _cond."""
+        tmp_path = f"{self.path}.tmp"
+        try:
+            with open(tmp_path, "w") as f:
+                json.dump(self._pending, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning(f"Could not persist pending ratings: {e}")
+
+    def __len__(self):
+        with self._cond:
+            return len(self._pending)
+
+    def submit(self, video_id: str, rating: str, previous: str):
+        """Queue ``rating`` for ``video_id``; ``previous`` is the rating it had."""
+        with self._cond:
+            entry = self._pending.get(video_id)
+            if entry is not None:
+                self.stats["coalesced"] += 1
+                if rating == entry["base"] and not entry.get("inflight"):
+                    # Toggled back before anything was sent
+                    del self._pending[video_id]
+                    self._save()
+                    return
+                entry.update(rating=rating, attempts=0, next_try=time.time() + self.batch_delay)
+            else:
+                self._pending[video_id] = {
+                    "rating": rating,
+                    "base": previous,
+                    "attempts": 0,
+                    "next_try": time.time() + self.batch_delay,
+                }
+            self._save()
+            self._cond.notify()
+
+    def _due(self, now):
+        """Claim up to batch_size due ratings. Caller holds _cond."""
+        due = [vid for vid, e in self._pending.items() if e["next_try"] <= now and not e.get("inflight")]
+        batch = []
+        for video_id in due[:self.batch_size]:
+            entry = self._pending[video_id]
+            entry["inflight"] = True
+            batch.append((video_id, entry["rating"]))
+        return batch
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._closed:
+                    now = time.time()
+                    batch = self._due(now)
+                    if batch:
+                        break
+                    waits = [e["next_try"] - now for e in self._pending.values() if not e.get("inflight")]
+                    self._cond.wait(timeout=min(waits) if waits else None)
+                if self._closed:
+                    return
+
+            for video_id, rating in batch:
+                self._send(video_id, rating)
+
+    def _send(self, video_id, rating):
+        error = None
+        try:
+            self.rate(video_id, rating)
+        except Exception as e:
+            error = e
+        permanent = error is not None and self.is_permanent(error)
+
+        with self._cond:
+            entry = self._pending[video_id]
+            entry.pop("inflight", None)
+            if entry["rating"] != rating:
+                # Toggled again while the request was in flight; the newer
+                # intent stays queued and goes out on its own
+                if error is None:
+                    entry["base"] = rating
+                self._save()
+                self._cond.notify()
+                return
+            if error is None:
+                del self._pending[video_id]
+                self.stats["sent"] += 1
+            elif permanent:
+                del self._pending[video_id]
+                self.stats["dropped"] += 1
+                logger.warning(f"Dropping rating {rating} for {video_id}: {error}")
+            else:
+                entry["attempts"] += 1
+                self.stats["failed"] += 1
+                delay = min(self.max_backoff, 2 ** entry["attempts"]) * random.uniform(0.8, 1.2)
+                entry["next_try"] = time.time() + delay
+                logger.info(f"Rating {video_id} failed ({error}); retry in {delay:.0f}s")
+            self._save()
+
+        if self.on_result and (error is None or permanent):
+            self.on_result(video_id, rating, error)
+
+    def close(self):
+        """Stop the sender thread; unsent ratings stay on disk for next time."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
@@ -0,0 +1,193 @@
+import asyncio
+import logging
+import time
+
+import httpx
+from ytmusicapi import YTMusic
+from ytmusicapi.constants import YTM_BASE_API
+from ytmusicapi.continuations import get_continuation_params
+from ytmusicapi.exceptions import YTMusicServerError
+from ytmusicapi.navigation import MRLIR, SECTION_LIST, nav
+from ytmusicapi.parsers.search import get_search_params, parse_search_results
+
+logger = logging.getLogger(__name__)
+
+SONGS_SHELF_CONTINUATION = ["continuationContents", "musicShelfContinuation"]
+
+
+class SearchPager:
+    """Songs search that fetches one page at a time.
+
+    ``YTMusic.search`` follows continuations internally and throws the
+    tokens away, so asking for a bigger ``limit`` re-downloads every earlier
+    page. The pager keeps the continuation token between calls and each
+    ``next_page()`` costs exactly one request.
+    """
+
+    def __init__(self, api: YTMusic, query: str):
+        self.api = api
+        self.query = query
+        self.pages_fetched = 0
+        self.exhausted = False
+        self._params = get_search_params("songs", None, False)
+        self._continuation: str | None = None
+
+    def _body(self):
+        # _send_request mutates the body (adds the client context)
+        return {"query": self.query, "params": self._params}
+
+    def next_page(self) -> list:
+        """Return the next page of songs, or [] once results run out."""
+        if self.exhausted:
+            return []
+
+        if self.pages_fetched == 0:
+            response = self.api._send_request("search", self._body())
+            shelf = self._first_shelf(response)
+        else:
+            response = self.api._send_request("search", self._body(), self._continuation)
+            shelf = nav(response, SONGS_SHELF_CONTINUATION, True)
+
+        self.pages_fetched += 1
+        if not shelf:
+            self.exhausted = True
+            return []
+
+        if shelf.get("continuations"):
+            self._continuation = get_continuation_params(shelf)
+        else:
+            self.exhausted = True
+
+        contents = [item for item in shelf.get("contents", []) if MRLIR in item]
+        return parse_search_results(contents, "song", None)
+
+    @staticmethod
+    def _first_shelf(response):
+        contents = response.get("contents")
+        if not contents:
+            return None
+        if "tabbedSearchResultsRenderer" in contents:
+            contents = contents["tabbedSearchResultsRenderer"]["tabs"][0]["tabRenderer"]["content"]
+        for section in nav(contents, SECTION_LIST, True) or []:
+            if "musicShelfRenderer" in section:
+                return section["musicShelfRenderer"]
+        return None
+
+
+class _ReplayedResponse:
+    """Stand-in for a YTMusic instance whose only request returns ``response``.
+
+    Lets ``YTMusic.search`` parse a response we fetched ourselves, so the
+    async path and the blocking path produce identical result dicts.
+    """
+
+    def __init__(self, api: YTMusic, response: dict):
+        self._api = api
+        self._response = response
+
+    def _send_request(self, endpoint, body, additionalParams=""):
+        return self._response
+
+    def __getattr__(self, name):
+        return getattr(self._api, name)
+
+
+def _request_parts(api: YTMusic):
+    """(headers, context, params) YTMusic sends with a request, or None.
+
+    These are YTMusic internals; None (a ytmusicapi that moved them) makes
+    search_async fall back to the blocking ``api.search``.
+    """
+    try:
+        # base_headers may fetch a visitor id on first use
+        headers = dict(api.headers)
+        if not any(k.lower() == "cookie" for k in headers):
+            headers["cookie"] = "; ".join(f"{k}={v}" for k, v in api.cookies.items())
+        return headers, dict(api.context), str(api.params)
+    except (AttributeError, TypeError) as e:
+        logger.warning(f"ytmusicapi request internals unavailable ({e}); using its blocking search")
+        return None
+
+
+def _error_message(response: httpx.Response) -> str:
+    try:
+        return response.json().get("error", {}).get("message", "")
+    except (ValueError, AttributeError):
+        return ""  # HTML or empty error page
+
+
+async def search_async(http: httpx.AsyncClient, api: YTMusic, query: str, limit: int) -> list:
+    """Unfiltered YouTube Music search over an async, cancellable HTTP request."""
+    parts = await asyncio.to_thread(_request_parts, api)
+    if parts is None:
+        return await asyncio.to_thread(api.search, query, limit=limit)
+    headers, context, params = parts
+
+    body = {"query": query}
+    body.update(context)
+    response = await http.post(YTM_BASE_API + "search" + params, json=body, headers=headers)
+    if not response.is_success:
+        raise YTMusicServerError(
+            f"Server returned HTTP {response.status_code}: {response.reason_phrase}.\n{_error_message(response)}"
+        )
+    return YTMusic.search(_ReplayedResponse(api, response.json()), query, limit=limit)
+
+
+class SearchScheduler:
+    """Runs type-ahead searches from the UI.
+
+    * identical queries already in flight share one request;
+    * starting a new query cancels the requests of superseded ones, and
+      their results are dropped even if they manage to finish;
+    * the debounce interval follows the measured search latency, so a slow
+      link waits longer between keystrokes instead of piling up requests.
+    """
+
+    MIN_DEBOUNCE = 0.15
+    MAX_DEBOUNCE = 1.0
+
+    def __init__(self, client):
+        self.client = client
+        self._inflight: dict[str, asyncio.Task] = {}
+        self._latest_key = None
+        self._latency = None  # exponentially weighted average, seconds
+
+    @property
+    def debounce_interval(self) -> float:
+        if self._latency is None:
+            return 0.3
+        return max(self.MIN_DEBOUNCE, min(self.MAX_DEBOUNCE, self._latency * 0.75))
+
+    async def search(self, query: str, limit: int, on_refresh=None):
+        """Return results for ``query``, or None if it was superseded."""
+        key = self.client._search_key(query, limit)
+        self._latest_key = key
+
+        for other_key, task in list(self._inflight.items()):
+            if other_key != key:
+                task.cancel()
+                self._inflight.pop(other_key, None)
+
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._run(query, limit, on_refresh))
+            self._inflight[key] = task
+            task.add_done_callback(lambda t, k=key: self._inflight.pop(k, None) if self._inflight.get(k) is t else None)
+
+        try:
+            # Shielded: a cancelled caller must not kill a request another
+            # caller (e.g. a re-typed identical query) is still waiting on
+            results = await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if task.cancelled():
+                return None
+            raise
+        return results if key == self._latest_key else None
+
+    async def _run(self, query, limit, on_refresh):
+        started = time.monotonic()
+        results = await self.client.search_songs_async(query, limit=limit, on_refresh=on_refresh)
+        elapsed = time.monotonic() - started
+        if elapsed > 0.02:  # ignore cache hits
+            self._latency = elapsed if self._latency is None else 0.7 * self._latency + 0.3 * elapsed
+        return results
@@ -0,0 +1,170 @@
+import sys
+import threading
+from collections import OrderedDict
+
+
+def pick_thumbnail(song: dict):
+    """Smallest thumbnail URL of a track dict (we only need a few pixels)."""
+    thumbnails = song.get("thumbnails") or (song.get("album") or {}).get("thumbnails") or []
+    sized = [t for t in thumbnails if isinstance(t, dict) and t.get("url")]
+    if not sized:
+        return None
+    return min(sized, key=lambda t: t.get("width") or 10_000)["url"]
+
+
+class Track:
+    """The handful of track fields the UI actually uses.
+
+    Raw ytmusicapi dicts carry feedback tokens, every thumbnail size, menu
+    data and so on; a Track keeps only the strings needed to list, play
+    and draw a song, with artist and album names interned so repeated
+    names share one object.
+    """
+
+    __slots__ = ("video_id", "title", "artists", "album", "duration", "thumbnail")
+
+    def __init__(self, video_id, title, artists=(), album=None, duration=None, thumbnail=None):
+        self.video_id = video_id
+        self.title = title
+        self.artists = artists
+        self.album = album
+        self.duration = duration
+        self.thumbnail = thumbnail
+
+    @classmethod
+    def from_dict(cls, song: dict) -> "Track":
+        artists = song.get("artists")
+        if isinstance(artists, list):
+            names = tuple(sys.intern(a["name"]) for a in artists if isinstance(a, dict) and a.get("name"))
+        elif isinstance(artists, str):
+            names = (sys.intern(artists),)
+        else:
+            names = ()
+        album = song.get("album")
+        if isinstance(album, dict):
+            album = album.get("name")
+        return cls(
+            song["videoId"],
+            song.get("title") or "Unknown",
+            names,
+            sys.intern(album) if isinstance(album, str) else None,
+            song.get("duration"),
+            pick_thumbnail(song),
+        )
+
+    @property
+    def artist_names(self) -> str:
+        return ", ".join(self.artists) if self.artists else "Unknown"
+
+    def as_dict(self) -> dict:
+        """ytmusicapi-shaped dict, for code that persists or sends tracks."""
+        song = {
+            "videoId": self.video_id,
+            "title": self.title,
+            "artists": [{"name": name} for name in self.artists],
+        }
+        if self.album:
+            song["album"] = {"name": self.album}
+        if self.duration:
+            song["duration"] = self.duration
+        if self.thumbnail:
+            song["thumbnails"] = [{"url": self.thumbnail}]
+        return song
+
+    def sizeof(self) -> int:
+        # Interned names are shared between tracks, count only their pointers
+        size = sys.getsizeof(self) + sys.getsizeof(self.title) + sys.getsizeof(self.artists)
+        for value in (self.video_id, self.duration, self.thumbnail):
+            if value is not None:
+                size += sys.getsizeof(value)
+        return size
+
+
+class TrackStore:
+    """Bounded videoId -> Track map with LRU eviction and pinning.
+
+    Tracks that are queued or playing are pinned (reference counted) and
+    ``keep(video_id)`` can protect more, e.g. favorites; neither is ever
+    evicted. Everything else beyond ``max_items`` goes in LRU order.
+    """
+
+    def __init__(self, max_items=5000, keep=None):
+        self.max_items = max_items
+        self.keep = keep
+        self._tracks: "OrderedDict[str, Track]" = OrderedDict()
+        self._pins: dict[str, int] = {}
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def __contains__(self, video_id):
+        return video_id in self._tracks
+
+    def __len__(self):
+        return len(self._tracks)
+
+    def get(self, video_id):
+        with self._lock:
+            track = self._tracks.get(video_id)
+            if track is not None:
+                self._tracks.move_to_end(video_id)
+            return track
+
+    def add(self, track: Track) -> Track:
+        with self._lock:
+            self._tracks[track.video_id] = track
+            self._tracks.move_to_end(track.video_id)
+            self._evict()
+        return track
+
+    def put(self, song: dict):
+        """Store a raw track dict; returns its Track (None without a videoId)."""
+        if not isinstance(song, dict) or not song.get("videoId"):
+            return None
+        return self.add(Track.from_dict(song))
+
+    def put_many(self, songs) -> list:
+        """Store raw track dicts; returns the Tracks in order."""
+        tracks = [Track.from_dict(s) for s in songs or [] if isinstance(s, dict) and s.get("videoId")]
+        with self._lock:
+            for track in tracks:
+                self._tracks[track.video_id] = track
+                self._tracks.move_to_end(track.video_id)
+            self._evict()
+        return tracks
+
+    def pin(self, video_id):
+        with self._lock:
+            self._pins[video_id] = self._pins.get(video_id, 0) + 1
+
+    def unpin(self, video_id):
+        with self._lock:
+            count = self._pins.get(video_id, 0) - 1
+            if count > 0:
+                self._pins[video_id] = count
+            else:
+                self._pins.pop(video_id, None)
+            self._evict()
+
+    def _evict(self):
+        """Drop LRU entries beyond max_items. Caller holds _lock."""
+        # Protected entries are rotated to the back, so each is skipped once per pass
+        budget = len(self._tracks)
+        while len(self._tracks) > self.max_items and budget > 0:
+            budget -= 1
+            video_id, track = self._tracks.popitem(last=False)
+            if video_id in self._pins or (self.keep and self.keep(video_id)):
+                self._tracks[video_id] = track
+            else:
+                self.evictions += 1
+
+    def memory_usage(self) -> dict:
+        """Approximate footprint, for the app info screen."""
+        with self._lock:
+            tracks = list(self._tracks.values())
+            pinned = len(self._pins)
+        return {
+            "tracks": len(tracks),
+            "pinned": pinned,
+            "evictions": self.evictions,
+            "bytes": sum(t.sizeof() for t in tracks) + sys.getsizeof(self._tracks),
+        }
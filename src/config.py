@@ -1,4 +1,5 @@
 
+import json
 import os
 from pathlib import Path
 
@@ -17,3 +18,75 @@ def get_data_dir() -> Path:
     data_dir = Path(data_home) / APP_NAME
     data_dir.mkdir(parents=True, exist_ok=True)
     return data_dir
+
+# Tunables that can be overridden in <config dir>/settings.json
+DEFAULT_SETTINGS = {
+    # How many queued tracks to resolve ahead and hand to mpv
+    "prefetch_depth": 2,
+    # Parallel yt-dlp extractions used for playback and prefetching
+    "prefetch_workers": 2,
+    # Search results are fresh for this many seconds, then served stale
+    # while being refreshed in the background
+    "search_cache_ttl": 600,
+    "search_cache_size": 200,
+    # Shared HTTP connection pool for API traffic and artwork
+    "http_max_connections": 10,
+    "http_max_keepalive": 10,
+    "http_keepalive_expiry": 60,
+    "http2": True,  # used only when the optional h2 package is installed
+    # Offline library hits shown ahead of remote search results
+    "local_search_limit": 10,
+    # Track metadata kept in memory (queued, playing and favorite tracks are never evicted)
+    "track_store_size": 5000,
+    # Home feed and library playlists: served from the disk snapshot and
+    # refreshed in the background after this many seconds
+    "feed_cache_ttl": 1800,
+    # Albums/playlists on the home feed are expanded into tracks by this
+    # many parallel requests, for at most home_expand_max of them
+    "home_expand_workers": 3,
+    "home_expand_max": 12,
+    "home_playlist_tracks": 25,
+    # Client-side limit on YouTube Music requests (token bucket; halved
+    # while the server answers 429, then restored gradually)
+    "api_rate_per_sec": 5.0,
+    "api_burst": 10,
+    # An endpoint failing this many times in a row is skipped (cached data
+    # is served instead) for breaker_reset seconds before being probed again
+    "breaker_failures": 5,
+    "breaker_reset": 15,
+    # Offline audio copies of favorites and of tracks played at least
+    # audio_cache_min_plays times; downloads are capped at
+    # audio_cache_rate_kb KiB/s (0 = unlimited)
+    "audio_cache_mb": 2048,
+    "audio_cache_min_plays": 3,
+    "audio_cache_rate_kb": 512,
+    # Thumbnails on disk (images plus their renderings); the least
+    # recently used are deleted beyond this size
+    "artwork_cache_mb": 64,
+    # "ipc" (mpv child process over a JSON socket), "libmpv" (in-process,
+    # needs the libmpv shared library) or "auto" (libmpv when available).
+    # libmpv starts faster, but a crash in it takes the whole app down,
+    # while a crashed mpv process is restarted by the supervisor
+    "playback_backend": "ipc",
+    # Bring back last session's track (paused at the same position),
+    # volume and queue at startup
+    "restore_session": True,
+}
+
+def load_settings() -> dict:
+    """Returns the user settings merged over DEFAULT_SETTINGS."""
+    settings = dict(DEFAULT_SETTINGS)
+    settings_file = get_config_dir() / "settings.json"
+    if settings_file.exists():
+        try:
+            with open(settings_file, "r") as f:
+                user_settings = json.load(f)
+            if isinstance(user_settings, dict):
+                settings.update(user_settings)
+        except (OSError, ValueError):
+            pass
+    return settings
+
+def get_setting(name: str):
+    """Returns a single setting value."""
+    return load_settings().get(name, DEFAULT_SETTINGS.get(name))
@@ -0,0 +1,294 @@
+import json
+import logging
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+
+from src.config import get_data_dir
+
+logger = logging.getLogger(__name__)
+
+_CONTENT_RANGE_RE = re.compile(r"bytes \d+-\d+/(\d+)")
+
+
+class DownloadError(Exception):
+    pass
+
+
+class AudioCache:
+    """Offline copies of favorite and frequently played tracks.
+
+    Audio is kept under ``<data dir>/audio/<videoId>.audio`` and downloaded
+    one track at a time by a background thread running at low CPU priority
+    and (optionally) capped to ``rate_limit`` bytes/s. Each download goes
+    to a ``.part`` file that is only renamed into place once the byte count
+    matches the size the server announced, so a cached file is always
+    complete. Tracks are queued with ``want()`` (favorites) or become
+    eligible after ``min_plays`` plays (``record_play()``).
+
+    ``index.json`` (rewritten atomically) keeps size, play count and last
+    play per track. Beyond ``max_bytes`` the least frequently played files
+    are evicted first, the least recently played breaking ties. Files for
+    which ``keep(video_id)`` is true (favorites) are never evicted to make
+    room for a download; once they fill the quota, new wants are dropped
+    until space is freed, instead of downloading tracks that cannot stay.
+    """
+
+    CHUNK_SIZE = 10 * 1024 * 1024  # googlevideo throttles large unranged reads
+    MAX_PLAY_COUNTS = 2000  # play counts kept for tracks that are not cached
+
+    def __init__(self, resolve, max_bytes, min_plays=3, rate_limit=0, keep=None, path=None):
+        self.resolve = resolve
+        self.max_bytes = max_bytes
+        self.min_plays = min_plays
+        self.rate_limit = rate_limit
+        self.keep = keep
+        self.dir = path or get_data_dir() / "audio"
+        self.dir.mkdir(parents=True, exist_ok=True)
+        self.index_path = self.dir / "index.json"
+        self.stats = {"downloads": 0, "failed": 0, "evictions": 0}
+        self._entries: dict[str, dict] = {}  # video_id -> {"plays", "last", "size"?}
+        self._wanted: "OrderedDict[str, None]" = OrderedDict()
+        self._full = False  # the quota is taken by kept files
+        self._cond = threading.Condition()
+        self._closed = False
+        self._load()
+        self._thread = threading.Thread(target=self._run, name="audio-cache", daemon=True)
+        self._thread.start()
+
+    def _file(self, video_id):
+        return self.dir / f"{video_id}.audio"
+
+    def _load(self):
+        try:
+            with open(self.index_path, "r") as f:
+                data = json.load(f)
+            if isinstance(data, dict):
+                self._entries = data
+        except (OSError, ValueError):
+            pass
+
+        # Check every indexed file against its recorded size; drop leftovers
+        for video_id, entry in self._entries.items():
+            size = entry.get("size")
+            if size is None:
+                continue
+            try:
+                actual = os.path.getsize(self._file(video_id))
+            except OSError:
+                actual = None
+            if actual != size:
+                logger.warning(f"Discarding incomplete cached audio for {video_id}")
+                self._remove_file(video_id)
+                entry.pop("size", None)
+        for name in os.listdir(self.dir):
+            video_id, ext = os.path.splitext(name)
+            if ext == ".part" or (ext == ".audio" and "size" not in self._entries.get(video_id, {})):
+                try:
+                    os.remove(self.dir / name)
+                except OSError:
+                    pass
+
+    def _save(self):
+        """Atomic rewrite of the index. Caller holds _cond."""
+        tmp_path = f"{self.index_path}.tmp"
+        try:
+            with open(tmp_path, "w") as f:
+                json.dump(self._entries, f)
+            os.replace(tmp_path, self.index_path)
+        except OSError as e:
+            logger.warning(f"Could not persist audio cache index: {e}")
+
+    def _remove_file(self, video_id):
+        try:
+            os.remove(self._file(video_id))
+        except OSError:
+            pass
+
+    def path(self, video_id):
+        """Local file of a completely downloaded track, or None."""
+        with self._cond:
+            entry = self._entries.get(video_id)
+            if entry is None or "size" not in entry:
+                return None
+        return str(self._file(video_id))
+
+    def record_play(self, video_id):
+        """Count a play; tracks reaching min_plays are queued for download."""
+        with self._cond:
+            entry = self._entries.setdefault(video_id, {"plays": 0})
+            entry["plays"] += 1
+            entry["last"] = time.time()
+            if "size" not in entry and entry["plays"] >= self.min_plays:
+                self._want(video_id)
+            self._prune_counts()
+            self._save()
+
+    def want(self, video_id):
+        """Queue a track for download (no-op if cached or already queued)."""
+        with self._cond:
+            self._check_full()
+            self._want(video_id)
+
+    def want_many(self, video_ids):
+        with self._cond:
+            self._check_full()
+            for video_id in video_ids:
+                self._want(video_id)
+
+    def _check_full(self):
+        """Note a quota already taken by kept files. Caller holds _cond."""
+        if self.keep is not None and not self._full:
+            kept = sum(e["size"] for vid, e in self._entries.items() if "size" in e and self.keep(vid))
+            self._full = kept >= self.max_bytes
+
+    def _want(self, video_id):
+        if self._full or "size" in self._entries.get(video_id, {}) or video_id in self._wanted:
+            return
+        self._wanted[video_id] = None
+        self._cond.notify()
+
+    def discard(self, video_id):
+        """Forget a cached file, e.g. after mpv failed to play it."""
+        with self._cond:
+            entry = self._entries.get(video_id)
+            if entry is None or entry.pop("size", None) is None:
+                return
+            self._remove_file(video_id)
+            self._full = False
+            self._save()
+
+    def _prune_counts(self):
+        """Bound the play counts of uncached tracks. Caller holds _cond."""
+        uncached = [vid for vid, e in self._entries.items() if "size" not in e]
+        excess = len(uncached) - self.MAX_PLAY_COUNTS
+        if excess > 0:
+            uncached.sort(key=lambda vid: self._entries[vid].get("last", 0))
+            for video_id in uncached[:excess]:
+                del self._entries[video_id]
+
+    def _lower_priority(self):
+        # On Linux setpriority on a thread id only affects that thread
+        try:
+            os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), 10)
+        except (AttributeError, OSError):
+            pass
+
+    def _run(self):
+        self._lower_priority()
+        while True:
+            with self._cond:
+                while not self._wanted and not self._closed:
+                    self._cond.wait()
+                if self._closed:
+                    return
+                video_id, _ = self._wanted.popitem(last=False)
+                if "size" in self._entries.get(video_id, {}):
+                    continue
+
+            try:
+                self._download(video_id)
+            except Exception as e:
+                self.stats["failed"] += 1
+                logger.warning(f"Caching audio for {video_id} failed: {e}")
+            finally:
+                try:
+                    os.remove(f"{self._file(video_id)}.part")
+                except OSError:
+                    pass
+
+    def _download(self, video_id):
+        from src.api.http import get_session
+
+        stream_url = self.resolve(video_id)
+        if not stream_url:
+            raise DownloadError("no stream URL")
+
+        session = get_session()
+        part_path = f"{self._file(video_id)}.part"
+        written, total = 0, None
+        started = time.monotonic()
+        with open(part_path, "wb") as f:
+            while total is None or written < total:
+                end = written + self.CHUNK_SIZE - 1
+                with session.get(stream_url, headers={"Range": f"bytes={written}-{end}"}, stream=True) as response:
+                    response.raise_for_status()
+                    if total is None:
+                        total = self._total_size(response)
+                        self._make_room(total, video_id)
+                    for block in response.iter_content(64 * 1024):
+                        if self._closed:
+                            raise DownloadError("cache closed")
+                        f.write(block)
+                        written += len(block)
+                        self._throttle(written, started)
+                    if response.status_code == 200:
+                        break  # server ignored the range and sent everything
+                if written == 0:
+                    raise DownloadError("empty response")
+
+        if written != total:
+            raise DownloadError(f"got {written} of {total} bytes")
+        with self._cond:
+            os.replace(part_path, self._file(video_id))
+            entry = self._entries.setdefault(video_id, {"plays": 0})
+            entry["size"] = written
+            self.stats["downloads"] += 1
+            self._save()
+        logger.debug(f"Cached audio for {video_id} ({written / 1048576:.1f} MiB)")
+
+    @staticmethod
+    def _total_size(response):
+        match = _CONTENT_RANGE_RE.match(response.headers.get("Content-Range", ""))
+        if match:
+            return int(match.group(1))
+        length = response.headers.get("Content-Length")
+        if response.status_code == 200 and length:
+            return int(length)
+        raise DownloadError("server did not report the file size")
+
+    def _throttle(self, written, started):
+        if self.rate_limit:
+            ahead = written / self.rate_limit - (time.monotonic() - started)
+            if ahead > 0:
+                time.sleep(ahead)
+
+    def _make_room(self, incoming, video_id):
+        """Evict cached files until ``incoming`` more bytes fit in the quota."""
+        if incoming > self.max_bytes:
+            raise DownloadError("larger than the whole cache quota")
+        with self._cond:
+            cached = [(vid, e) for vid, e in self._entries.items() if "size" in e and vid != video_id]
+            used = sum(e["size"] for _vid, e in cached)
+            if used + incoming <= self.max_bytes:
+                return
+            keep = self.keep or (lambda vid: False)
+            evictable = [(vid, e) for vid, e in cached if not keep(vid)]
+            if used - sum(e["size"] for _vid, e in evictable) + incoming > self.max_bytes:
+                # Only kept files stand in the way: stop downloading until
+                # space is freed rather than cycling favorites in and out
+                self._full = True
+                self._wanted.clear()
+                raise DownloadError("cache quota is taken by kept tracks")
+            evictable.sort(key=lambda item: (item[1].get("plays", 0), item[1].get("last", 0)))
+            for victim, entry in evictable:
+                if used + incoming <= self.max_bytes:
+                    break
+                used -= entry.pop("size")
+                self._remove_file(victim)
+                self.stats["evictions"] += 1
+            self._save()
+
+    def usage(self) -> dict:
+        with self._cond:
+            sizes = [e["size"] for e in self._entries.values() if "size" in e]
+            queued = len(self._wanted)
+        return dict(self.stats, tracks=len(sizes), bytes=sum(sizes), queued=queued)
+
+    def close(self):
+        """Stop the downloader; a partial download is thrown away."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
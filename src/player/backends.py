@@ -0,0 +1,733 @@
+import ctypes
+import ctypes.util
+import itertools
+import json
+import locale
+import os
+import socket
+import subprocess
+import threading
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+
+from src.config import get_data_dir
+
+
+
+class MpvIPC:
+    """Persistent, multiplexed connection to the mpv JSON IPC socket.
+
+    A single socket is kept open for the lifetime of the mpv process. Every
+    command is tagged with a ``request_id`` and a background reader thread
+    routes each reply to the Future of the caller waiting for it. If mpv
+    restarts, the next command transparently reconnects.
+
+    Asynchronous mpv events (``property-change``, ``end-file`` ...) are handed
+    to the registered event handlers, and connect handlers run every time a
+    new connection is made so subscriptions survive reconnects. Both kinds of
+    handler run on the reader thread and must not block on ``send``.
+    """
+    def __init__(self, ipc_path, logger):
+        self.ipc_path = ipc_path
+        self.logger = logger
+        self._sock = None
+        self._reader = None
+        self._conn_lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._pending = {}  # request_id -> Future
+        self._pending_lock = threading.Lock()
+        self._request_ids = itertools.count(1)
+        self._event_handlers = []
+        self._connect_handlers = []
+
+    def add_event_handler(self, handler):
+        """Register ``handler(msg)`` for every mpv event message."""
+        self._event_handlers.append(handler)
+
+    def add_connect_handler(self, handler):
+        """Register ``handler()`` to run after each (re)connection."""
+        self._connect_handlers.append(handler)
+
+    @property
+    def connected(self) -> bool:
+        return self._sock is not None
+
+    def _connect(self, timeout=1.0):
+        """Open the socket and start the reader thread. Caller holds _conn_lock."""
+        if self._sock is not None:
+            return self._sock
+        if not os.path.exists(self.ipc_path):
+            return None
+
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            sock.settimeout(timeout)
+            sock.connect(self.ipc_path)
+            sock.settimeout(None)
+        except OSError as e:
+            sock.close()
+            self.logger.debug(f"IPC connect failed: {e}")
+            return None
+
+        self._sock = sock
+        self._reader = threading.Thread(
+            target=self._read_loop, args=(sock,), name="mpv-ipc-reader", daemon=True
+        )
+        self._reader.start()
+        self.logger.debug("IPC connection established")
+        return sock
+
+    def _read_loop(self, sock):
+        """Read newline-delimited JSON messages and dispatch replies."""
+        buffer = b""
+        for handler in self._connect_handlers:
+            try:
+                handler()
+            except Exception as e:
+                self.logger.warning(f"IPC connect handler failed: {e}")
+        try:
+            while True:
+                chunk = sock.recv(65536)
+                if not chunk:
+                    break
+                buffer += chunk
+                while b"\n" in buffer:
+                    line, buffer = buffer.split(b"\n", 1)
+                    if line.strip():
+                        self._dispatch(line)
+        except OSError:
+            pass
+        finally:
+            self._drop(sock)
+
+    def _dispatch(self, line):
+        try:
+            msg = json.loads(line)
+        except ValueError:
+            self.logger.warning(f"IPC: malformed message {line[:80]!r}")
+            return
+
+        request_id = msg.get("request_id")
+        if request_id is not None and "event" not in msg:
+            with self._pending_lock:
+                future = self._pending.pop(request_id, None)
+            if future is not None and not future.done():
+                future.set_result(msg)
+        elif "event" in msg:
+            for handler in self._event_handlers:
+                try:
+                    handler(msg)
+                except Exception as e:
+                    self.logger.warning(f"IPC event handler failed for {msg['event']}: {e}")
+
+    def _drop(self, sock):
+        """Forget a dead connection and fail every caller still waiting on it."""
+        with self._conn_lock:
+            if self._sock is sock:
+                self._sock = None
+                self._reader = None
+        try:
+            sock.close()
+        except OSError:
+            pass
+
+        with self._pending_lock:
+            pending, self._pending = self._pending, {}
+        for future in pending.values():
+            if not future.done():
+                future.set_exception(ConnectionError("mpv IPC connection closed"))
+
+    def request(self, command) -> Future:
+        """Send a command without waiting. The returned Future holds mpv's reply.
+
+        A caller that stops waiting (e.g. on a timeout) should cancel the
+        Future, so its request is forgotten instead of waiting for a reply
+        that may never come.
+        """
+        future = Future()
+        with self._conn_lock:
+            sock = self._connect()
+        if sock is None:
+            future.set_exception(ConnectionError("mpv IPC socket not available"))
+            return future
+
+        request_id = next(self._request_ids)
+        msg = json.dumps({"command": command, "request_id": request_id}) + "\n"
+        with self._pending_lock:
+            self._pending[request_id] = future
+        future.add_done_callback(lambda f, rid=request_id: self._forget_if_cancelled(rid, f))
+        try:
+            with self._write_lock:
+                sock.sendall(msg.encode())
+        except OSError as e:
+            with self._pending_lock:
+                self._pending.pop(request_id, None)
+            self._drop(sock)
+            if not future.done():
+                future.set_exception(ConnectionError(f"IPC send failed: {e}"))
+        return future
+
+    def _forget_if_cancelled(self, request_id, future):
+        if future.cancelled():
+            with self._pending_lock:
+                self._pending.pop(request_id, None)
+
+    def send(self, command, timeout=1.0):
+        """Send a command and wait for its reply.
+
+        Returns the reply dict for ``get_*`` commands, True for other
+        successful commands and None on failure.
+        """
+        for attempt in range(2):
+            future = self.request(command)
+            try:
+                response = future.result(timeout=timeout)
+            except ConnectionError:
+                # mpv may have been restarted; retry once on a fresh connection
+                continue
+            except FutureTimeoutError:
+                future.cancel()
+                self.logger.warning(f"IPC timeout waiting for {command[0]}")
+                return None
+
+            if command[0].startswith("get_"):
+                return response
+            if response.get("error") != "success":
+                self.logger.debug(f"IPC {command[0]} failed: {response.get('error')}")
+                return None
+            return True
+        return None
+
+    def close(self):
+        """Close the connection, failing any outstanding requests."""
+        with self._conn_lock:
+            sock = self._sock
+        if sock is not None:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            self._drop(sock)
+
+
+class PlaybackBackend(ABC):
+    """An mpv instance as seen by Player.
+
+    Commands use mpv's JSON IPC shape (``["loadfile", url, "replace"]``,
+    ``["set_property", name, value]``, ``["get_property", name]``,
+    ``["observe_property", id, name]``) and replies are ``{"error", "data"}``
+    dicts, whatever the transport. Events are delivered to event handlers
+    as IPC-style dicts (``{"event": "end-file", "reason": "eof", ...}``);
+    connect handlers run whenever a fresh instance is ready, so property
+    observers can be set up again.
+    """
+
+    name = "none"
+
+    def __init__(self, logger):
+        self.logger = logger
+        self._event_handlers = []
+        self._connect_handlers = []
+
+    def add_event_handler(self, handler):
+        self._event_handlers.append(handler)
+
+    def add_connect_handler(self, handler):
+        self._connect_handlers.append(handler)
+
+    @property
+    @abstractmethod
+    def alive(self) -> bool:
+        """True while the mpv instance can take commands."""
+
+    @abstractmethod
+    def start(self):
+        """Make sure an mpv instance is running (no-op if it is)."""
+
+    @abstractmethod
+    def request(self, command) -> Future:
+        """Send a command without waiting; the Future holds the reply dict."""
+
+    def send(self, command, timeout=1.0):
+        """Same contract as MpvIPC.send: reply dict for ``get_*``, else True/None."""
+        future = self.request(command)
+        try:
+            response = future.result(timeout=timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            self.logger.warning(f"mpv timeout waiting for {command[0]}")
+            return None
+        except Exception as e:
+            self.logger.debug(f"mpv {command[0]} failed: {e}")
+            return None
+        if command[0].startswith("get_"):
+            return response
+        if response.get("error") != "success":
+            self.logger.debug(f"mpv {command[0]} failed: {response.get('error')}")
+            return None
+        return True
+
+    @abstractmethod
+    def stop(self):
+        """Shut the mpv instance down."""
+
+
+class IpcBackend(PlaybackBackend):
+    """mpv as a child process driven over its JSON IPC socket."""
+
+    name = "ipc"
+
+    def __init__(self, executable, args, ipc_path, logger):
+        super().__init__(logger)
+        self.executable = executable
+        self.args = list(args) + [f"--input-ipc-server={ipc_path}"]
+        self.ipc_path = ipc_path
+        self.process = None
+        self.ipc = MpvIPC(ipc_path, logger)
+
+    def add_event_handler(self, handler):
+        self.ipc.add_event_handler(handler)
+
+    def add_connect_handler(self, handler):
+        self.ipc.add_connect_handler(handler)
+
+    @property
+    def alive(self) -> bool:
+        return self.process is not None and self.process.poll() is None
+
+    def start(self):
+        if self.alive:
+            return
+        self.logger.debug("Starting mpv process...")
+        # Any connection to a previous instance is dead now
+        self.ipc.close()
+        self._remove_socket()
+
+        cmd = [self.executable] + self.args
+
+        # Use a log file for debugging playback issues
+        log_file = open(get_data_dir() / "player.log", "a")
+        try:
+            self.process = subprocess.Popen(
+                cmd,
+                stdin=subprocess.DEVNULL,
+                stdout=log_file,
+                stderr=log_file,
+                start_new_session=True
+            )
+            self.logger.debug(f"mpv started with PID {self.process.pid}")
+        except Exception as e:
+            self.logger.error(f"Failed to start mpv: {e}")
+            return
+
+        # Wait for the socket in short steps so a ready mpv is picked up at once
+        started = time.monotonic()
+        while time.monotonic() - started < 2.0:
+            if os.path.exists(self.ipc_path):
+                self.logger.debug(f"IPC socket found after {time.monotonic() - started:.2f}s")
+                break
+            if self.process.poll() is not None:
+                self.logger.error(f"mpv exited during startup (code {self.process.returncode})")
+                break
+            time.sleep(0.01)
+        else:
+            self.logger.error("MPV IPC socket not found after timeout")
+
+    def request(self, command) -> Future:
+        return self.ipc.request(command)
+
+    def send(self, command, timeout=1.0):
+        return self.ipc.send(command, timeout=timeout)
+
+    def stop(self):
+        self.ipc.close()
+        if self.process:
+            try:
+                self.process.terminate()
+                self.process.wait(timeout=1)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+            except Exception:
+                pass
+            self.process = None
+        self._remove_socket()
+
+    def _remove_socket(self):
+        if os.path.exists(self.ipc_path):
+            try:
+                os.remove(self.ipc_path)
+            except OSError:
+                pass
+
+
+# --- libmpv (client.h) through ctypes ---------------------------------------
+
+_FORMAT_NONE, _FORMAT_STRING, _FORMAT_FLAG, _FORMAT_INT64, _FORMAT_DOUBLE = 0, 1, 3, 4, 5
+_FORMAT_NODE, _FORMAT_NODE_ARRAY, _FORMAT_NODE_MAP = 6, 7, 8
+
+_EVENT_SHUTDOWN, _EVENT_START_FILE, _EVENT_END_FILE, _EVENT_PROPERTY_CHANGE = 1, 6, 7, 22
+
+_END_FILE_REASONS = {0: "eof", 2: "stop", 3: "quit", 4: "error", 5: "redirect"}
+
+# mpv 0.33 (client API 1.108) added playlist entry ids to start/end-file events
+_ENTRY_ID_API_VERSION = (1 << 16) | 108
+
+
+class _NodeUnion(ctypes.Union):
+    _fields_ = [
+        ("string", ctypes.c_char_p),
+        ("flag", ctypes.c_int),
+        ("int64", ctypes.c_int64),
+        ("double", ctypes.c_double),
+        ("list", ctypes.c_void_p),
+        ("ba", ctypes.c_void_p),
+    ]
+
+
+class _Node(ctypes.Structure):
+    _fields_ = [("u", _NodeUnion), ("format", ctypes.c_int)]
+
+
+class _NodeList(ctypes.Structure):
+    _fields_ = [
+        ("num", ctypes.c_int),
+        ("values", ctypes.POINTER(_Node)),
+        ("keys", ctypes.POINTER(ctypes.c_char_p)),
+    ]
+
+
+class _Event(ctypes.Structure):
+    _fields_ = [
+        ("event_id", ctypes.c_int),
+        ("error", ctypes.c_int),
+        ("reply_userdata", ctypes.c_uint64),
+        ("data", ctypes.c_void_p),
+    ]
+
+
+class _EventProperty(ctypes.Structure):
+    _fields_ = [("name", ctypes.c_char_p), ("format", ctypes.c_int), ("data", ctypes.c_void_p)]
+
+
+class _EventStartFile(ctypes.Structure):
+    _fields_ = [("playlist_entry_id", ctypes.c_int64)]
+
+
+class _EventEndFile(ctypes.Structure):
+    _fields_ = [
+        ("reason", ctypes.c_int),
+        ("error", ctypes.c_int),
+        ("playlist_entry_id", ctypes.c_int64),
+    ]
+
+
+def _decode_node(node: _Node):
+    fmt = node.format
+    if fmt == _FORMAT_STRING:
+        return node.u.string.decode("utf-8", "replace")
+    if fmt == _FORMAT_FLAG:
+        return bool(node.u.flag)
+    if fmt == _FORMAT_INT64:
+        return node.u.int64
+    if fmt == _FORMAT_DOUBLE:
+        return node.u.double
+    if fmt in (_FORMAT_NODE_ARRAY, _FORMAT_NODE_MAP):
+        items = ctypes.cast(node.u.list, ctypes.POINTER(_NodeList)).contents
+        values = [_decode_node(items.values[i]) for i in range(items.num)]
+        if fmt == _FORMAT_NODE_ARRAY:
+            return values
+        return {items.keys[i].decode("utf-8", "replace"): values[i] for i in range(items.num)}
+    return None
+
+
+def _encode_arg(value) -> bytes:
+    if isinstance(value, bool):
+        value = "yes" if value else "no"
+    return str(value).encode()
+
+
+_libmpv = None
+
+
+def load_libmpv():
+    """The libmpv shared library with prototypes set up, or None if unavailable."""
+    global _libmpv
+    if _libmpv is not None:
+        return _libmpv or None
+    _libmpv = False
+    path = ctypes.util.find_library("mpv")
+    candidates = [path] if path else ["libmpv.so.2", "libmpv.so.1", "libmpv.2.dylib", "mpv-2.dll"]
+    for candidate in candidates:
+        try:
+            lib = ctypes.CDLL(candidate)
+            break
+        except OSError:
+            continue
+    else:
+        return None
+
+    handle = ctypes.c_void_p
+    prototypes = {
+        "mpv_client_api_version": (ctypes.c_ulong, []),
+        "mpv_create": (handle, []),
+        "mpv_initialize": (ctypes.c_int, [handle]),
+        "mpv_terminate_destroy": (None, [handle]),
+        "mpv_set_option_string": (ctypes.c_int, [handle, ctypes.c_char_p, ctypes.c_char_p]),
+        "mpv_set_property_string": (ctypes.c_int, [handle, ctypes.c_char_p, ctypes.c_char_p]),
+        "mpv_get_property": (ctypes.c_int, [handle, ctypes.c_char_p, ctypes.c_int, ctypes.c_void_p]),
+        "mpv_observe_property": (ctypes.c_int, [handle, ctypes.c_uint64, ctypes.c_char_p, ctypes.c_int]),
+        "mpv_command_ret": (ctypes.c_int, [handle, ctypes.POINTER(ctypes.c_char_p), ctypes.POINTER(_Node)]),
+        "mpv_free_node_contents": (None, [ctypes.POINTER(_Node)]),
+        "mpv_wait_event": (ctypes.POINTER(_Event), [handle, ctypes.c_double]),
+        "mpv_wakeup": (None, [handle]),
+        "mpv_error_string": (ctypes.c_char_p, [ctypes.c_int]),
+    }
+    try:
+        for name, (restype, argtypes) in prototypes.items():
+            func = getattr(lib, name)
+            func.restype = restype
+            func.argtypes = argtypes
+    except AttributeError:
+        return None  # too old for mpv_command_ret
+    _libmpv = lib
+    return lib
+
+
+class _LibmpvHandle:
+    """One libmpv handle, its own stop signal and the calls in flight on it.
+
+    The event thread of the handle frees it on its way out, once every
+    call that got in through acquire() has left, so a stopped or restarted
+    backend never frees a handle another thread is still using.
+    """
+
+    def __init__(self, lib, ctx):
+        self.lib = lib
+        self.ctx = ctx
+        self.stopping = threading.Event()
+        self._users = 0
+        self._cond = threading.Condition()
+
+    def acquire(self) -> bool:
+        with self._cond:
+            if self.stopping.is_set():
+                return False
+            self._users += 1
+            return True
+
+    def release(self):
+        with self._cond:
+            self._users -= 1
+            if not self._users:
+                self._cond.notify_all()
+
+    def close(self):
+        """Ask the event thread to stop; it frees the handle."""
+        with self._cond:
+            if self.stopping.is_set():
+                return  # already on its way out, and maybe already freed
+            self.stopping.set()
+            self.lib.mpv_wakeup(self.ctx)
+
+    def free(self):
+        """Free the handle once no call is using it. Event thread only."""
+        with self._cond:
+            self.stopping.set()
+            self._cond.wait_for(lambda: not self._users)
+        self.lib.mpv_terminate_destroy(self.ctx)
+
+
+class LibmpvBackend(PlaybackBackend):
+    """mpv running inside our process through libmpv.
+
+    There is no socket to wait for and no JSON on the command path:
+    commands are direct library calls, and a thread blocked in
+    ``mpv_wait_event`` turns property changes and file events into the
+    same dicts the IPC backend delivers.
+    """
+
+    name = "libmpv"
+
+    def __init__(self, lib, args, logger):
+        super().__init__(logger)
+        self._lib = lib
+        self._options = list(self._parse_args(args))
+        self._options.append(("log-file", str(get_data_dir() / "player.log")))
+        self._entry_ids = lib.mpv_client_api_version() >= _ENTRY_ID_API_VERSION
+        self._handle = None  # _LibmpvHandle of the running core
+        self._events = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _parse_args(args):
+        """Command-line style ``--name=value`` / ``--[no-]flag`` args as option pairs."""
+        for arg in args:
+            name, sep, value = arg[2:].partition("=")
+            if not sep:
+                if name.startswith("no-"):
+                    name, value = name[3:], "no"
+                else:
+                    value = "yes"
+            if name != "input-ipc-server":
+                yield name, value
+
+    @property
+    def alive(self) -> bool:
+        handle = self._handle
+        return handle is not None and not handle.stopping.is_set()
+
+    def start(self):
+        with self._lock:
+            if self.alive:
+                return
+            self._destroy()
+            # libmpv refuses to start unless numbers are formatted the C way
+            locale.setlocale(locale.LC_NUMERIC, "C")
+            ctx = self._lib.mpv_create()
+            if not ctx:
+                self.logger.error("mpv_create failed")
+                return
+            for name, value in self._options:
+                if self._lib.mpv_set_option_string(ctx, name.encode(), value.encode()) < 0:
+                    self.logger.warning(f"libmpv rejected option {name}={value}")
+            self._lib.mpv_set_option_string(ctx, b"ytdl", b"yes")
+            rc = self._lib.mpv_initialize(ctx)
+            if rc < 0:
+                self.logger.error(f"mpv_initialize failed: {self._error(rc)}")
+                self._lib.mpv_terminate_destroy(ctx)
+                return
+            self._handle = _LibmpvHandle(self._lib, ctx)
+            self._events = threading.Thread(target=self._event_loop, args=(self._handle,), name="libmpv-events", daemon=True)
+            self._events.start()
+            self.logger.debug("libmpv initialized")
+
+    def _error(self, rc) -> str:
+        return self._lib.mpv_error_string(rc).decode()
+
+    def _event_loop(self, handle):
+        try:
+            self._pump_events(handle)
+        finally:
+            handle.free()
+            self.logger.debug("libmpv handle freed")
+
+    def _pump_events(self, handle):
+        for handler in self._connect_handlers:
+            try:
+                handler()
+            except Exception as e:
+                self.logger.warning(f"libmpv connect handler failed: {e}")
+        while not handle.stopping.is_set():
+            event = self._lib.mpv_wait_event(handle.ctx, -1).contents
+            if event.event_id == _EVENT_SHUTDOWN:
+                break
+            msg = self._translate(event)
+            if msg is None:
+                continue
+            for handler in self._event_handlers:
+                try:
+                    handler(msg)
+                except Exception as e:
+                    self.logger.warning(f"libmpv event handler failed for {msg['event']}: {e}")
+
+    def _translate(self, event: _Event):
+        """IPC-style dict for the events Player cares about, else None."""
+        if event.event_id == _EVENT_PROPERTY_CHANGE:
+            prop = ctypes.cast(event.data, ctypes.POINTER(_EventProperty)).contents
+            data = None
+            if prop.format == _FORMAT_NODE and prop.data:
+                data = _decode_node(ctypes.cast(prop.data, ctypes.POINTER(_Node)).contents)
+            return {"event": "property-change", "id": event.reply_userdata, "name": prop.name.decode(), "data": data}
+        if event.event_id == _EVENT_START_FILE:
+            msg = {"event": "start-file"}
+            if self._entry_ids and event.data:
+                msg["playlist_entry_id"] = ctypes.cast(event.data, ctypes.POINTER(_EventStartFile)).contents.playlist_entry_id
+            return msg
+        if event.event_id == _EVENT_END_FILE:
+            end = ctypes.cast(event.data, ctypes.POINTER(_EventEndFile)).contents
+            msg = {"event": "end-file", "reason": _END_FILE_REASONS.get(end.reason, "unknown")}
+            if self._entry_ids:
+                msg["playlist_entry_id"] = end.playlist_entry_id
+            return msg
+        return None
+
+    def request(self, command) -> Future:
+        future = Future()
+        try:
+            future.set_result(self._execute(command))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+    def _execute(self, command) -> dict:
+        handle = self._handle
+        if handle is None or not handle.acquire():
+            raise ConnectionError("libmpv not running")
+        try:
+            return self._call(handle.ctx, command)
+        finally:
+            handle.release()
+
+    def _call(self, ctx, command) -> dict:
+        lib = self._lib
+        name, args = command[0], command[1:]
+        data = None
+        if name == "set_property":
+            rc = lib.mpv_set_property_string(ctx, _encode_arg(args[0]), _encode_arg(args[1]))
+        elif name == "observe_property":
+            rc = lib.mpv_observe_property(ctx, int(args[0]), _encode_arg(args[1]), _FORMAT_NODE)
+        elif name == "get_property":
+            node = _Node()
+            rc = lib.mpv_get_property(ctx, _encode_arg(args[0]), _FORMAT_NODE, ctypes.byref(node))
+            if rc >= 0:
+                data = _decode_node(node)
+                lib.mpv_free_node_contents(ctypes.byref(node))
+        else:
+            argv = (ctypes.c_char_p * (len(command) + 1))(*[_encode_arg(a) for a in command], None)
+            node = _Node()
+            rc = lib.mpv_command_ret(ctx, argv, ctypes.byref(node))
+            if rc >= 0:
+                data = _decode_node(node)
+                lib.mpv_free_node_contents(ctypes.byref(node))
+        return {"error": "success" if rc >= 0 else self._error(rc), "data": data}
+
+    def stop(self):
+        with self._lock:
+            self._destroy()
+
+    def _destroy(self):
+        """Stop the event thread, which frees the handle. Caller holds _lock.
+
+        Waits a moment for that to happen; an event thread still busy in
+        a handler (or the one we are on) frees it when it gets out.
+        """
+        handle, self._handle = self._handle, None
+        if handle is None:
+            return
+        handle.close()
+        events, self._events = self._events, None
+        if events is not None and events is not threading.current_thread():
+            events.join(timeout=1.0)
+            if events.is_alive():
+                self.logger.warning("libmpv event thread still busy; it will free the handle when it exits")
+
+
+def create_backend(preference, executable, args, ipc_path, logger):
+    """Pick the playback backend: ``"ipc"``, ``"libmpv"`` or ``"auto"`` (libmpv when loadable).
+
+    ``"ipc"`` is the default: an mpv process can crash and be restarted
+    by the supervisor, while a crash inside libmpv ends our process.
+    Whichever is asked for, the other one is used if it is the only one
+    available; None when there is neither an mpv binary nor libmpv.
+    """
+    if preference == "ipc" and executable:
+        return IpcBackend(executable, args, ipc_path, logger)
+    lib = load_libmpv()
+    if lib is not None:
+        return LibmpvBackend(lib, args, logger)
+    if preference == "libmpv":
+        logger.warning("libmpv not found; using the mpv process backend")
+    if executable:
+        return IpcBackend(executable, args, ipc_path, logger)
+    return None
@@ -0,0 +1,112 @@
+import json
+import logging
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from urllib.parse import parse_qs, urlparse
+
+from src.config import get_data_dir
+
+logger = logging.getLogger(__name__)
+
+# googlevideo URLs carry their expiry either as a query arg or a path segment
+_EXPIRE_RE = re.compile(r"[?&/]expire[=/](\d+)")
+
+
+def video_id_from_url(url: str):
+    """Extract the videoId from a YouTube / YouTube Music watch URL."""
+    parsed = urlparse(url)
+    ids = parse_qs(parsed.query).get("v")
+    if ids:
+        return ids[0]
+    if parsed.netloc.endswith("youtu.be"):
+        return parsed.path.lstrip("/") or None
+    return None
+
+
+def parse_expiry(stream_url: str):
+    """Return the unix timestamp after which a stream URL stops working."""
+    match = _EXPIRE_RE.search(stream_url)
+    return int(match.group(1)) if match else None
+
+
+class StreamCache:
+    """Persistent videoId -> resolved stream URL cache.
+
+    Entries expire with the ``expire=`` timestamp embedded in the URL (minus a
+    safety margin so playback never starts on a link that is about to die)
+    and the least recently used entries are evicted beyond ``max_entries``.
+    """
+
+    def __init__(self, path=None, max_entries=500, safety_margin=300, default_ttl=3600):
+        self.path = path or (get_data_dir() / "stream_cache.json")
+        self.max_entries = max_entries
+        self.safety_margin = safety_margin
+        self.default_ttl = default_ttl
+        self._entries = OrderedDict()  # video_id -> {"url": ..., "expires": ...}
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable stream cache: {e}")
+            return
+
+        now = time.time()
+        for video_id, entry in data.items():
+            if entry.get("expires", 0) > now:
+                self._entries[video_id] = entry
+
+    def _save(self):
+        """Write the cache atomically so a crash never leaves a torn file."""
+        tmp_path = f"{self.path}.tmp"
+        try:
+            with open(tmp_path, "w") as f:
+                json.dump(self._entries, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning(f"Could not persist stream cache: {e}")
+
+    def get(self, video_id):
+        """Return a still-valid stream URL for ``video_id`` or None."""
+        with self._lock:
+            entry = self._entries.get(video_id)
+            if entry is None:
+                return None
+            if entry["expires"] <= time.time():
+                del self._entries[video_id]
+                return None
+            self._entries.move_to_end(video_id)
+            return entry["url"]
+
+    def put(self, video_id, stream_url):
+        """Store a freshly resolved stream URL."""
+        expires = parse_expiry(stream_url)
+        if expires is None:
+            expires = time.time() + self.default_ttl
+        expires -= self.safety_margin
+        if expires <= time.time():
+            return
+
+        with self._lock:
+            self._entries[video_id] = {"url": stream_url, "expires": expires}
+            self._entries.move_to_end(video_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            self._save()
+
+    def invalidate(self, video_id):
+        """Drop an entry, e.g. after mpv failed to open its URL."""
+        with self._lock:
+            if self._entries.pop(video_id, None) is not None:
+                self._save()
+
+    def __len__(self):
+        return len(self._entries)
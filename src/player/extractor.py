@@ -0,0 +1,170 @@
+import asyncio
+import logging
+import os
+import shutil
+import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+
+from src.player.cache import StreamCache
+
+logger = logging.getLogger(__name__)
+
+WATCH_URL = "https://music.youtube.com/watch?v={}"
+RESOLVE_TIMEOUT = 10  # seconds a blocking resolve waits, as the yt-dlp subprocess did
+
+
+def find_ytdlp_binary():
+    """Locate the yt-dlp executable in PATH or in the project's venv."""
+    ytdlp_bin = shutil.which("yt-dlp")
+    if ytdlp_bin:
+        return ytdlp_bin
+    # Fallback: check current venv if running from source but not in PATH
+    venv_ytdlp = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), ".venv/bin/yt-dlp")
+    if os.path.exists(venv_ytdlp):
+        return venv_ytdlp
+    return None
+
+
+class StreamResolver:
+    """Resolves videoIds to direct audio stream URLs inside the app process.
+
+    Each worker thread keeps one warm ``yt_dlp.YoutubeDL`` instance, so the
+    import, extractor initialisation, HTTP session and player-JS cache are
+    paid once instead of on every play. Results go through the StreamCache
+    and concurrent requests for the same videoId share a single extraction.
+    Interactive resolves (the track the user just picked) run on a worker
+    of their own, so they never queue behind prefetch or cache downloads.
+    """
+
+    YDL_OPTS = {
+        'format': 'bestaudio/best',
+        'quiet': True,
+        'no_warnings': True,
+        'extract_flat': False,
+        'noplaylist': True,
+        'skip_download': True,
+    }
+
+    def __init__(self, cache=None, workers=1):
+        self.cache = cache if cache is not None else StreamCache()
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="yt-dlp")
+        self._interactive = ThreadPoolExecutor(max_workers=1, thread_name_prefix="yt-dlp-play")
+        self._local = threading.local()
+        self._inflight = {}  # video_id -> Future
+        self._inflight_lock = threading.RLock()
+        self._ytdl_available = True
+
+    def _get_ydl(self):
+        """Return this worker thread's YoutubeDL, creating it on first use."""
+        ydl = getattr(self._local, "ydl", None)
+        if ydl is None:
+            import yt_dlp
+            # Route yt-dlp's own output to our log instead of the terminal
+            ydl = yt_dlp.YoutubeDL(dict(self.YDL_OPTS, logger=logger))
+            self._local.ydl = ydl
+        return ydl
+
+    def warm_up(self):
+        """Import yt_dlp and build the YoutubeDL object in the background."""
+        def _warm():
+            try:
+                self._get_ydl()
+            except ImportError:
+                if self._ytdl_available:  # once, not per pool
+                    self._ytdl_available = False
+                    logger.warning("yt_dlp module not importable; falling back to the yt-dlp binary")
+        self._executor.submit(_warm)
+        self._interactive.submit(_warm)
+
+    def submit(self, video_id, interactive=False):
+        """Schedule resolution of ``video_id``; returns a concurrent Future.
+
+        An interactive request shares an extraction already running for
+        the same videoId, but does not wait for one still queued.
+        """
+        with self._inflight_lock:
+            future = self._inflight.get(video_id)
+            if future is None or (interactive and not (future.running() or future.done())):
+                # A queued background one finds the result in the cache
+                executor = self._interactive if interactive else self._executor
+                future = executor.submit(self._resolve, video_id)
+                self._inflight[video_id] = future
+                future.add_done_callback(lambda f, vid=video_id: self._forget(vid, f))
+            return future
+
+    def _forget(self, video_id, future):
+        with self._inflight_lock:
+            if self._inflight.get(video_id) is future:
+                del self._inflight[video_id]
+
+    def resolve_sync(self, video_id, timeout=RESOLVE_TIMEOUT, interactive=False):
+        """Blocking resolve; returns the stream URL, or None if it failed or took over ``timeout`` seconds."""
+        cached = self.cache.get(video_id)
+        if cached:
+            logger.debug(f"Stream cache hit for {video_id}")
+            return cached
+        try:
+            return self.submit(video_id, interactive).result(timeout)
+        except FutureTimeoutError:
+            # The extraction carries on and caches its result for next time
+            logger.warning(f"Stream extraction for {video_id} timed out after {timeout}s")
+            return None
+
+    async def resolve(self, video_id):
+        """Awaitable resolve for use from the Textual event loop."""
+        cached = self.cache.get(video_id)
+        if cached:
+            return cached
+        return await asyncio.wrap_future(self.submit(video_id, interactive=True))
+
+    def _resolve(self, video_id):
+        cached = self.cache.get(video_id)
+        if cached:
+            return cached
+
+        stream_url = None
+        if self._ytdl_available:
+            try:
+                stream_url = self._extract_in_process(video_id)
+            except ImportError:
+                self._ytdl_available = False
+                logger.warning("yt_dlp module not importable; falling back to the yt-dlp binary")
+            except Exception as e:
+                logger.warning(f"In-process extraction failed for {video_id}: {e}")
+        if stream_url is None and not self._ytdl_available:
+            stream_url = self._extract_subprocess(video_id)
+
+        if stream_url:
+            self.cache.put(video_id, stream_url)
+        return stream_url
+
+    def _extract_in_process(self, video_id):
+        info = self._get_ydl().extract_info(WATCH_URL.format(video_id), download=False)
+        if info.get("url"):
+            return info["url"]
+        # Merged selections list each component separately
+        for fmt in info.get("requested_formats") or []:
+            if fmt.get("url"):
+                return fmt["url"]
+        return None
+
+    def _extract_subprocess(self, video_id):
+        ytdlp_bin = find_ytdlp_binary() or "yt-dlp"
+        logger.debug(f"Extracting URL with {ytdlp_bin}...")
+        try:
+            result = subprocess.run(
+                [ytdlp_bin, "-g", "-f", "bestaudio", WATCH_URL.format(video_id)],
+                capture_output=True, text=True, timeout=10
+            )
+        except Exception as e:
+            logger.warning(f"Direct extraction error: {e}")
+            return None
+        if result.returncode != 0:
+            logger.warning(f"yt-dlp extraction failed: {result.stderr}")
+            return None
+        return result.stdout.strip().splitlines()[0] if result.stdout.strip() else None
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._interactive.shutdown(wait=False, cancel_futures=True)
@@ -1,103 +1,101 @@
-import subprocess
 import logging
 import shutil
 import os
-import json
-import socket
-import time
 import threading
 import signal
-from src.config import get_config_dir, get_data_dir
-
-class MpvIPC:
-    """Helper class to handle robust MPV IPC communication."""
-    def __init__(self, ipc_path, logger):
-        self.ipc_path = ipc_path
-        self.logger = logger
-        self._max_retries = 3
-
-    def send(self, command, timeout=0.2):
-        """Send a command with automatic retries."""
-        if not os.path.exists(self.ipc_path):
-            return None
-
-        for attempt in range(self._max_retries):
-            try:
-                with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
-                    client.settimeout(timeout)
-                    client.connect(self.ipc_path)
-                    
-                    msg = json.dumps({"command": command}) + "\n"
-                    client.sendall(msg.encode())
-                    
-                    # If it's a 'get_' property command, wait for response
-                    if command[0].startswith("get_"):
-                        response = b""
-                        while True:
-                            chunk = client.recv(4096)
-                            if not chunk: break
-                            response += chunk
-                            if b"\n" in chunk: break
-                        
-                        if response:
-                            return json.loads(response.decode().split("\n")[0])
-                    return True  # Success for set commands
-            
-            except (socket.timeout, ConnectionRefusedError):
-                if attempt < self._max_retries - 1:
-                    time.sleep(0.05 * (attempt + 1))
-                    continue
-            except Exception as e:
-                self.logger.warning(f"IPC error sending {command[0]}: {e}")
-                break
-        return None
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from src.config import get_config_dir, load_settings
+from src.player.audio_cache import AudioCache
+from src.player.backends import create_backend, load_libmpv
+from src.player.cache import StreamCache, video_id_from_url
+from src.player.extractor import WATCH_URL, StreamResolver, find_ytdlp_binary
+from src.player.queue import PlayQueue
+from src.player.supervisor import MpvSupervisor
 
 class Player:
+    # mpv properties mirrored into the status snapshot (observe id -> name)
+    OBSERVED_PROPERTIES = {
+        1: "pause",
+        2: "time-pos",
+        3: "duration",
+        4: "percent-pos",
+        5: "volume",
+        6: "idle-active",
+        7: "playlist-pos",
+        8: "playlist-count",
+    }
+
     def __init__(self):
         self.logger = logging.getLogger(__name__)
         self.process = None
         self.current_url = None
         self.ipc_path = f"/tmp/ytmusic-cli-mpv-{os.getuid()}.sock"
         self._paused = False
+        self._closing = False  # set by stop(); a restore in flight must not respawn mpv
         self._lock = threading.RLock()
-        
-        # Initialize IPC Helper
-        self.ipc = MpvIPC(self.ipc_path, self.logger)
-        
-        # Configuration for yt-dlp
-        self.ydl_opts = {
-            'format': 'bestaudio/best',
-            'quiet': True,
-            'no_warnings': True,
-            'extract_flat': False,
-        }
+        self._current_video_id = None
+        self.stream_cache = StreamCache()
+        settings = load_settings()
+        # Warm, in-process yt-dlp so the first play doesn't pay its startup
+        self.resolver = StreamResolver(self.stream_cache, workers=settings["prefetch_workers"])
+        self.resolver.warm_up()
+        # Local copies of favorite / often played tracks, preferred over streaming
+        self.audio_cache = AudioCache(
+            self.resolver.resolve_sync,
+            max_bytes=settings["audio_cache_mb"] * 1024 * 1024,
+            min_plays=settings["audio_cache_min_plays"],
+            rate_limit=settings["audio_cache_rate_kb"] * 1024,
+        )
+        self._current_stream = None  # what mpv is actually playing (URL or local file)
+
+        # The play queue owns the order. Its first prefetch_depth entries
+        # are handed to mpv's playlist (_window) once their stream is
+        # resolved, so transitions never hit ytdl_hook; any queue change
+        # is reconciled against the window by patching just the entries
+        # that differ. Neither _queue_lock nor _lock is held across the
+        # window's IPC; play() and restore() bump _window_gen when their
+        # 'replace' wipes mpv's playlist, so a fill that raced them knows
+        # its append is stale.
+        self.queue = PlayQueue()
+        self.queue.add_listener(self._on_queue_change)
+        self.prefetch_depth = max(1, int(settings["prefetch_depth"]))
+        self._window = deque()    # (queue_entry_id, watch_url, mpv_url, playlist_entry_id) in mpv
+        self._resolving = {}      # video_id -> resolver Future for the window head
+        self._window_gen = 0      # bumped whenever the window is cleared
+        self._queue_lock = threading.Lock()
+        self._fill_lock = threading.Lock()
+        self._fill_pending = False
+        self._queue_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="player-queue")
+
+        # Playback state pushed by mpv; readers never touch the socket
+        self._state_lock = threading.Lock()
+        self._props = {}
+        self._listeners = []
 
         self.auth_file = str(get_config_dir() / "oauth.json")
         
-        if shutil.which("mpv"):
-            self.executable = "mpv"
-            # ... (Rest of init remains same, effectively replacing _send_command usages later)
+        mpv_binary = shutil.which("mpv")
+        self.backend = None
+        self.supervisor = None
+        if mpv_binary or load_libmpv():
             self.executable = "mpv"
             
             # Robustly find yt-dlp in PATH (system or venv)
-            ytdlp_bin = shutil.which("yt-dlp")
+            ytdlp_bin = find_ytdlp_binary()
             if not ytdlp_bin:
-                # Fallback: check current venv if running from source but not in PATH
-                venv_ytdlp = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), ".venv/bin/yt-dlp")
-                if os.path.exists(venv_ytdlp):
-                    ytdlp_bin = venv_ytdlp
-                else:
-                    self.logger.warning("yt-dlp not found in PATH. Playback may fail.")
+                self.logger.warning("yt-dlp not found in PATH. Playback may fail.")
 
             # Argumentos: "Pure Audio Mode" (Sin corrección A/V para evitar crujidos)
             self.args = [
                 "--no-video", 
                 "--idle=yes", 
-                f"--input-ipc-server={self.ipc_path}",
                 # Networking
                 "--cache=yes",
                 "--demuxer-max-bytes=128MiB",
                 "--demuxer-readahead-secs=20",
+                "--prefetch-playlist=yes",   # Open the next entry before the current ends
                 # AUDIO PURO: Desactivar sincronización de video (Causa #1 de crujidos)
                 "--mc=0",                    # Disable A/V sync correction
                 "--autosync=0",              # Disable auto-sync
@@ -119,6 +117,16 @@ class Player:
             
             if ytdlp_bin:
                 self.args.append(f"--script-opts=ytdl_hook-ytdl_path={ytdlp_bin}")
+
+            # In-process libmpv when available, else mpv over its IPC socket
+            self.backend = create_backend(
+                settings["playback_backend"], mpv_binary, self.args, self.ipc_path, self.logger
+            )
+            self.backend.add_connect_handler(self._observe_properties)
+            self.backend.add_event_handler(self._on_mpv_event)
+            self.logger.debug(f"Playback backend: {self.backend.name}")
+            # Restarts mpv (and restores what it was playing) if it dies or hangs
+            self.supervisor = MpvSupervisor(self)
         elif shutil.which("ffplay"):
             self.executable = "ffplay"
             self.args = ["-nodisp", "-autoexit"]
@@ -128,44 +136,141 @@ class Player:
 
     def _ensure_process(self):
         """Ensure mpv is running."""
-        if self.executable == "mpv" and (not self.process or self.process.poll() is not None):
-            self.logger.debug("Starting mpv process...")
-            if os.path.exists(self.ipc_path):
-                try:
-                    os.remove(self.ipc_path)
-                except OSError:
-                    pass
-            
-            cmd = [self.executable] + self.args
-            
-            # Use a log file for debugging playback issues
-            log_file = open(get_data_dir() / "player.log", "a")
-            try:
-                self.process = subprocess.Popen(
-                    cmd,
-                    stdin=subprocess.DEVNULL,
-                    stdout=log_file,
-                    stderr=log_file,
-                    start_new_session=True
-                )
-                self.logger.debug(f"mpv started with PID {self.process.pid}")
-            except Exception as e:
-                self.logger.error(f"Failed to start mpv: {e}")
-                return
-
-            # Give it a moment to create the socket
-            for i in range(20):
-                if os.path.exists(self.ipc_path):
-                    self.logger.debug(f"IPC socket found after {i*0.1:.1f}s")
-                    break
-                time.sleep(0.1)
-            else:
-                self.logger.error("MPV IPC socket not found after timeout")
+        if self.backend is not None:
+            self.backend.start()
 
+    def start(self):
+        """Spawn mpv ahead of the first play so it never pays process startup."""
+        self._closing = False
+        with self._lock:
+            self._ensure_process()
+        if self.supervisor is not None:
+            self.supervisor.start()
+
+    def snapshot(self) -> dict:
+        """What mpv is doing now (track, position, volume, pause, queue), from the cached state."""
+        with self._state_lock:
+            props = dict(self._props)
+        return {
+            "url": None if props.get("idle-active") else self.current_url,
+            "position": props.get("time-pos") or 0,
+            "volume": props.get("volume"),
+            "paused": bool(props.get("pause")),
+            "queue": self.queue.entries(),  # (entry_id, video_id) pairs
+        }
 
-        
+    def restore(self, state: dict, if_idle=False):
+        """Bring a (re)started mpv back to a snapshot() (or a saved session).
+
+        The track is reloaded from the offline or stream cache when
+        possible (else resolved again), the queue goes back through the
+        prefetch pipeline, which only resolves its first prefetch_depth
+        tracks, and the position is restored once the file is open.
+        With ``if_idle`` nothing is restored once a track is playing or
+        queued, e.g. one the user picked while the state was resolving.
+        """
+        if if_idle and not self._idle():
+            return
+        url = state.get("url")
+        # Resolve before taking the lock, as play() does
+        stream_url = (self._resolve_stream(url) or url) if url else None
+        with self._lock:
+            if self._closing:
+                return  # quitting: don't bring mpv back
+            if if_idle and not self._idle():
+                return  # the user started something meanwhile
+            self._ensure_process()
+            with self._queue_lock:
+                self._window.clear()
+                self._window_gen += 1
+                self._resolving.clear()
+            queue = state.get("queue")
+            if queue is not None:
+                queue = [(entry_id, video_id) for entry_id, video_id in queue]
+                if queue != self.queue.entries():
+                    self.queue.load(queue)
+            if state.get("volume") is not None:
+                self.backend.send(["set_property", "volume", state["volume"]])
+            # Before anything is loaded: a queue handed to an idle mpv starts too
+            self.backend.send(["set_property", "pause", bool(state.get("paused"))])
+            if url:
+                self.current_url = url
+                self._current_video_id = video_id_from_url(url)
+                self._current_stream = stream_url
+                self.backend.send(["loadfile", stream_url, "replace"])
+        self._schedule_fill()
+        if url and state.get("position"):
+            self._seek_when_loaded(url, state["position"])
+
+    def _idle(self) -> bool:
+        return self.current_url is None and len(self.queue) == 0
+
+    def _seek_when_loaded(self, url, position, timeout=10.0):
+        """Seek to ``position`` as soon as mpv reports a duration for ``url``."""
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if self.current_url != url or self._closing:
+                return  # something else was played meanwhile, or quitting
+            with self._state_lock:
+                loaded = self._props.get("duration")
+            if loaded:
+                self.backend.send(["seek", position, "absolute"])
+                return
+            time.sleep(0.05)
+        self.logger.warning(f"Could not restore position of {url}: file did not open")
+
+    def add_listener(self, callback):
+        """Register ``callback(event, data)`` for playback events.
+
+        Events are ``start-file`` and ``end-file`` (data carries mpv's
+        ``reason`` and whether mpv's playlist continues with ``has_next``).
+        Callbacks run on the IPC reader thread and must return quickly.
+        """
+        self._listeners.append(callback)
+
+    def _observe_properties(self):
+        """Subscribe to property changes on a fresh IPC connection."""
+        with self._state_lock:
+            self._props.clear()
+        for observe_id, name in self.OBSERVED_PROPERTIES.items():
+            self.backend.request(["observe_property", observe_id, name])
+
+    def _on_mpv_event(self, msg):
+        event = msg.get("event")
+        if event == "property-change":
+            with self._state_lock:
+                self._props[msg.get("name")] = msg.get("data")
+            return
 
+        if event == "end-file":
+            with self._state_lock:
+                pos = self._props.get("playlist-pos")
+                count = self._props.get("playlist-count") or 0
+            has_next = pos is not None and pos >= 0 and pos + 1 < count
+            if msg.get("reason") == "error" and self._current_video_id:
+                # A cached URL may have been revoked early; resolve afresh next time
+                self.stream_cache.invalidate(self._current_video_id)
+                if self._current_stream and not self._current_stream.startswith(("http://", "https://")):
+                    self.audio_cache.discard(self._current_video_id)
+            self._emit(event, {"reason": msg.get("reason"), "has_next": has_next})
+        elif event == "start-file":
+            entry_id = msg.get("playlist_entry_id")
+            url = self._on_entry_started(entry_id)
+            self._emit(event, {"playlist_entry_id": entry_id, "url": url})
+            self._schedule_fill()
+            video_id = video_id_from_url(url) if url else None
+            if video_id:
+                try:
+                    self._queue_executor.submit(self.audio_cache.record_play, video_id)
+                except RuntimeError:
+                    pass
 
+    def _emit(self, event, data):
+        for callback in self._listeners:
+            try:
+                callback(event, data)
+            except Exception as e:
+                self.logger.warning(f"Player listener failed on {event}: {e}")
 
     def play(self, url: str):
         """Play a stream URL."""
@@ -176,72 +281,235 @@ class Player:
         if not self.executable:
             raise RuntimeError("No audio player found (mpv or ffplay). Please install one.")
 
-        with self._lock:
-            if self.current_url == url and self.process and self.process.poll() is None:
-                if self.executable == "mpv":
-                    self.ipc.send(["set_property", "pause", False])
-                return
+        if self.current_url == url and self.backend is not None and self.backend.alive:
+            if self.executable == "mpv":
+                self.backend.send(["set_property", "pause", False])
+            return
 
+        # Try a direct URL first for better reliability and to avoid mpv's
+        # ytdl-hook issues on some systems. Resolve before taking the lock so
+        # pause/seek/volume stay responsive meanwhile.
+        stream_url = self._resolve_stream(url) if self.executable == "mpv" else None
+
+        with self._lock:
             self._ensure_process()
             self.current_url = url
             self._paused = False
             
             if self.executable == "mpv":
-                # NEW: Try to extract direct URL using yt-dlp first for better reliability
-                # and to avoid mpv's ytdl-hook issues on some systems.
-                try:
-                    import subprocess
-                    venv_ytdlp = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), ".venv/bin/yt-dlp")
-                    ytdlp_bin = venv_ytdlp if os.path.exists(venv_ytdlp) else "yt-dlp"
-                    
-                    self.logger.debug(f"Extracting URL with {ytdlp_bin}...")
-                    result = subprocess.run(
-                        [ytdlp_bin, "-g", "-f", "bestaudio", url],
-                        capture_output=True, text=True, timeout=10
-                    )
-                    if result.returncode == 0:
-                        stream_url = result.stdout.strip()
-                        self.ipc.send(["loadfile", stream_url, "replace"])
-                        self.ipc.send(["set_property", "pause", False])
-                        self.logger.debug("Playing via extracted direct URL")
-                        return
-                    else:
-                        self.logger.warning(f"yt-dlp extraction failed: {result.stderr}")
-                except Exception as e:
-                    self.logger.warning(f"Direct extraction error: {e}")
-
-                # Fallback to standard loadfile if extraction failed
-                self.ipc.send(["loadfile", url, "replace"])
-                self.ipc.send(["set_property", "pause", False])
+                # 'replace' clears mpv's playlist: the prefetched entries are
+                # handed to mpv again, minus the song we are about to play
+                with self._queue_lock:
+                    self._window.clear()
+                    self._window_gen += 1
+                video_id = video_id_from_url(url)
+                if video_id:
+                    self.queue.remove_video(video_id, every=True)
+
+                if stream_url:
+                    self._current_video_id = video_id_from_url(url)
+                    self._current_stream = stream_url
+                    self.backend.send(["loadfile", stream_url, "replace"])
+                    self.logger.debug("Playing via extracted direct URL")
+                else:
+                    # Fallback to standard loadfile if extraction failed
+                    self._current_video_id = None
+                    self._current_stream = url
+                    self.backend.send(["loadfile", url, "replace"])
+                self.backend.send(["set_property", "pause", False])
+                self._schedule_fill()
+
+    def _resolve_stream(self, url: str):
+        """Resolve a watch URL to a local cached file or a direct audio stream URL."""
+        video_id = video_id_from_url(url)
+        if not video_id:
+            return None
+        return self._local_or_cached(video_id) or self.resolver.resolve_sync(video_id, interactive=True)
+
+    def _local_or_cached(self, video_id):
+        """Offline copy or still-valid stream URL, without any network access."""
+        return self.audio_cache.path(video_id) or self.stream_cache.get(video_id)
 
     def enqueue(self, url: str):
-        """Add a stream URL to the playlist."""
+        """Add a stream URL to the end of the queue; returns its queue entry id.
+
+        The track is resolved in the background and handed to mpv as a
+        direct stream URL once it is among the next ``prefetch_depth`` tracks.
+        """
         if not url.lower().startswith(('http://', 'https://')):
-            return
+            return None
+        video_id = video_id_from_url(url)
+        if not video_id or self.executable != "mpv":
+            return None
 
         with self._lock:
             self._ensure_process()
-            if self.executable == "mpv":
-                self.ipc.send(["loadfile", url, "append-play"])
+        return self.queue.append(video_id)
 
-    def remove_from_queue(self, url: str) -> bool:
-        """Remove a specific URL from the mpv playlist. Returns True if found."""
-        if self.executable != "mpv":
-            return False
+    def _on_queue_change(self, op, entry_id, video_id):
+        self._schedule_fill()
 
-        with self._lock:
-            playlist_resp = self.ipc.send(["get_property", "playlist"])
-            if not playlist_resp or "data" not in playlist_resp:
-                return False
-
-            playlist = playlist_resp["data"]
-            # Find the index of the item with the matching filename (URL)
-            for i, item in enumerate(playlist):
-                if item.get("filename") == url:
-                    self.ipc.send(["playlist-remove", i])
-                    return True
+    def _schedule_fill(self):
+        """Run _fill_window on the queue thread (never on the IPC reader)."""
+        with self._fill_lock:
+            if self._fill_pending:
+                return  # a burst of queue changes needs only one pass
+            self._fill_pending = True
+        try:
+            self._queue_executor.submit(self._fill_window)
+        except RuntimeError:
+            pass  # executor shut down while quitting
+
+    def _fill_window(self):
+        """Make mpv's upcoming entries match the head of the queue, in order.
+
+        Runs on the queue thread only, and without _lock: play(), status
+        reads and the UI never wait behind its IPC.
+        """
+        with self._fill_lock:
+            self._fill_pending = False
+        self._reconcile_window()
+        while True:
+            with self._queue_lock:
+                if len(self._window) >= self.prefetch_depth:
+                    break
+                last = self._window[-1][0] if self._window else None
+                gen = self._window_gen
+            nxt = self.queue.after(last) if last is not None else self.queue.first()
+            if nxt is None:
+                break
+            queue_id, video_id = nxt
+
+            stream_url = self._local_or_cached(video_id)
+            if not stream_url:
+                with self._queue_lock:
+                    future = self._resolving.get(video_id)
+                    if future is None:
+                        future = self._resolving[video_id] = self.resolver.submit(video_id)
+                if not future.done():
+                    # Come back once it resolves; order is preserved because
+                    # only the entry right after the window is ever appended.
+                    future.add_done_callback(lambda _f: self._schedule_fill())
+                    break
+                # A failed resolution falls back to mpv's ytdl_hook
+                with self._queue_lock:
+                    self._resolving.pop(video_id, None)
+                stream_url = future.result()
+
+            url = WATCH_URL.format(video_id)
+            with self._queue_lock:
+                current = self._window[-1][0] if self._window else None
+            if current != last or (self.queue.after(last) if last is not None else self.queue.first()) != nxt:
+                continue  # queue changed while resolving
+
+            mpv_url = stream_url or url
+            entry_id = None
+            future = self.backend.request(["loadfile", mpv_url, "append-play"])
+            try:
+                entry_id = (future.result(timeout=1.0).get("data") or {}).get("playlist_entry_id")
+            except Exception as e:
+                future.cancel()
+                self.logger.warning(f"Failed to append {url} to mpv: {e}")
+            with self._queue_lock:
+                raced = self._window_gen != gen
+                if not raced:
+                    self._window.append((queue_id, url, mpv_url, entry_id))
+            if raced:
+                # A play() replaced mpv's playlist meanwhile; if our entry
+                # outlived the replace it must not play before the new head
+                self._drop_entry(entry_id, mpv_url)
+
+        self._prefetch()
+
+    def _reconcile_window(self):
+        """Remove window entries that no longer lead the queue from mpv's playlist.
+
+        Only the entries from the first mismatch on are dropped; _fill_window
+        then appends whatever now leads the queue.
+        """
+        with self._queue_lock:
+            expected = [queue_id for queue_id, _video_id in self.queue.head(len(self._window))]
+            keep = 0
+            while keep < len(expected) and self._window[keep][0] == expected[keep]:
+                keep += 1
+            stale = [self._window.pop() for _ in range(len(self._window) - keep)]
+            gen = self._window_gen
+        # Last first, so the indices of the earlier entries stay valid
+        for offset, (_queue_id, url, mpv_url, _entry_id) in zip(range(keep + len(stale) - 1, -1, -1), stale):
+            if self._window_gen != gen:
+                return  # a replace already wiped them
+            if not self._remove_from_mpv(offset, mpv_url):
+                self.logger.warning(f"Could not remove {url} from mpv's playlist")
+
+    def _drop_entry(self, entry_id, mpv_url):
+        """Remove one appended entry, found by playlist entry id (else by URL)."""
+        playlist_resp = self.backend.send(["get_property", "playlist"])
+        if not playlist_resp or "data" not in playlist_resp:
+            return
+        for i, item in enumerate(playlist_resp["data"] or []):
+            if item.get("current"):
+                continue
+            if (item.get("id") == entry_id) if entry_id is not None else (item.get("filename") == mpv_url):
+                self.backend.send(["playlist-remove", i])
+                return
+
+    def _remove_from_mpv(self, offset, mpv_url) -> bool:
+        """Remove the window entry ``offset`` places after the current track."""
+        with self._state_lock:
+            pos = self._props.get("playlist-pos")
+        if pos is not None and pos >= 0:
+            # Check the one entry instead of fetching the whole playlist
+            index = pos + 1 + offset
+            reply = self.backend.send(["get_property", f"playlist/{index}/filename"])
+            if reply and reply.get("data") == mpv_url:
+                return bool(self.backend.send(["playlist-remove", index]))
+
+        playlist_resp = self.backend.send(["get_property", "playlist"])
+        if not playlist_resp or "data" not in playlist_resp:
+            return False
+        for i, item in enumerate(playlist_resp["data"] or []):
+            if item.get("filename") == mpv_url and not item.get("current"):
+                return bool(self.backend.send(["playlist-remove", i]))
         return False
 
+    def _prefetch(self):
+        """Start resolving the tracks that will enter the window next."""
+        with self._queue_lock:
+            window = len(self._window)
+        for _queue_id, video_id in self.queue.head(self.prefetch_depth)[window:]:
+            if not self._local_or_cached(video_id):
+                self.resolver.submit(video_id)
+
+    def _on_entry_started(self, entry_id):
+        """Drop window entries mpv has moved past from the window and the queue.
+
+        Returns the started watch URL.
+        """
+        with self._queue_lock:
+            started = []
+            for i, (_queue_id, _url, _mpv_url, queued_id) in enumerate(self._window):
+                if queued_id is not None and queued_id == entry_id:
+                    started = [self._window.popleft() for _ in range(i + 1)]
+                    break
+            if not started and entry_id is None and self._window and self._window[0][3] is None:
+                # Older mpv without entry ids: assume it advanced by one
+                started = [self._window.popleft()]
+            # Still under _queue_lock, so a fill never sees the window and
+            # the queue disagree about the entries that just left both
+            for queue_id, *_rest in started:
+                self.queue.remove(queue_id)
+        if started:
+            _queue_id, url, mpv_url, _entry_id = started[-1]
+            self.current_url = url
+            self._current_video_id = video_id_from_url(url)
+            self._current_stream = mpv_url
+            return url
+        return self.current_url
+
+    def remove_from_queue(self, url: str) -> bool:
+        """Remove the last queued occurrence of a URL. Returns True if found."""
+        video_id = video_id_from_url(url)
+        return bool(video_id) and self.queue.remove_video(video_id)
 
     def pause(self):
         """Toggle pause using process signals."""
@@ -272,65 +540,64 @@ class Player:
             self._ensure_process()
             if self.executable == "mpv":
                 # 'cycle pause' is atomic and faster
-                self.ipc.send(["cycle", "pause"])
+                self.backend.send(["cycle", "pause"])
             else:
                 self.pause()
 
     def stop(self):
-        """Stop playback and kill process."""
+        """Stop playback, kill process and shut the worker pools down (on quit)."""
+        self._closing = True
+        # Outside _lock: a restart in progress may be waiting for it
+        if self.supervisor is not None:
+            self.supervisor.stop()
         with self._lock:
-            if self.process:
-                try:
-                    self.process.terminate()
-                    self.process.wait(timeout=1)
-                except subprocess.TimeoutExpired:
-                    self.process.kill()
-                except Exception:
-                    pass
-                self.process = None
-                self._paused = False
-            
-            if os.path.exists(self.ipc_path):
-                try:
-                    os.remove(self.ipc_path)
-                except:
-                    pass
-            
+            if self.backend is not None:
+                self.backend.stop()
+            with self._state_lock:
+                self._props.clear()
+            self._paused = False
+        # Queued work is dropped; only a running extraction is waited for at exit
+        self._queue_executor.shutdown(wait=False, cancel_futures=True)
+        self.resolver.shutdown()
+
     def set_volume(self, volume: int):
         """Set volume (0-100)."""
         if not (0 <= volume <= 100):
             return
 
         if self.executable == "mpv":
-            self.ipc.send(["set_property", "volume", volume])
+            self.backend.send(["set_property", "volume", volume])
         else:
             self.logger.warning(f"Volume control not supported for {self.executable}")
 
     def get_volume(self) -> int:
         """Get current volume (0-100)."""
         if self.executable == "mpv":
-            resp = self.ipc.send(["get_property", "volume"])
-            if resp and "data" in resp:
-                return int(resp["data"])
+            with self._state_lock:
+                volume = self._props.get("volume")
+            if volume is not None:
+                return int(volume)
         return 100
             
     def get_status(self) -> dict:
-        """Get current playback status."""
+        """Get current playback status from the cached snapshot (no IPC)."""
+        if self.executable == "mpv":
+            with self._state_lock:
+                props = dict(self._props)
+            paused = bool(props.get("pause"))
+            if props.get("idle-active", True):
+                state = "Stopped"
+            else:
+                state = "Paused" if paused else "Playing"
+            return {
+                "paused": paused,
+                "progress": props.get("percent-pos") or 0,
+                "time_pos": props.get("time-pos") or 0,
+                "duration": props.get("duration") or 0,
+                "state": state
+            }
+
         with self._lock:
-            if self.executable == "mpv":
-                paused = self.ipc.send(["get_property", "pause"])
-                percent = self.ipc.send(["get_property", "percent-pos"])
-                time_pos = self.ipc.send(["get_property", "time-pos"])
-                duration = self.ipc.send(["get_property", "duration"])
-                
-                return {
-                    "paused": paused.get("data", False) if paused else False,
-                    "progress": percent.get("data", 0) if percent else 0,
-                    "time_pos": time_pos.get("data", 0) if time_pos else 0,
-                    "duration": duration.get("data", 0) if duration else 0,
-                    "state": "Playing" if not (paused and paused.get("data")) else "Paused"
-                }
-            
             is_running = self.process and self.process.poll() is None
             if not is_running:
                 state = "Stopped"
@@ -349,16 +616,24 @@ class Player:
         """Seek forward or backward by seconds."""
         if self.executable == "mpv":
             # seconds can be positive (forward) or negative (backward)
-            self.ipc.send(["seek", seconds, "relative"])
+            self.backend.send(["seek", seconds, "relative"])
         else:
             self.logger.warning(f"Seeking not supported for {self.executable}")
 
     def skip_next(self):
         """Skip to the next song in the playlist."""
         if self.executable == "mpv":
-            self.ipc.send(["playlist-next"])
+            with self._queue_lock:
+                in_mpv = bool(self._window)
+            head = None if in_mpv else self.queue.first()
+            next_url = WATCH_URL.format(head[1]) if head else None
+            if in_mpv:
+                self.backend.send(["playlist-next"])
+            elif next_url:
+                # Next track is still resolving; play it directly
+                self.play(next_url)
 
     def skip_prev(self):
         """Skip to the previous song in the playlist."""
         if self.executable == "mpv":
-            self.ipc.send(["playlist-prev"])
+            self.backend.send(["playlist-prev"])
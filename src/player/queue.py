@@ -0,0 +1,247 @@
+import itertools
+import random
+import threading
+
+INSERT = "insert"
+REMOVE = "remove"
+MOVE = "move"
+RESET = "reset"
+
+_HEAD = 0  # sentinel of the circular list; real entry ids start at 1
+
+
+class PlayQueue:
+    """Tracks waiting to be played, in order: the one place the order lives.
+
+    A circular doubly linked list over entry ids plus a videoId -> entry
+    ids index, so appending, queueing next, removing and moving an entry
+    are O(1) whatever the length of the queue. The same song may be
+    queued more than once; each occurrence is its own entry.
+
+    Every change is reported to ``listener(op, entry_id, video_id)`` with
+    ``op`` one of INSERT, REMOVE, MOVE or RESET (shuffle/replace; ids are
+    None). Listeners run on the thread that made the change, after the
+    queue's lock is released, and must return quickly.
+    """
+
+    def __init__(self):
+        self._next = {_HEAD: _HEAD}
+        self._prev = {_HEAD: _HEAD}
+        self._video: dict[int, str] = {}  # entry_id -> video_id
+        self._by_video: dict[str, dict] = {}  # video_id -> {entry_id: None}, oldest first
+        self._ids = itertools.count(1)
+        self._lock = threading.RLock()
+        self._listeners = []
+
+    def add_listener(self, listener):
+        self._listeners.append(listener)
+
+    def _emit(self, op, entry_id=None, video_id=None):
+        for listener in self._listeners:
+            listener(op, entry_id, video_id)
+
+    # --- links (caller holds _lock) -----------------------------------------
+    def _link(self, entry_id, before):
+        prev = self._prev[before]
+        self._next[prev] = entry_id
+        self._prev[entry_id] = prev
+        self._next[entry_id] = before
+        self._prev[before] = entry_id
+
+    def _unlink(self, entry_id):
+        prev, nxt = self._prev.pop(entry_id), self._next.pop(entry_id)
+        self._next[prev] = nxt
+        self._prev[nxt] = prev
+
+    def _insert(self, video_id, before):
+        if before is not None and before not in self._video:
+            raise KeyError(before)
+        entry_id = next(self._ids)
+        self._link(entry_id, _HEAD if before is None else before)
+        self._video[entry_id] = video_id
+        self._by_video.setdefault(video_id, {})[entry_id] = None
+        return entry_id
+
+    def _remove(self, entry_id):
+        video_id = self._video.pop(entry_id, None)
+        if video_id is not None:
+            self._unlink(entry_id)
+            entries = self._by_video[video_id]
+            del entries[entry_id]
+            if not entries:
+                del self._by_video[video_id]
+        return video_id
+
+    def _move(self, entry_id, before) -> bool:
+        if entry_id not in self._video or entry_id == before:
+            return False
+        if before is not None and before not in self._video:
+            raise KeyError(before)
+        self._unlink(entry_id)
+        self._link(entry_id, _HEAD if before is None else before)
+        return True
+
+    # --- changes ------------------------------------------------------------
+    def insert(self, video_id: str, before=None) -> int:
+        """Queue ``video_id`` before entry ``before`` (default: at the end)."""
+        with self._lock:
+            entry_id = self._insert(video_id, before)
+        self._emit(INSERT, entry_id, video_id)
+        return entry_id
+
+    def append(self, video_id: str) -> int:
+        return self.insert(video_id)
+
+    def push_front(self, video_id: str) -> int:
+        """Queue ``video_id`` to play next."""
+        with self._lock:
+            first = self._next[_HEAD]
+            entry_id = self._insert(video_id, None if first == _HEAD else first)
+        self._emit(INSERT, entry_id, video_id)
+        return entry_id
+
+    def remove(self, entry_id):
+        """Drop an entry; returns its videoId, or None if it was not queued."""
+        with self._lock:
+            video_id = self._remove(entry_id)
+        if video_id is not None:
+            self._emit(REMOVE, entry_id, video_id)
+        return video_id
+
+    def remove_video(self, video_id: str, every=False) -> bool:
+        """Drop the most recently queued entry of ``video_id`` (or all of them)."""
+        with self._lock:
+            entries = list(self._by_video.get(video_id, ()))
+            removed = entries if every else entries[-1:]
+            for entry_id in removed:
+                self._remove(entry_id)
+        for entry_id in removed:
+            self._emit(REMOVE, entry_id, video_id)
+        return bool(removed)
+
+    def pop_next(self):
+        """Remove and return the first ``(entry_id, video_id)``, or None."""
+        with self._lock:
+            entry_id = self._next[_HEAD]
+            if entry_id == _HEAD:
+                return None
+            video_id = self._remove(entry_id)
+        self._emit(REMOVE, entry_id, video_id)
+        return entry_id, video_id
+
+    def move(self, entry_id, before=None) -> bool:
+        """Move an entry before entry ``before`` (default: to the end)."""
+        with self._lock:
+            moved = self._move(entry_id, before)
+            video_id = self._video.get(entry_id)
+        if moved:
+            self._emit(MOVE, entry_id, video_id)
+        return moved
+
+    def move_up(self, entry_id) -> bool:
+        with self._lock:
+            prev = self._prev.get(entry_id, _HEAD)
+            moved = prev != _HEAD and self._move(entry_id, prev)
+            video_id = self._video.get(entry_id)
+        if moved:
+            self._emit(MOVE, entry_id, video_id)
+        return moved
+
+    def move_down(self, entry_id) -> bool:
+        with self._lock:
+            nxt = self._next.get(entry_id, _HEAD)
+            moved = False
+            if nxt != _HEAD:
+                after = self._next[nxt]
+                moved = self._move(entry_id, None if after == _HEAD else after)
+            video_id = self._video.get(entry_id)
+        if moved:
+            self._emit(MOVE, entry_id, video_id)
+        return moved
+
+    def shuffle(self):
+        with self._lock:
+            order = [entry_id for entry_id, _video_id in self.entries()]
+            random.shuffle(order)
+            self._relink(order)
+        self._emit(RESET)
+
+    def replace(self, video_ids):
+        """Make the queue exactly ``video_ids`` (new entries)."""
+        with self._lock:
+            self._reset([(next(self._ids), video_id) for video_id in video_ids])
+        self._emit(RESET)
+
+    def load(self, entries):
+        """Make the queue exactly these ``(entry_id, video_id)`` pairs.
+
+        Unlike replace() the entry ids are kept, e.g. those of a saved
+        session; new entries get ids above all of them.
+        """
+        with self._lock:
+            entries = [(int(entry_id), video_id) for entry_id, video_id in entries if int(entry_id) > _HEAD]
+            self._reset(entries)
+            floor = max(next(self._ids), max(self._video, default=0) + 1)
+            self._ids = itertools.count(floor)
+        self._emit(RESET)
+
+    def _reset(self, entries):
+        self._video.clear()
+        self._by_video.clear()
+        order = []
+        for entry_id, video_id in entries:
+            if entry_id in self._video:
+                continue
+            self._video[entry_id] = video_id
+            self._by_video.setdefault(video_id, {})[entry_id] = None
+            order.append(entry_id)
+        self._relink(order)
+
+    def clear(self):
+        self.replace(())
+
+    def _relink(self, order):
+        chain = [_HEAD, *order, _HEAD]
+        self._next = {a: b for a, b in zip(chain, chain[1:])}
+        self._prev = {b: a for a, b in zip(chain, chain[1:])}
+
+    # --- reads --------------------------------------------------------------
+    def __len__(self):
+        return len(self._video)
+
+    def __contains__(self, video_id):
+        return video_id in self._by_video
+
+    def first(self):
+        with self._lock:
+            entry_id = self._next[_HEAD]
+            return None if entry_id == _HEAD else (entry_id, self._video[entry_id])
+
+    def last(self):
+        with self._lock:
+            entry_id = self._prev[_HEAD]
+            return None if entry_id == _HEAD else (entry_id, self._video[entry_id])
+
+    def after(self, entry_id):
+        """The entry following ``entry_id``, or None at the end or if it is gone."""
+        with self._lock:
+            nxt = self._next.get(entry_id, _HEAD)
+            return None if nxt == _HEAD else (nxt, self._video[nxt])
+
+    def head(self, count: int) -> list:
+        """The first ``count`` ``(entry_id, video_id)`` pairs."""
+        with self._lock:
+            result = []
+            entry_id = self._next[_HEAD]
+            while entry_id != _HEAD and len(result) < count:
+                result.append((entry_id, self._video[entry_id]))
+                entry_id = self._next[entry_id]
+            return result
+
+    def entries(self) -> list:
+        """All ``(entry_id, video_id)`` pairs in play order."""
+        with self._lock:
+            return self.head(len(self._video))
+
+    def video_ids(self) -> list:
+        return [video_id for _entry_id, video_id in self.entries()]
@@ -0,0 +1,204 @@
+import json
+import logging
+import sqlite3
+import threading
+import time
+
+from src.config import get_data_dir
+from src.player.cache import video_id_from_url
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS queue (
+    entry_id INTEGER PRIMARY KEY,
+    video_id TEXT NOT NULL,
+    next_id INTEGER NOT NULL,
+    data TEXT
+);
+CREATE TABLE IF NOT EXISTS state (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+) WITHOUT ROWID;
+"""
+
+_END = 0  # next_id of the last queue entry
+
+
+class SessionStore:
+    """Checkpoints of the playback session in ``<data dir>/session.db``.
+
+    The queue is stored the way PlayQueue holds it, one row per entry
+    linking to the next one, so queueing, removing or moving a track
+    rewrites at most three rows; track, position, volume and pause are
+    single rows of ``state``. A writer thread compares the player's
+    snapshot() with what is on disk and writes only the rows that differ,
+    a moment after each queue change and every ``interval`` seconds for
+    the position. Each queue row carries the track's metadata from
+    ``describe(video_id)`` so a restored queue can be listed offline.
+    """
+
+    DEBOUNCE = 0.5  # seconds to let a burst of queue changes settle
+
+    def __init__(self, player, describe=None, interval=5.0, path=None):
+        self.player = player
+        self.describe = describe  # video_id -> track dict, or None
+        self.interval = interval
+        self.path = path or get_data_dir() / "session.db"
+        self._links: dict[int, tuple] = {}  # entry_id -> (video_id, next_id), as on disk
+        self._state: dict[str, str] = {}    # key -> JSON value, as on disk
+        self._described = None  # videoId whose metadata is in state["track"]
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._closed = False
+        self._thread = None
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+
+    def load(self):
+        """Last checkpointed session as a Player.restore() state, or None.
+
+        The state also carries ``tracks``: metadata dicts of the current
+        track and the queued ones, where known.
+        """
+        with self._lock:
+            try:
+                rows = self._conn.execute("SELECT entry_id, video_id, next_id, data FROM queue").fetchall()
+                state_rows = self._conn.execute("SELECT key, value FROM state").fetchall()
+            except sqlite3.Error as e:
+                logger.warning(f"Could not read the saved session: {e}")
+                return None
+            self._links = {entry_id: (video_id, next_id) for entry_id, video_id, next_id, _data in rows}
+            self._state = dict(state_rows)
+
+        state = {}
+        for key, value in self._state.items():
+            try:
+                state[key] = json.loads(value)
+            except ValueError:
+                pass
+        tracks = [json.loads(data) for *_row, data in rows if data]
+        if isinstance(state.get("track"), dict):
+            tracks.append(state.pop("track"))
+        state["tracks"] = tracks
+        state["queue"] = self._order()
+        if not state.get("url") and not state["queue"]:
+            return None
+        return state
+
+    def _order(self) -> list:
+        """The queue as (entry_id, video_id) pairs, walking the links from the head."""
+        pointed = {next_id for _video_id, next_id in self._links.values()}
+        heads = [entry_id for entry_id in self._links if entry_id not in pointed]
+        order, seen = [], set()
+        entry_id = heads[0] if len(heads) == 1 else _END
+        while entry_id != _END and entry_id in self._links and entry_id not in seen:
+            seen.add(entry_id)
+            video_id, next_id = self._links[entry_id]
+            order.append((entry_id, video_id))
+            entry_id = next_id
+        if len(order) != len(self._links):
+            # Broken chain (should not happen with one transaction per
+            # checkpoint): keep every entry, in the order they were queued
+            logger.warning("Saved queue links are inconsistent; restoring in queue order")
+            order = [(entry_id, self._links[entry_id][0]) for entry_id in sorted(self._links)]
+        return order
+
+    def start(self):
+        """Start checkpointing; call after the saved session was restored."""
+        if self._thread is None:
+            self.player.queue.add_listener(self._on_queue_change)
+            self._thread = threading.Thread(target=self._run, name="session-writer", daemon=True)
+            self._thread.start()
+
+    def _on_queue_change(self, op, entry_id, video_id):
+        self._wake.set()
+
+    def _run(self):
+        while not self._closed:
+            if self._wake.wait(self.interval):
+                self._wake.clear()
+                # Coalesce a burst (e.g. a playlist being queued) into one write
+                time.sleep(self.DEBOUNCE)
+            if self._closed:
+                return
+            try:
+                self.checkpoint()
+            except Exception as e:
+                logger.warning(f"Session checkpoint failed: {e}")
+
+    def checkpoint(self):
+        """Write whatever changed since the last checkpoint, in one transaction."""
+        snapshot = self.player.snapshot()
+        entries = snapshot["queue"]
+        links = {}
+        for i, (entry_id, video_id) in enumerate(entries):
+            links[entry_id] = (video_id, entries[i + 1][0] if i + 1 < len(entries) else _END)
+
+        url = snapshot.get("url")
+        state = {
+            "url": url,
+            # Whole seconds: the position alone should not cause a write per tick
+            "position": int(snapshot.get("position") or 0),
+            "volume": snapshot.get("volume"),
+            "paused": snapshot.get("paused"),
+        }
+        current = video_id_from_url(url) if url else None
+        if current != self._described:
+            state["track"] = self._describe(current) if current else None
+            self._described = current
+        state = {key: json.dumps(value) for key, value in state.items()}
+
+        with self._lock:
+            if self._conn is None:
+                return
+            removed = [(entry_id,) for entry_id in self._links if entry_id not in links]
+            added, relinked = [], []
+            for entry_id, (video_id, next_id) in links.items():
+                saved = self._links.get(entry_id)
+                if saved is None or saved[0] != video_id:
+                    added.append((entry_id, video_id, next_id, self._describe_json(video_id)))
+                elif saved[1] != next_id:
+                    relinked.append((next_id, entry_id))
+            changed = [(key, value) for key, value in state.items() if self._state.get(key) != value]
+            if not (removed or added or relinked or changed):
+                return
+            try:
+                with self._conn:
+                    self._conn.executemany("DELETE FROM queue WHERE entry_id = ?", removed)
+                    self._conn.executemany("INSERT OR REPLACE INTO queue VALUES (?, ?, ?, ?)", added)
+                    self._conn.executemany("UPDATE queue SET next_id = ? WHERE entry_id = ?", relinked)
+                    self._conn.executemany("INSERT OR REPLACE INTO state VALUES (?, ?)", changed)
+            except sqlite3.Error as e:
+                logger.warning(f"Could not save the session: {e}")
+                return
+            self._links = links
+            self._state.update(changed)
+
+    def _describe(self, video_id):
+        if self.describe is None:
+            return None
+        try:
+            return self.describe(video_id)
+        except Exception:
+            return None
+
+    def _describe_json(self, video_id):
+        track = self._describe(video_id)
+        return json.dumps(track, separators=(",", ":")) if track else None
+
+    def close(self):
+        """Take a final checkpoint and stop; call before the player stops."""
+        self._closed = True
+        self._wake.set()
+        if self._thread is not None:  # else the saved session was never restored
+            try:
+                self.checkpoint()
+            except Exception as e:
+                logger.warning(f"Final session checkpoint failed: {e}")
+        with self._lock:
+            self._conn.close()
+            self._conn = None
@@ -0,0 +1,101 @@
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class MpvSupervisor:
+    """Watches the playback backend and brings mpv back after a crash.
+
+    Every ``interval`` seconds the backend is checked for life, and every
+    ``ping_every`` checks a property read is round-tripped as well, so a
+    hung mpv is caught too (after two unanswered pings). A dead or hung
+    mpv is restarted and the player's last known state (track, position,
+    volume, pause, queue) is restored. More than ``max_restarts`` restarts
+    within ``window`` seconds is treated as a crash loop: restarting stops
+    until the window has passed.
+    """
+
+    def __init__(self, player, interval=1.0, ping_every=5, max_restarts=5, window=60.0):
+        self.player = player
+        self.interval = interval
+        self.ping_every = ping_every
+        self.max_restarts = max_restarts
+        self.window = window
+        self.stats = {"restarts": 0, "last_restart": None, "last_reason": None}
+        self._recent = []  # monotonic times of recent restarts
+        self._gave_up = False
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="mpv-supervisor", daemon=True)
+            self._thread.start()
+
+    @property
+    def stopping(self) -> bool:
+        return self._stop.is_set()
+
+    def stop(self, timeout=5.0):
+        """Stop watching and wait for a restart in progress to finish."""
+        self._stop.set()
+        thread, self._thread = self._thread, None
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout)
+            if thread.is_alive():
+                logger.warning("mpv supervisor did not stop in time")
+
+    def _run(self):
+        ticks = 0
+        missed_pings = 0
+        while not self._stop.wait(self.interval):
+            backend = self.player.backend
+            reason = None
+            if not backend.alive:
+                reason = "mpv exited"
+            elif ticks % self.ping_every == 0:
+                missed_pings = 0 if self._ping(backend) else missed_pings + 1
+                if missed_pings >= 2:
+                    reason = "mpv not responding"
+            ticks += 1
+            if reason and not self._stop.is_set():
+                self._restart(reason)
+                missed_pings = 0
+
+    @staticmethod
+    def _ping(backend) -> bool:
+        # Any reply, even an error, means mpv is processing commands
+        future = backend.request(["get_property", "mpv-version"])
+        try:
+            future.result(timeout=2.0)
+            return True
+        except Exception:
+            future.cancel()
+            return False
+
+    def _restart(self, reason):
+        now = time.monotonic()
+        self._recent = [t for t in self._recent if now - t < self.window]
+        if len(self._recent) >= self.max_restarts:
+            if not self._gave_up:
+                logger.error(f"mpv restarted {self.max_restarts} times in {self.window:.0f}s; not restarting for now")
+                self._gave_up = True
+            return
+
+        self._gave_up = False
+        self._recent.append(now)
+        state = self.player.snapshot()
+        logger.warning(f"{reason}; restarting it (restart #{self.stats['restarts'] + 1})")
+        try:
+            self.player.backend.stop()
+            if self.stopping:
+                return  # quitting meanwhile; Player.restore() checks again under its lock
+            self.player.restore(state)
+        except Exception as e:
+            logger.error(f"Restarting mpv failed: {e}")
+        self.stats["restarts"] += 1
+        self.stats["last_restart"] = time.time()
+        self.stats["last_reason"] = reason
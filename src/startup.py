@@ -0,0 +1,62 @@
+import os
+import subprocess
+import sys
+import time
+
+# Taken as early as possible: main.py imports this module before anything else
+_PROCESS_START = time.perf_counter()
+
+# Budget from process start until the welcome screen is drawn
+STARTUP_TARGET_MS = 400
+
+# Libraries that must not be imported before the first frame
+HEAVY_MODULES = ("PIL", "httpx", "requests", "ytmusicapi", "yt_dlp")
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def process_start_time() -> float:
+    """perf_counter() value recorded when the process started up."""
+    return _PROCESS_START
+
+
+def import_report(module="src.tui.app"):
+    """Import ``module`` in a fresh interpreter with ``-X importtime``.
+
+    Returns a list of ``(cumulative_us, self_us, name)`` tuples.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, cwd=PROJECT_ROOT
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{result.stderr[-2000:]}")
+
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        try:
+            self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+            rows.append((int(cumulative_us), int(self_us), name.strip()))
+        except ValueError:
+            continue
+    return rows
+
+
+def print_import_report(top=15) -> int:
+    """Print the slowest startup imports; returns 1 if a heavy module leaked in."""
+    rows = import_report()
+    total_us = sum(self_us for _cum, self_us, _name in rows)
+    print(f"Startup imports: {len(rows)} modules, {total_us / 1000:.1f} ms total")
+    print(f"{'cumulative':>12} {'self':>10}  module")
+    for cumulative_us, self_us, name in sorted(rows, reverse=True)[:top]:
+        print(f"{cumulative_us / 1000:>10.1f}ms {self_us / 1000:>8.1f}ms  {name}")
+
+    imported = {name.split(".")[0] for _cum, _self, name in rows}
+    leaked = [m for m in HEAVY_MODULES if m in imported]
+    if leaked:
+        print(f"\nREGRESSION: imported at startup: {', '.join(leaked)}")
+        return 1
+    print(f"\nOK: none of {', '.join(HEAVY_MODULES)} imported at startup")
+    return 0
@@ -1,12 +1,30 @@
+import logging
+import threading
+import time
+
 from textual.app import App
-from src.api.auth import AuthManager
-from src.api.client import YTMusicClient
-from src.tui.screens.login import LoginScreen
-from src.tui.screens.player import PlayerScreen
-from src.tui.screens.account import AccountScreen
+from textual import work
+
+from src.startup import STARTUP_TARGET_MS, process_start_time
+
+logger = logging.getLogger(__name__)
+
+# Screens are built on first use so their modules (and the heavy libraries
+# they pull in) are not imported before the welcome screen is on display.
+def _login_screen():
+    from src.tui.screens.login import LoginScreen
+    return LoginScreen()
+
+def _player_screen():
+    from src.tui.screens.player import PlayerScreen
+    return PlayerScreen()
+
+def _account_screen():
+    from src.tui.screens.account import AccountScreen
+    return AccountScreen()
 
 class YTMusicApp(App):
-    
+
     BINDINGS = [
         ("q", "quit", "Quit"),
         ("d", "toggle_dark", "Toggle Dark Mode"),
@@ -14,23 +32,125 @@ class YTMusicApp(App):
         ("escape", "push_screen('account')", "Account"),
     ]
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # One lock per lazily built object, so building the player in the
+        # background never holds up the screen asking for the client
+        self._auth_lock = threading.Lock()
+        self._client_lock = threading.Lock()
+        self._player_lock = threading.Lock()
+        self._tracks_lock = threading.Lock()
+        self._auth = None
+        self._client = None
+        self._player = None
+        self._tracks = None
+        self._session = None
+
+    @property
+    def auth(self):
+        with self._auth_lock:
+            if self._auth is None:
+                from src.api.auth import AuthManager
+                self._auth = AuthManager()
+            return self._auth
+
+    @property
+    def client(self):
+        with self._client_lock:
+            if self._client is None:
+                from src.api.client import YTMusicClient
+                self._client = YTMusicClient(self.auth)
+            return self._client
+
+    @property
+    def player(self):
+        with self._player_lock:
+            if self._player is None:
+                from src.player.functionality import Player
+                self._player = Player()
+            return self._player
+
+    @property
+    def tracks(self):
+        """Compact metadata of the tracks shown in this session."""
+        with self._tracks_lock:
+            if self._tracks is None:
+                from src.api.tracks import TrackStore
+                from src.config import get_setting
+                self._tracks = TrackStore(max_items=get_setting("track_store_size"))
+            return self._tracks
+
     def on_mount(self) -> None:
-        self.auth = AuthManager()
-        self.client = YTMusicClient(self.auth)
-        
         # Define screens
-        self.install_screen(LoginScreen(), name="login")
-        self.install_screen(PlayerScreen(), name="player")
-        self.install_screen(AccountScreen(), name="account")
-        
+        self.install_screen(_login_screen, name="login")
+        self.install_screen(_player_screen, name="player")
+        self.install_screen(_account_screen, name="account")
+
         # Always start at Welcome Screen (Guest Mode)
         # Auth check removed to enforce Guest-Only flow
         self.push_screen("login")
 
-    def action_quit(self) -> None:
+    def on_ready(self) -> None:
+        """First frame is on screen: report startup time and warm the backend."""
+        elapsed_ms = (time.perf_counter() - process_start_time()) * 1000
+        if elapsed_ms > STARTUP_TARGET_MS:
+            logger.warning(f"Time to first frame {elapsed_ms:.0f} ms (target {STARTUP_TARGET_MS} ms)")
+        else:
+            logger.info(f"Time to first frame {elapsed_ms:.0f} ms")
+        self.warm_backend()
+
+    @work(thread=True, exclusive=True, group="startup")
+    def warm_backend(self):
+        """Import the API stack and spawn mpv while the user reads the welcome screen."""
+        try:
+            self.player.start()
+            self.resume_session()
+            self.client
+        except Exception as e:
+            logger.warning(f"Background warm-up failed: {e}")
+
+    @work(thread=True, exclusive=True, group="session")
+    def resume_session(self):
+        """Put last session's track (paused where it was), volume and queue back.
+
+        Only the current track and the first queued ones are resolved;
+        their metadata comes from the session file, not the API.
+        """
+        from src.config import get_setting
+        from src.player.session import SessionStore
+
+        try:
+            self._session = SessionStore(self.player, describe=self._describe_track)
+            state = self._session.load()
+            if state and get_setting("restore_session") and self.player.backend is not None:
+                self.tracks.put_many(state.pop("tracks"))
+                # Not over a track the user picked while this was loading
+                self.player.restore(dict(state, paused=True), if_idle=True)
+        except Exception as e:
+            logger.warning(f"Could not restore the last session: {e}")
+        if self._session is not None:
+            self._session.start()
+
+    def _describe_track(self, video_id):
+        track = self.tracks.get(video_id)
+        return track.as_dict() if track else None
+
+    async def action_quit(self) -> None:
         """Force clean exit."""
-        if hasattr(self, "screen") and hasattr(self.screen, "player"):
-            self.screen.player.stop()
+        if self._session is not None:
+            self._session.close()
+        if self._player is not None:
+            self._player.stop()
+            self._player.audio_cache.close()
+        for screen in self.screen_stack:
+            artwork = getattr(screen, "artwork", None)
+            if artwork is not None:
+                artwork.shutdown()
+        if self._client is not None:
+            self._client.flush_caches()
+            self._client.shutdown()
+            from src.api.http import close_async_client
+            await close_async_client()
         self.exit()
 
     def action_toggle_pause(self) -> None:
@@ -0,0 +1,292 @@
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from rich.style import Style
+from rich.text import Text
+
+from src.config import get_data_dir
+
+logger = logging.getLogger(__name__)
+
+HALF_BLOCK = "▀"
+
+
+def _render_half_blocks(data: bytes, cells_w: int, cells_h: int) -> list:
+    """Decode and downscale an image to half-block colour pairs (runs in a worker)."""
+    from PIL import Image
+    import io
+
+    with Image.open(io.BytesIO(data)) as image:
+        image.draft("RGB", (cells_w * 4, cells_h * 8))  # cheap JPEG downscale on decode
+        pixels = image.convert("RGB").resize((cells_w, cells_h * 2), Image.Resampling.BOX).load()
+
+    rows = []
+    for y in range(cells_h):
+        rows.append([
+            ["#%02x%02x%02x" % pixels[x, 2 * y], "#%02x%02x%02x" % pixels[x, 2 * y + 1]]
+            for x in range(cells_w)
+        ])
+    return rows
+
+
+def _to_text(rows: list) -> Text:
+    text = Text(no_wrap=True, overflow="crop")
+    for i, row in enumerate(rows):
+        if i:
+            text.append("\n")
+        for top, bottom in row:
+            text.append(HALF_BLOCK, Style(color=top, bgcolor=bottom))
+    return text
+
+
+class ArtworkCache:
+    """Thumbnail pipeline: download, content-addressed disk cache, render.
+
+    Raw images are stored under ``<data dir>/art`` named by the SHA-256 of
+    their bytes, with ``index.json`` mapping URL -> digest. Next to each
+    image the half-block rendering for a given cell size is cached as JSON,
+    so a thumbnail seen before never hits the network or Pillow again.
+    Decoding and scaling run in a small thread pool, off the event loop.
+    Files are written to a temporary name and renamed into place, and
+    beyond ``max_bytes`` on disk the least recently used images (with
+    their renderings) are deleted.
+    """
+
+    def __init__(self, cells_w: int, cells_h: int = 1, max_downloads: int = 4, memory_items: int = 1000,
+                 max_bytes: int = 64 * 1024 * 1024):
+        self.cells_w = cells_w
+        self.cells_h = cells_h
+        self.art_dir = get_data_dir() / "art"
+        self.art_dir.mkdir(parents=True, exist_ok=True)
+        self._index_path = self.art_dir / "index.json"
+        self._index = self._load_index()
+        self._index_dirty = False
+        self._memory = OrderedDict()  # url -> Text
+        self._memory_items = memory_items
+        self._inflight: dict[str, asyncio.Future] = {}
+        self._waiters: dict[str, int] = {}
+        self._downloads = asyncio.Semaphore(max_downloads)
+        self._pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="artwork")
+        self._lock = threading.Lock()
+        self.max_bytes = max_bytes
+        self._usage = None  # digest -> bytes on disk, least recently used first; scanned on first write
+        self._disk_bytes = 0
+
+    def _load_index(self) -> dict:
+        try:
+            with open(self._index_path, "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def save_index(self):
+        with self._lock:
+            if not self._index_dirty:
+                return
+            tmp_path = f"{self._index_path}.tmp"
+            try:
+                with open(tmp_path, "w") as f:
+                    json.dump(self._index, f)
+                os.replace(tmp_path, self._index_path)
+                self._index_dirty = False
+            except OSError as e:
+                logger.warning(f"Could not save artwork index: {e}")
+
+    def get_cached(self, url: str):
+        """Rendered art if it is already in memory (no I/O)."""
+        text = self._memory.get(url)
+        if text is not None:
+            self._memory.move_to_end(url)
+        return text
+
+    async def load(self, url: str):
+        """Return the rendered Text for ``url`` (memory -> disk -> network)."""
+        text = self.get_cached(url)
+        if text is not None:
+            return text
+        future = self._inflight.get(url)
+        if future is None:
+            future = asyncio.ensure_future(self._load(url))
+            self._inflight[url] = future
+            self._waiters[url] = 0
+            future.add_done_callback(lambda _f: self._forget(url))
+        self._waiters[url] += 1
+        try:
+            return await asyncio.shield(future)
+        except asyncio.CancelledError:
+            # Row scrolled away: drop the download unless someone else wants it
+            if self._waiters.get(url) == 1:
+                future.cancel()
+            raise
+        finally:
+            if url in self._waiters:
+                self._waiters[url] -= 1
+
+    def _forget(self, url: str):
+        self._inflight.pop(url, None)
+        self._waiters.pop(url, None)
+
+    async def _load(self, url: str):
+        loop = asyncio.get_running_loop()
+        rows = await loop.run_in_executor(self._pool, self._read_rendered, url)
+        if rows is None:
+            data = await self._download(url)
+            if data is None:
+                return None
+            rows = await loop.run_in_executor(self._pool, self._store_and_render, url, data)
+            if rows is None:
+                return None
+
+        text = _to_text(rows)
+        self._memory[url] = text
+        while len(self._memory) > self._memory_items:
+            self._memory.popitem(last=False)
+        return text
+
+    async def _download(self, url: str):
+        from src.api.http import get_async_client
+        async with self._downloads:
+            try:
+                resp = await get_async_client().get(url, timeout=5.0)
+            except Exception as e:
+                logger.debug(f"Art download failed for {url}: {e}")
+                return None
+        if resp.status_code != 200:
+            logger.debug(f"Art download failed: {resp.status_code} for {url}")
+            return None
+        return resp.content
+
+    def _render_path(self, digest: str):
+        return self.art_dir / f"{digest}.{self.cells_w}x{self.cells_h}.json"
+
+    def _read_rendered(self, url: str):
+        """Disk lookup (worker thread): pre-rendered cells, else render from raw image."""
+        with self._lock:
+            digest = self._index.get(url)
+        if not digest:
+            return None
+        try:
+            with open(self._render_path(digest), "r") as f:
+                rows = json.load(f)
+            self._touch(digest)
+            return rows
+        except (OSError, ValueError):
+            pass
+        try:
+            with open(self.art_dir / f"{digest}.img", "rb") as f:
+                data = f.read()
+        except OSError:
+            return None
+        self._touch(digest)
+        return self._render_and_save(digest, data)
+
+    def _store_and_render(self, url: str, data: bytes):
+        digest = hashlib.sha256(data).hexdigest()
+        image_path = self.art_dir / f"{digest}.img"
+        try:
+            if not image_path.exists():
+                self._write(image_path, data)
+                self._account(digest, len(data))
+        except OSError as e:
+            logger.warning(f"Could not cache artwork: {e}")
+        with self._lock:
+            self._index[url] = digest
+            self._index_dirty = True
+        return self._render_and_save(digest, data)
+
+    def _render_and_save(self, digest: str, data: bytes):
+        try:
+            rows = _render_half_blocks(data, self.cells_w, self.cells_h)
+        except Exception as e:
+            logger.debug(f"Could not decode artwork {digest}: {e}")
+            return None
+        try:
+            encoded = json.dumps(rows).encode()
+            self._write(self._render_path(digest), encoded)
+            self._account(digest, len(encoded))
+        except OSError:
+            pass
+        return rows
+
+    @staticmethod
+    def _write(path, data: bytes):
+        """Write ``data`` to ``path`` atomically: a cut-short write never leaves a truncated file."""
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+
+    # --- disk quota (worker threads) --------------------------------------
+    def _scan(self) -> OrderedDict:
+        """Bytes on disk per digest, least recently used first."""
+        usage, used = {}, {}
+        try:
+            entries = list(os.scandir(self.art_dir))
+        except OSError:
+            entries = []
+        for entry in entries:
+            digest, dot, _rest = entry.name.partition(".")
+            if not dot or entry.name == self._index_path.name or entry.name.endswith(".tmp"):
+                continue
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            usage[digest] = usage.get(digest, 0) + stat.st_size
+            used[digest] = max(used.get(digest, 0), stat.st_mtime)
+        return OrderedDict((digest, usage[digest]) for digest in sorted(usage, key=used.get))
+
+    def _touch(self, digest: str):
+        """Mark ``digest`` as just used (its image's mtime keeps that across runs)."""
+        with self._lock:
+            if self._usage is not None and digest in self._usage:
+                self._usage.move_to_end(digest)
+        try:
+            os.utime(self.art_dir / f"{digest}.img")
+        except OSError:
+            pass
+
+    def _account(self, digest: str, size: int):
+        """Count a file just written for ``digest`` and evict beyond max_bytes."""
+        with self._lock:
+            if self._usage is None:
+                # The scan already counts the file just written
+                self._usage = self._scan()
+                self._disk_bytes = sum(self._usage.values())
+            else:
+                self._usage[digest] = self._usage.get(digest, 0) + size
+                self._usage.move_to_end(digest)
+                self._disk_bytes += size
+            evicted = []
+            while self._disk_bytes > self.max_bytes and len(self._usage) > 1:
+                old, old_size = self._usage.popitem(last=False)
+                self._disk_bytes -= old_size
+                evicted.append(old)
+            if evicted:
+                gone = set(evicted)
+                for url in [url for url, d in self._index.items() if d in gone]:
+                    del self._index[url]
+                self._index_dirty = True
+        for old in evicted:
+            for path in self.art_dir.glob(f"{old}.*"):
+                try:
+                    path.unlink()
+                except OSError:
+                    pass
+
+    def shutdown(self):
+        self.save_index()
+        self._pool.shutdown(wait=False, cancel_futures=True)
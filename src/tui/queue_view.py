@@ -0,0 +1,230 @@
+from collections import deque
+
+from rich.text import Text
+from textual.binding import Binding
+from textual.geometry import Size
+from textual.message import Message
+from textual.reactive import reactive
+from textual.scroll_view import ScrollView
+from textual.strip import Strip
+
+from src.player.queue import INSERT, MOVE, REMOVE, RESET
+
+
+class QueueView(ScrollView, can_focus=True):
+    """Virtualized view of the play queue.
+
+    The queue engine owns the order; this view keeps a flat copy of its
+    entries and only draws the visible lines. The queue's listener hands
+    each change to ``note_change()`` and ``apply_changes()`` then patches
+    the copy entry by entry; only a shuffle or replace (or changes that do
+    not fit the copy) take a whole new copy with ``refresh_queue()``. The
+    cursor follows its entry when entries above it come and go. Entries
+    are reordered with shift+up/down and dropped with delete, straight on
+    the queue. ``queue`` may be attached after mounting; until then the
+    view is empty.
+    """
+
+    BINDINGS = [
+        Binding("up", "cursor_up", "Up", show=False),
+        Binding("down", "cursor_down", "Down", show=False),
+        Binding("pageup", "page_up", "Page Up", show=False),
+        Binding("pagedown", "page_down", "Page Down", show=False),
+        Binding("home", "first", "First", show=False),
+        Binding("end", "last", "Last", show=False),
+        Binding("enter", "select", "Play", show=False),
+        Binding("shift+up", "move_up", "Move Up", show=False),
+        Binding("shift+down", "move_down", "Move Down", show=False),
+        Binding("delete", "remove", "Remove", show=False),
+    ]
+
+    COMPONENT_CLASSES = {"queue-view--cursor"}
+
+    DEFAULT_CSS = """
+    QueueView {
+        height: 1fr;
+    }
+    QueueView > .queue-view--cursor {
+        background: $accent 40%;
+    }
+    QueueView:focus > .queue-view--cursor {
+        background: $accent;
+        color: $text;
+    }
+    """
+
+    cursor_row = reactive(0, always_update=True)
+
+    class Selected(Message):
+        def __init__(self, view: "QueueView", entry_id: int, video_id: str) -> None:
+            self.view = view
+            self.entry_id = entry_id
+            self.video_id = video_id
+            super().__init__()
+
+        @property
+        def control(self) -> "QueueView":
+            return self.view
+
+    def __init__(self, queue, title_for=str, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.queue = queue
+        self.title_for = title_for  # video_id -> text of its row
+        self.entries: list[tuple] = []  # (entry_id, video_id) in play order
+        self._ids: set = set()  # entry ids in entries
+        self._changes = deque()  # (op, entry, next entry) not applied yet
+
+    @property
+    def selected_entry(self):
+        if 0 <= self.cursor_row < len(self.entries):
+            return self.entries[self.cursor_row]
+        return None
+
+    def refresh_queue(self):
+        """Take the queue's current order and redraw."""
+        self._changes.clear()
+        selected = self.selected_entry
+        self.entries = self.queue.entries() if self.queue is not None else []
+        self._ids = {entry_id for entry_id, _video_id in self.entries}
+        row = self.cursor_row
+        if selected is not None and selected[0] in self._ids:
+            row = self.entries.index(selected)
+        # else the entry under the cursor left the queue: stay on that row
+        self._redraw(row)
+
+    def note_change(self, op, entry_id, video_id):
+        """Record a queue change; called by the queue's listener, on any thread."""
+        after = self.queue.after(entry_id) if op in (INSERT, MOVE) else None
+        self._changes.append((op, (entry_id, video_id), after))
+
+    def apply_changes(self):
+        """Patch the copy with the recorded changes and redraw."""
+        row = self.cursor_row
+        selected = self.selected_entry
+        while self._changes:
+            op, entry, after = self._changes.popleft()
+            if op == RESET:
+                self.refresh_queue()
+                return
+            if op in (REMOVE, MOVE) and entry[0] in self._ids:
+                removed = self._row_of(entry)
+                del self.entries[removed]
+                self._ids.discard(entry[0])
+                if removed < row:
+                    row -= 1
+            if op in (INSERT, MOVE) and entry[0] not in self._ids:
+                if after is None:
+                    inserted = len(self.entries)
+                elif after[0] in self._ids:
+                    inserted = self._row_of(after)
+                else:
+                    # Changes from two threads arrived out of order
+                    self.refresh_queue()
+                    return
+                self.entries.insert(inserted, entry)
+                self._ids.add(entry[0])
+                if inserted <= row and entry != selected:
+                    row += 1
+                elif entry == selected:
+                    row = inserted  # the cursor follows a moved entry
+        if self.queue is not None and len(self.entries) != len(self.queue):
+            self.refresh_queue()
+            return
+        self._redraw(row)
+
+    def _row_of(self, entry) -> int:
+        # Started tracks leave from the top and new ones join at the end
+        if self.entries[0] == entry:
+            return 0
+        if self.entries[-1] == entry:
+            return len(self.entries) - 1
+        return self.entries.index(entry)
+
+    def _redraw(self, row):
+        self.virtual_size = Size(self.scrollable_content_region.width, len(self.entries))
+        self.cursor_row = row
+        self.refresh()
+
+    # --- rendering ------------------------------------------------------
+    def render_line(self, y: int) -> Strip:
+        scroll_x, scroll_y = self.scroll_offset
+        width = self.scrollable_content_region.width
+        base_style = self.rich_style
+
+        row = int(scroll_y) + y
+        if row >= len(self.entries):
+            return Strip.blank(width, base_style)
+
+        style = base_style
+        if row == self.cursor_row:
+            style += self.get_component_rich_style("queue-view--cursor")
+        text = Text(f"{row + 1}. {self.title_for(self.entries[row][1])}", no_wrap=True, overflow="ellipsis", style=style)
+        text.truncate(width, overflow="ellipsis", pad=True)
+        return Strip(list(text.render(self.app.console, end=""))).crop_extend(0, width, style)
+
+    def _refresh_row(self, row: int):
+        y = row - int(self.scroll_offset.y)
+        if 0 <= y < self.scrollable_content_region.height:
+            self.refresh_line(y)
+
+    # --- cursor ---------------------------------------------------------
+    def validate_cursor_row(self, row: int) -> int:
+        return max(0, min(row, len(self.entries) - 1)) if self.entries else 0
+
+    def watch_cursor_row(self, old_row: int, new_row: int) -> None:
+        self._refresh_row(old_row)
+        self._refresh_row(new_row)
+        top = int(self.scroll_offset.y)
+        height = self.scrollable_content_region.height
+        if new_row < top:
+            self.scroll_to(y=new_row, animate=False)
+        elif height and new_row >= top + height:
+            self.scroll_to(y=new_row - height + 1, animate=False)
+
+    def action_cursor_up(self):
+        self.cursor_row -= 1
+
+    def action_cursor_down(self):
+        self.cursor_row += 1
+
+    def action_page_up(self):
+        self.cursor_row -= max(self.scrollable_content_region.height, 1)
+
+    def action_page_down(self):
+        self.cursor_row += max(self.scrollable_content_region.height, 1)
+
+    def action_first(self):
+        self.cursor_row = 0
+
+    def action_last(self):
+        self.cursor_row = len(self.entries) - 1
+
+    def action_select(self):
+        entry = self.selected_entry
+        if entry is not None:
+            self.post_message(self.Selected(self, *entry))
+
+    # --- editing (the queue's listener brings the change back here) -----
+    def action_move_up(self):
+        entry = self.selected_entry
+        if entry is not None:
+            self.queue.move_up(entry[0])
+
+    def action_move_down(self):
+        entry = self.selected_entry
+        if entry is not None:
+            self.queue.move_down(entry[0])
+
+    def action_remove(self):
+        entry = self.selected_entry
+        if entry is not None:
+            self.queue.remove(entry[0])
+
+    def on_click(self, event) -> None:
+        row = int(self.scroll_offset.y) + event.y
+        if row >= len(self.entries):
+            return
+        if row == self.cursor_row:
+            self.action_select()
+        else:
+            self.cursor_row = row
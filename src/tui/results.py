@@ -0,0 +1,290 @@
+from rich.style import Style
+from rich.text import Text
+from textual.binding import Binding
+from textual.geometry import Size
+from textual.message import Message
+from textual.reactive import reactive
+from textual.scroll_view import ScrollView
+from textual.strip import Strip
+
+from src.api.tracks import Track
+
+
+ART_CELLS = 5  # width of the Art column; thumbnails are rendered to exactly this
+ART_PLACEHOLDER = " 🖼️ "
+
+
+class TrackColumns:
+    """Columnar store of the rows shown in the results view.
+
+    One list per column plus a videoId -> row index, so appends and dedup
+    are O(1) no matter how many rows are loaded. Artist name tuples are
+    shared with the Track they came from and only joined when a row is
+    drawn.
+    """
+
+    __slots__ = ("ids", "titles", "artists", "albums", "durations", "thumbnails", "_index")
+
+    def __init__(self):
+        self.ids: list[str] = []
+        self.titles: list[str] = []
+        self.artists: list[tuple] = []
+        self.albums: list = []
+        self.durations: list = []
+        self.thumbnails: list = []
+        self._index: dict[str, int] = {}
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __contains__(self, video_id):
+        return video_id in self._index
+
+    def index_of(self, video_id):
+        return self._index.get(video_id)
+
+    def append(self, track: Track) -> bool:
+        """Add a row; returns False if the track is already present."""
+        if track.video_id in self._index:
+            return False
+        self._index[track.video_id] = len(self.ids)
+        self.ids.append(track.video_id)
+        self.titles.append(track.title)
+        self.artists.append(track.artists)
+        self.albums.append(track.album)
+        self.durations.append(track.duration)
+        self.thumbnails.append(track.thumbnail)
+        return True
+
+    def track(self, row: int) -> Track:
+        return Track(
+            self.ids[row], self.titles[row], self.artists[row],
+            self.albums[row], self.durations[row], self.thumbnails[row],
+        )
+
+    def clear(self):
+        self.ids.clear()
+        self.titles.clear()
+        self.artists.clear()
+        self.albums.clear()
+        self.durations.clear()
+        self.thumbnails.clear()
+        self._index.clear()
+
+
+class ResultsView(ScrollView, can_focus=True):
+    """Virtualized track list: only the rows on screen are ever rendered.
+
+    Replaces a DataTable for result lists that can grow to tens of
+    thousands of rows. Rows live in a TrackColumns store and each visible
+    line is drawn on demand through the Line API.
+    """
+
+    BINDINGS = [
+        Binding("up", "cursor_up", "Up", show=False),
+        Binding("down", "cursor_down", "Down", show=False),
+        Binding("pageup", "page_up", "Page Up", show=False),
+        Binding("pagedown", "page_down", "Page Down", show=False),
+        Binding("home", "first", "First", show=False),
+        Binding("end", "last", "Last", show=False),
+        Binding("enter", "select", "Select", show=False),
+    ]
+
+    COMPONENT_CLASSES = {
+        "results-view--header",
+        "results-view--cursor",
+        "results-view--even-row",
+    }
+
+    DEFAULT_CSS = """
+    ResultsView {
+        height: 1fr;
+    }
+    ResultsView > .results-view--header {
+        text-style: bold;
+    }
+    ResultsView > .results-view--cursor {
+        background: $accent 40%;
+    }
+    ResultsView:focus > .results-view--cursor {
+        background: $accent;
+        color: $text;
+    }
+    ResultsView > .results-view--even-row {
+        background: $surface-lighten-1 30%;
+    }
+    """
+
+    # (header, width) of each column; widths exclude the 1-cell padding per side
+    COLUMNS = (("Art", ART_CELLS), ("Title", 40), ("Artist", 30))
+
+    cursor_row = reactive(0, always_update=True)
+
+    class RowHighlighted(Message):
+        def __init__(self, view: "ResultsView", cursor_row: int, video_id: str) -> None:
+            self.view = view
+            self.cursor_row = cursor_row
+            self.video_id = video_id
+            super().__init__()
+
+        @property
+        def control(self) -> "ResultsView":
+            return self.view
+
+    class RowSelected(RowHighlighted):
+        pass
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.store = TrackColumns()
+        self.art: dict[str, Text] = {}
+        self._row_width = sum(width + 2 for _name, width in self.COLUMNS)
+
+    # --- data -----------------------------------------------------------
+    @property
+    def row_count(self) -> int:
+        return len(self.store)
+
+    @property
+    def selected_id(self):
+        """videoId under the cursor, or None for an empty view."""
+        if 0 <= self.cursor_row < len(self.store):
+            return self.store.ids[self.cursor_row]
+        return None
+
+    def add_tracks(self, tracks, append=False) -> int:
+        """Load Tracks; returns how many new rows were added."""
+        if not append:
+            self.clear()
+        added = 0
+        for track in tracks:
+            if self.store.append(track):
+                added += 1
+        self._update_virtual_size()
+        if not append and added:
+            self.cursor_row = 0
+        return added
+
+    def clear(self):
+        self.store.clear()
+        self.art.clear()
+        self.cursor_row = 0
+        self.scroll_to(0, 0, animate=False)
+        self._update_virtual_size()
+
+    def track(self, video_id):
+        """Track for a row of the view (rebuilt from the columns), or None."""
+        row = self.store.index_of(video_id)
+        return self.store.track(row) if row is not None else None
+
+    def set_art(self, video_id: str, art: Text):
+        self.art[video_id] = art
+        row = self.store.index_of(video_id)
+        if row is not None:
+            self._refresh_row(row)
+
+    def visible_ids(self) -> list:
+        first = int(self.scroll_offset.y)
+        return self.store.ids[first:first + self._body_height()]
+
+    def _update_virtual_size(self):
+        # one extra line for the header
+        self.virtual_size = Size(self._row_width, len(self.store) + 1)
+        self.refresh()
+
+    def _body_height(self) -> int:
+        return max(self.scrollable_content_region.height - 1, 0)
+
+    def _refresh_row(self, row: int):
+        y = row - int(self.scroll_offset.y) + 1
+        if 1 <= y <= self._body_height():
+            self.refresh_line(y)
+
+    # --- rendering ------------------------------------------------------
+    def _cells(self, values, style: Style) -> Strip:
+        text = Text(no_wrap=True, overflow="ellipsis", style=style)
+        for value, (_name, width) in zip(values, self.COLUMNS):
+            cell = value.copy() if isinstance(value, Text) else Text(str(value))
+            cell.truncate(width, overflow="ellipsis", pad=True)
+            text.append(" ")
+            text.append(cell)
+            text.append(" ")
+        return Strip(list(text.render(self.app.console, end="")))
+
+    def render_line(self, y: int) -> Strip:
+        scroll_x, scroll_y = self.scroll_offset
+        width = self.scrollable_content_region.width
+        base_style = self.rich_style
+
+        if y == 0:
+            style = base_style + self.get_component_rich_style("results-view--header")
+            strip = self._cells([name for name, _width in self.COLUMNS], style)
+            return strip.crop_extend(scroll_x, scroll_x + width, style)
+
+        row = int(scroll_y) + y - 1
+        if row >= len(self.store):
+            return Strip.blank(width, base_style)
+
+        style = base_style
+        if row % 2:
+            style += self.get_component_rich_style("results-view--even-row")
+        if row == self.cursor_row:
+            style += self.get_component_rich_style("results-view--cursor")
+
+        video_id = self.store.ids[row]
+        values = (
+            self.art.get(video_id, ART_PLACEHOLDER),
+            self.store.titles[row],
+            ", ".join(self.store.artists[row]) or "Unknown",
+        )
+        return self._cells(values, style).crop_extend(scroll_x, scroll_x + width, style)
+
+    # --- cursor ---------------------------------------------------------
+    def validate_cursor_row(self, row: int) -> int:
+        return max(0, min(row, len(self.store) - 1)) if len(self.store) else 0
+
+    def watch_cursor_row(self, old_row: int, new_row: int) -> None:
+        self._refresh_row(old_row)
+        self._refresh_row(new_row)
+        self._scroll_cursor_into_view()
+        if len(self.store):
+            self.post_message(self.RowHighlighted(self, new_row, self.store.ids[new_row]))
+
+    def _scroll_cursor_into_view(self):
+        top = int(self.scroll_offset.y)
+        height = self._body_height()
+        if self.cursor_row < top:
+            self.scroll_to(y=self.cursor_row, animate=False)
+        elif height and self.cursor_row >= top + height:
+            self.scroll_to(y=self.cursor_row - height + 1, animate=False)
+
+    def action_cursor_up(self):
+        self.cursor_row -= 1
+
+    def action_cursor_down(self):
+        self.cursor_row += 1
+
+    def action_page_up(self):
+        self.cursor_row -= max(self._body_height(), 1)
+
+    def action_page_down(self):
+        self.cursor_row += max(self._body_height(), 1)
+
+    def action_first(self):
+        self.cursor_row = 0
+
+    def action_last(self):
+        self.cursor_row = len(self.store) - 1
+
+    def action_select(self):
+        if len(self.store):
+            self.post_message(self.RowSelected(self, self.cursor_row, self.store.ids[self.cursor_row]))
+
+    def on_click(self, event) -> None:
+        row = int(self.scroll_offset.y) + event.y - 1
+        if event.y < 1 or row >= len(self.store):
+            return
+        if row == self.cursor_row:
+            self.action_select()
+        else:
+            self.cursor_row = row
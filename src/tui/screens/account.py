@@ -6,7 +6,6 @@ import logging
 
 logger = logging.getLogger(__name__)
 
-class AccountScreen(Screen):
 class AccountScreen(Screen):
     CSS = """
     AccountScreen {
@@ -40,6 +39,11 @@ class AccountScreen(Screen):
         background: $surface-lighten-1;
     }
 
+    #api-info {
+        height: auto;
+        min-height: 5;
+    }
+
     Button {
         width: 100%;
         margin-top: 1;
@@ -60,8 +64,50 @@ class AccountScreen(Screen):
             v.border_title = " APP INFO "
             yield Label("YOUTUBE MUSIC CLI", id="title")
             yield Static("Guest Mode Active\nNo account connected.", classes="info-box")
+            yield Static("", id="memory-info", classes="info-box")
+            yield Static("", id="api-info", classes="info-box")
+            yield Static("", id="player-info", classes="info-box")
             yield Button("RETURN TO PLAYER", id="btn-back")
 
+    def on_screen_resume(self) -> None:
+        """Refresh the memory and API readouts each time the screen is shown."""
+        self.show_api_stats()
+        self.show_player_stats()
+        tracks = self.app._tracks
+        if tracks is None:
+            self.query_one("#memory-info").update("Track metadata: not loaded yet")
+            return
+        usage = tracks.memory_usage()
+        self.query_one("#memory-info").update(
+            f"Track metadata: {usage['tracks']} / {tracks.max_items} tracks, "
+            f"{usage['bytes'] / 1024:.0f} KiB\n"
+            f"Pinned: {usage['pinned']}  Evicted: {usage['evictions']}"
+        )
+
+    def show_api_stats(self) -> None:
+        client = self.app._client
+        endpoints = client.api_stats()["endpoints"] if client is not None else {}
+        if not endpoints:
+            self.query_one("#api-info").update("API: no requests yet")
+            return
+        lines = [
+            f"{name}: {s['calls']} calls, {s['errors']} errors, "
+            f"{s['latency_ms']:.0f} ms" + ("" if s["state"] == "closed" else f" [{s['state']}]")
+            for name, s in sorted(endpoints.items())
+        ]
+        self.query_one("#api-info").update("\n".join(lines))
+
+    def show_player_stats(self) -> None:
+        player = self.app._player
+        if player is None or player.backend is None:
+            self.query_one("#player-info").update("Playback: not started")
+            return
+        stats = player.supervisor.stats
+        text = f"Playback: {player.backend.name}\nmpv restarts: {stats['restarts']}"
+        if stats["last_reason"]:
+            text += f" (last: {stats['last_reason']})"
+        self.query_one("#player-info").update(text)
+
     def on_button_pressed(self, event: Button.Pressed) -> None:
         if event.button.id == "btn-back":
             self.app.pop_screen()
@@ -1,20 +1,18 @@
 import asyncio
-import threading
-import base64
-import io
-import httpx
 import logging
-import os
-import json
-from PIL import Image
-from rich.text import Text
 from textual import work
+from textual.message import Message
 from textual.screen import Screen
 from textual.widgets import Input, DataTable, Button, Label, Static, ProgressBar
-from textual.containers import Container, Horizontal, Vertical
-from src.player.functionality import Player
+from textual.containers import Horizontal, Vertical
+from src.api.favorites import FavoritesStore
+from src.api.search import SearchScheduler
+from src.config import get_setting
+from src.player.cache import video_id_from_url
+from src.tui.artwork import ArtworkCache
+from src.tui.queue_view import QueueView
+from src.tui.results import ART_CELLS, ResultsView
 from src.tui.utils import copy_to_clipboard
-from src.config import get_data_dir
 
 logger = logging.getLogger(__name__)
 
@@ -30,11 +28,23 @@ class PlayerScreen(Screen):
         ("alt+right", "skip_next", "Next Song"),
         ("alt+enter", "add_to_queue", "Add Queue"),
         ("alt+backspace", "remove_from_queue", "Rem Queue"),
+        ("alt+r", "shuffle_queue", "Shuffle"),
         ("alt+s", "focus_search", "Search"),
         ("alt+c", "copy_url", "Copy URL"),
         ("alt+f", "toggle_liked", "Add to Playlist"),
+        ("alt+h", "load_home", "Home"),
     ]
 
+    class PlaybackEvent(Message):
+        """Playback event forwarded from the player's IPC thread."""
+        def __init__(self, event: str, data: dict) -> None:
+            self.event = event
+            self.data = data
+            super().__init__()
+
+    class QueueChanged(Message):
+        """The play queue changed (posted once per burst of changes)."""
+
     CSS = """
     $accent: #FF3333;
     $secondary: #9D00FF;
@@ -145,7 +155,7 @@ class PlayerScreen(Screen):
         border: tall $accent;
     }
     /* DataTable header styling */
-    DataTable > .datatable--header {
+    DataTable > .datatable--header, ResultsView > .results-view--header {
         background: $accent 10%;
         color: $accent;
         text-style: bold;
@@ -161,13 +171,13 @@ class PlayerScreen(Screen):
                 Label("PLAYLISTS", classes="sidebar-title"),
                 DataTable(id="playlist-list"),
                 Label("QUEUE", classes="sidebar-title hidden", id="queue-title"),
-                DataTable(id="queue-list", classes="hidden"),
+                QueueView(None, self.queue_title, id="queue-list", classes="hidden"),
                 Label("[Alt] VOL: 100%", id="volume-display", classes="volume-label"),
                 id="sidebar"
             ),
             Vertical(
                 Input(placeholder="Search songs...", id="search-input"),
-                DataTable(id="results-table"),
+                ResultsView(id="results-table"),
                 id="main-content"
             )
         )
@@ -185,28 +195,36 @@ class PlayerScreen(Screen):
             yield Static("Shortcuts: [Space] Play/Pause | [Alt+←/→] Seek | [Alt+↑/↓] Vol | [Alt+Enter] Queue | [Alt+F] Fav/Like", classes="controls-hint")
 
     def on_mount(self):
-        self.player = Player()
-        self.results_data = {}
-        self.queued_songs = []
+        # Created (and mpv spawned) in the background by the app at launch;
+        # attached by attach_player() once ready, without blocking the loop
+        self.player = None
+        self.queue = None
+        self._player_ready = asyncio.Event()
+        self._queue_dirty = False
         self.session_liked_songs = set()
-        self.favorites_file = str(get_data_dir() / "favorites.json")
-        self.local_favorites = self.load_favorites()
+        # Only the favorite ids are read here; metadata loads on display
+        self.local_favorites = FavoritesStore()
+        # Compact, bounded metadata of displayed tracks; favorites and
+        # queued tracks are never evicted
+        self.tracks = self.app.tracks
+        self.tracks.keep = lambda video_id: video_id in self.local_favorites or (
+            self.queue is not None and video_id in self.queue
+        )
+        self.app.client.ratings.on_result = self.on_rating_result
         self.current_track_id = None
         self._current_volume = 100
         self._cached_playlists = []
+        self.showing_home = False
+        self._view_generation = 0  # bumped whenever the results view is replaced
         self.search_timer = None  # Timer for search debounce
+        self.search_scheduler = SearchScheduler(self.app.client)
         self.current_search_query = ""
         self.current_results_limit = 20
         self.is_loading_more = False
+        self.search_exhausted = False
+        self.artwork = ArtworkCache(cells_w=ART_CELLS, max_bytes=get_setting("artwork_cache_mb") * 1024 * 1024)
+        self._art_window = None
         
-        # Results table setup
-        res_table = self.query_one("#results-table")
-        res_table.add_column("Art", width=5)
-        res_table.add_column("Title", width=40)
-        res_table.add_column("Artist", width=30)
-        res_table.cursor_type = "row"
-        res_table.zebra_stripes = True
-
         # Playlist table setup
         p_table = self.query_one("#playlist-list")
         p_table.add_column("Playlist")
@@ -215,32 +233,58 @@ class PlayerScreen(Screen):
         p_table.add_row("🔄 Refresh Lists", key="refresh")
         p_table.cursor_type = "row"
 
-        # Queue table setup
-        q_table = self.query_one("#queue-list")
-        q_table.add_column("Song Title")
-        q_table.cursor_type = "row"
-        
         self.query_one("#search-input").focus()
-        
-        # Start progress timer
-        self.set_interval(1.0, self.update_progress)
+        self.attach_player()
+
+        # Refresh progress from the player's cached state (no IPC involved)
+        self.set_interval(0.5, self.update_progress)
+        # Artwork follows the scroll position; only visible rows are loaded
+        self.set_interval(0.3, self.refresh_visible_art)
+
+        # Last session's home feed and playlists, before any network round trip
+        self.show_feed_snapshot()
+        self.set_interval(get_setting("feed_cache_ttl"), self.refresh_feeds)
+
+    @work(exclusive=True, group="player-attach")
+    async def attach_player(self):
+        """Wait (off the UI loop) for the app's player, then hook the screen up to it."""
+        player = await asyncio.to_thread(lambda: self.app.player)
+        self.player = player
+        # post_message is thread-safe, so mpv events reach the UI loop directly
+        player.add_listener(lambda event, data: self.post_message(self.PlaybackEvent(event, data)))
+        # The player's queue engine is the only record of what is queued
+        self.queue = player.queue
+        queue_list = self.query_one("#queue-list")
+        queue_list.queue = self.queue
+        self.queue.add_listener(queue_list.note_change)
+        self.queue.add_listener(self.on_queue_change)
+        queue_list.refresh_queue()
+        # Favorites are kept for offline playback, and evicted last
+        player.audio_cache.keep = self.local_favorites.__contains__
+        player.audio_cache.want_many(self.local_favorites.video_ids())
+        # The volume may come from the restored session
+        self._current_volume = player.get_volume()
+        self.query_one("#volume-display").update(f"[Alt] VOL: {self._current_volume}%")
+        # A restored session may already be loaded
+        if player.current_url:
+            self.show_now_playing(video_id_from_url(player.current_url))
+        self.post_message(self.QueueChanged())
+        self._player_ready.set()
+
+    async def ready_player(self):
+        """The player, once attach_player() has it."""
+        await self._player_ready.wait()
+        return self.player
 
     def update_progress(self):
-        """Update progress bar and time display, and handle queue transitions."""
+        """Update progress bar and time display from the playback snapshot."""
+        if self.player is None:
+            return
         try:
             status = self.player.get_status()
             if status:
                 time_pos = status.get("time_pos", 0)
                 duration = status.get("duration", 0)
-                state = status.get("state", "Stopped")
-                
-                # Check for end of song to play next in queue
-                # if duration > 0 and time_pos >= duration - 0.5: # 0.5s buffer
-                #     self.play_next_in_queue()
-                
-                # mpv state logic for auto-advance
-                if state == "Stopped" and self.queued_songs:
-                     self.play_next_in_queue()
 
                 # Format time (MM:SS)
                 def format_time(seconds):
@@ -255,29 +299,45 @@ class PlayerScreen(Screen):
         except Exception as e:
             logger.error(f"Progress update error: {e}")
 
+    def on_player_screen_playback_event(self, message: PlaybackEvent) -> None:
+        """Mirror mpv's playlist progress in the now-playing UI."""
+        if message.event == "start-file":
+            # mpv moved on to a queued entry by itself (EOF or skip); the
+            # player already took it off the queue
+            video_id = video_id_from_url(message.data.get("url") or "")
+            if video_id and video_id != self.current_track_id and self.show_now_playing(video_id):
+                self.notify(f"Reproduciendo: {self.track_for(video_id).title}")
+        elif message.event == "end-file" and message.data.get("reason") == "eof":
+            # Nothing left in mpv's playlist (next track still resolving)
+            if not message.data.get("has_next"):
+                self.play_next_in_queue()
+
+    def on_queue_change(self, op, entry_id, video_id):
+        """Queue listener; may run on the player's threads."""
+        if not self._queue_dirty:
+            self._queue_dirty = True
+            self.post_message(self.QueueChanged())
+
+    def on_player_screen_queue_changed(self, message: QueueChanged) -> None:
+        self._queue_dirty = False
+        if self.queue is None:
+            return
+        self.query_one("#queue-list").apply_changes()
+        self.query_one("#queue-list").set_class(not self.queue, "hidden")
+        self.query_one("#queue-title").set_class(not self.queue, "hidden")
+
+    def queue_title(self, video_id):
+        track = self.tracks.get(video_id)
+        return track.title if track else video_id
+
     def play_next_in_queue(self):
-        """Play the next song in the queue and update UI."""
-        if not self.queued_songs:
+        """Play the next song in the queue (the player takes it off the queue)."""
+        head = self.queue.first() if self.queue is not None else None
+        if head is None:
             return
-            
-        next_song = self.queued_songs.pop(0)
-        self.update_queue_ui()
-        self.play_selected_song(next_song["videoId"])
-        self.notify(f"Reproduciendo: {next_song.get('title')}")
-
-    def update_queue_ui(self):
-        q_table = self.query_one("#queue-list")
-        q_title = self.query_one("#queue-title")
-        q_table.clear()
-        
-        if self.queued_songs:
-            for song in self.queued_songs:
-                q_table.add_row(song.get("title", "Unknown"), key=song.get("videoId"))
-            q_table.remove_class("hidden")
-            q_title.remove_class("hidden")
-        else:
-            q_table.add_class("hidden")
-            q_title.add_class("hidden")
+        video_id = head[1]
+        self.play_selected_song(video_id)
+        self.notify(f"Reproduciendo: {self.queue_title(video_id)}")
 
     def on_button_pressed(self, event: Button.Pressed) -> None:
         if event.button.id == "btn-play-pause":
@@ -287,19 +347,82 @@ class PlayerScreen(Screen):
         elif event.button.id == "btn-next":
             self.action_skip_next()
 
+    def action_load_home(self): self.load_home_content()
+
+    def show_feed_snapshot(self):
+        """Fill the sidebar and results from the on-disk feed snapshot (no network)."""
+        client = self.app.client
+        playlists = client.cached_library_playlists()
+        if playlists:
+            self.fill_playlist_table(playlists)
+        home = client.cached_home()
+        if home and self.query_one("#results-table").row_count == 0:
+            self.show_home(home)
+
+    def show_home(self, tracks):
+        self.populate_table(tracks)
+        self.showing_home = True
+
+    def add_home_tracks(self, tracks, generation=None):
+        """Show home tracks as they stream in (while the home view is current).
+
+        The first batch carries the view generation of the request and is
+        dropped if the user has moved on to other results since.
+        """
+        if generation is not None:
+            if generation == self._view_generation:
+                self.show_home(tracks)
+        elif self.showing_home and tracks:
+            self.populate_table(tracks, append=True)
+
+    def apply_refreshed_home(self, tracks):
+        """Swap in a refreshed home feed if the user is still looking at it."""
+        if self.showing_home and tracks:
+            self.show_home(tracks)
+
+    @work(thread=True, exclusive=True, group="feeds")
+    def refresh_feeds(self):
+        """Scheduled background refresh of the home feed and library playlists."""
+        client = self.app.client
+        try:
+            home = client.get_home(force=True)
+            self.app.call_from_thread(self.apply_refreshed_home, home)
+        except Exception as e:
+            logger.warning(f"Home refresh failed: {e}")
+        # Only refresh playlists the user has loaded before (needs an account)
+        if client.cached_library_playlists() is not None:
+            try:
+                playlists = client.get_library_playlists(force=True)
+                self.app.call_from_thread(self.fill_playlist_table, playlists)
+            except Exception as e:
+                logger.warning(f"Playlist refresh failed: {e}")
+
     @work(exclusive=True)
     async def load_home_content(self):
-        """Fetch and display recommended songs from the Home section."""
+        """Display recommended songs from the Home section (snapshot first)."""
+        self.cancel_playlist_load()
         self.notify("🏠 Loading recommendations from Home...")
+        streamed = []
+        generation = self._view_generation
+
+        def on_tracks(batch):
+            # Worker thread: first the feed's own tracks, then each expansion
+            first = None if streamed else generation
+            self.app.call_from_thread(self.add_home_tracks, batch, first)
+            streamed.append(len(batch))
+
         try:
-            tracks = await asyncio.to_thread(self.app.client.get_home)
+            self.current_search_query = ""
+            tracks = await asyncio.to_thread(
+                self.app.client.get_home,
+                on_refresh=lambda fresh: self.app.call_from_thread(self.apply_refreshed_home, fresh),
+                on_tracks=on_tracks,
+            )
             if tracks:
-                for t in tracks:
-                    if 'videoId' in t:
-                        self.results_data[t['videoId']] = t
-                self.populate_table(tracks)
+                if not streamed and generation == self._view_generation:
+                    self.show_home(tracks)  # served from the snapshot
             else:
-                self.notify("No direct tracks found on Home. Try searching instead.", severity="warning")
+                self.notify("No tracks found on Home. Try searching instead.", severity="warning")
         except Exception as e:
             self.notify(f"Error loading home: {e}", severity="error")
 
@@ -307,114 +430,173 @@ class PlayerScreen(Screen):
         if event.data_table.id == "playlist-list":
             playlist_id = event.row_key.value
             if playlist_id == "refresh":
-                self.load_playlists()
+                self.load_playlists(force=True)
             elif playlist_id == "local_favs":
                 self.load_local_favorites_content()
             else:
                 self.load_playlist_content(playlist_id)
-        elif event.data_table.id == "queue-list":
-            # Manual selection from queue should play it and remove it/reorder?
-            # For now, just play it.
-            self.play_selected_song(event.row_key.value)
-        elif event.data_table.id == "results-table":
-            self.play_selected_song(event.row_key.value)
+
+    def on_queue_view_selected(self, event: QueueView.Selected):
+        self.play_selected_song(event.video_id)
+
+    def on_results_view_row_selected(self, event: ResultsView.RowSelected):
+        self.play_selected_song(event.video_id)
 
     @work(exclusive=True)
-    async def load_playlists(self):
+    async def load_playlists(self, force=False):
         try:
-            playlists = await asyncio.to_thread(self.app.client.get_library_playlists)
-            p_table = self.query_one("#playlist-list")
-            p_table.clear()
-            p_table.add_row("❤️ Liked Music", key="liked")
-            p_table.add_row("🔄 Refresh Lists", key="refresh")
-            for p in playlists:
-                p_table.add_row(p.get("title", "Untitled"), key=p.get("playlistId"))
+            playlists = await asyncio.to_thread(
+                self.app.client.get_library_playlists,
+                on_refresh=lambda fresh: self.app.call_from_thread(self.fill_playlist_table, fresh),
+                force=force,
+            )
+            self.fill_playlist_table(playlists)
         except Exception as e:
             self.notify(f"Error: {e}", severity="error")
 
-    @work(exclusive=True)
+    def fill_playlist_table(self, playlists):
+        p_table = self.query_one("#playlist-list")
+        p_table.clear()
+        p_table.add_row("⭐ Local Favorites", key="local_favs")
+        p_table.add_row("❤️ Liked Music", key="liked")
+        p_table.add_row("🔄 Refresh Lists", key="refresh")
+        seen = set()
+        for p in playlists:
+            playlist_id = p.get("playlistId")
+            if playlist_id and playlist_id not in seen:
+                seen.add(playlist_id)
+                p_table.add_row(p.get("title", "Untitled"), key=playlist_id)
+
+    def cancel_playlist_load(self):
+        self.workers.cancel_group(self, "playlist-load")
+
+    # Own worker group: the playback workers are exclusive in the default
+    # group and would otherwise cancel the load on every play, pause or seek
+    @work(exclusive=True, group="playlist-load")
     async def load_playlist_content(self, playlist_id):
-        try:
-            if playlist_id == "liked":
-                songs = await asyncio.to_thread(self.app.client.get_liked_songs)
-                tracks = songs.get("tracks", []) if isinstance(songs, dict) else songs
-            else:
-                playlist_data = await asyncio.to_thread(self.app.client.get_playlist_songs, playlist_id)
-                tracks = playlist_data.get("tracks", [])
+        """Stream a playlist into the results view page by page.
 
-            for t in tracks:
-                if 'videoId' in t: self.results_data[t['videoId']] = t
-            self.populate_table(tracks)
+        The first page is shown as soon as it arrives and stays playable
+        and queueable while the remaining pages load in the background.
+        Selecting another playlist or searching cancels the load.
+        """
+        self.current_search_query = ""  # no search paging while browsing a playlist
+        try:
+            pager = await asyncio.to_thread(self.app.client.playlist_pager, playlist_id)
+            first = True
+            while not pager.exhausted:
+                tracks = await asyncio.to_thread(pager.next_page)
+                if first or tracks:
+                    self.populate_table(tracks, append=not first)
+                first = False
+            if pager.pages_fetched > 1:
+                self.notify(f"Loaded {pager.tracks_fetched} songs.", timeout=2.0)
         except Exception as e:
             self.notify(f"Error: {e}", severity="error")
 
     def populate_table(self, results, append=False):
-        table = self.query_one("#results-table")
+        # Keep compact Tracks, not the raw API dicts; the view dedups
+        # against its own index and only draws visible rows
+        tracks = self.tracks.put_many(results)
         if not append:
-            table.clear()
-        
-        # Get existing keys to avoid duplicates in the UI
-        existing_keys = {str(k.value) for k in table.rows.keys()}
-        
-        for song in results:
-            video_id = song.get("videoId")
-            if video_id and video_id not in existing_keys:
-                artists = song.get("artists", [])
-                artist_name = ", ".join([a["name"] for a in artists]) if isinstance(artists, list) else "Unknown"
-                table.add_row(" 🖼️ ", song.get("title", "Unknown"), artist_name, key=video_id)
+            self.showing_home = False
+            self._view_generation += 1
+        self.query_one("#results-table").add_tracks(tracks, append=append)
+        self._art_window = None
+
+    def track_for(self, video_id):
+        """Metadata for a track on screen, even if the store evicted it."""
+        track = self.tracks.get(video_id)
+        if track is None:
+            track = self.query_one("#results-table").track(video_id)
+            if track is not None:
+                self.tracks.add(track)
+        return track
 
     def play_selected_song(self, video_id):
-        song = self.results_data.get(video_id)
-        if not song: return
+        if not self.show_now_playing(video_id): return
+        self.play_worker(f"https://music.youtube.com/watch?v={video_id}")
+
+    def show_now_playing(self, video_id) -> bool:
+        """Update the now-playing labels. Returns False if the song is unknown."""
+        track = self.track_for(video_id)
+        if not track: return False
+        # The playing track stays in memory until something else plays
+        self.tracks.pin(video_id)
+        if self.current_track_id:
+            self.tracks.unpin(self.current_track_id)
         self.current_track_id = video_id
         # Metadata update
-        self.query_one("#current-title").update(song.get("title", "Unknown"))
-        artists = song.get("artists", [])
-        artist_name = ", ".join([a["name"] for a in artists]) if isinstance(artists, list) else "Unknown"
-        self.query_one("#current-artist").update(artist_name)
-        
-        self.play_worker(f"https://music.youtube.com/watch?v={video_id}")
+        self.query_one("#current-title").update(track.title)
+        self.query_one("#current-artist").update(track.artist_names)
+        return True
 
 
     @work(exclusive=True)
     async def play_worker(self, url: str):
-        try: await asyncio.to_thread(self.player.play, url)
+        player = await self.ready_player()
+        try: await asyncio.to_thread(player.play, url)
         except Exception as e: self.app.notify(f"Error: {e}", severity="error")
 
-    @work
-    async def download_art(self, url: str):
-        try:
-            async with httpx.AsyncClient() as client:
-                resp = await client.get(url, timeout=5.0)
-                if resp.status_code == 200:
-                    # self.query_one(AlbumArt).set_image(resp.content)
-                    pass
-                else:
-                    self.app.notify(f"Art download failed: {resp.status_code}", severity="warning")
-        except Exception as e:
-            self.app.notify(f"Art error: {e}", severity="error")
+    def refresh_visible_art(self):
+        """Start loading thumbnails for the rows currently on screen."""
+        table = self.query_one("#results-table")
+        if table.row_count == 0:
+            return
+        keys = tuple(table.visible_ids())
+        if keys == self._art_window:
+            return
+        self._art_window = keys
+        self.load_art_for_rows(keys)
+
+    @work(exclusive=True, group="artwork")
+    async def load_art_for_rows(self, video_ids):
+        """Fetch/render art for visible rows; superseded by the next scroll."""
+        table = self.query_one("#results-table")
+
+        async def load_one(video_id, url):
+            art = await self.artwork.load(url)
+            if art is not None and video_id in table.store:
+                table.set_art(video_id, art)
+
+        jobs = []
+        for video_id in video_ids:
+            if video_id in table.art:
+                continue
+            track = table.track(video_id)
+            url = track.thumbnail if track else None
+            if not url:
+                continue
+            art = self.artwork.get_cached(url)
+            if art is not None:
+                table.set_art(video_id, art)
+            else:
+                jobs.append(load_one(video_id, url))
+        if not jobs:
+            return
+        await asyncio.gather(*jobs, return_exceptions=True)
+        await asyncio.to_thread(self.artwork.save_index)
 
     @work(exclusive=True)
     async def toggle_worker(self):
+        player = await self.ready_player()
         try:
-            await asyncio.to_thread(self.player.toggle_pause)
+            await asyncio.to_thread(player.toggle_pause)
         except: pass
 
-    def on_data_table_row_highlighted(self, event: DataTable.RowHighlighted):
+    def on_results_view_row_highlighted(self, event: ResultsView.RowHighlighted):
         """Infinite scroll: load more results when reaching the bottom."""
-        if event.data_table.id == "results-table":
-            row_index = event.cursor_row
-            num_rows = event.data_table.row_count
-            
-            # If we are within 5 rows of the bottom, load more
-            # Added check for is_loading_more to prevent spam
-            if num_rows > 10 and row_index >= num_rows - 5 and not self.is_loading_more:
-                if self.current_search_query:
-                    # Debounce/Throttle: Ensure we don't fire multiple requests
-                    self.is_loading_more = True
-                    self.notify("Loading more results...", timeout=1.0)
-                    self.current_results_limit += 20
-                    self.run_search(self.current_search_query, append=True)
+        row_index = event.cursor_row
+        num_rows = event.view.row_count
+
+        # If we are within 5 rows of the bottom, load more
+        # Added check for is_loading_more to prevent spam
+        if num_rows > 10 and row_index >= num_rows - 5 and not self.is_loading_more:
+            if self.current_search_query and not self.search_exhausted:
+                # Debounce/Throttle: Ensure we don't fire multiple requests
+                self.is_loading_more = True
+                self.notify("Loading more results...", timeout=1.0)
+                self.load_more_results(self.current_search_query)
 
     def on_input_changed(self, event: Input.Changed):
         if event.input.id == "search-input":
@@ -428,34 +610,77 @@ class PlayerScreen(Screen):
             if self.search_timer:
                 self.search_timer.stop()
             
-            # Set new timer (Debounce 0.5s)
+            # Set new timer (debounce adapts to measured search latency)
             if len(event.value) > 2:
-                self.current_results_limit = 20 # Reset limit on new query
-                self.search_timer = self.set_timer(0.5, lambda: self.run_search(event.value))
+                self.search_timer = self.set_timer(
+                    self.search_scheduler.debounce_interval, lambda: self.run_search(event.value)
+                )
 
     @work(exclusive=True)
     async def run_search(self, query, append=False):
         self.current_search_query = query
+        self.search_exhausted = False
         # self.is_loading_more is set by the caller (scroll) or reset here for new search
         if not append:
+            # The results view is about to be replaced
+            self.cancel_playlist_load()
             self.is_loading_more = True 
-            
+
+        # Our own library answers instantly (and offline); remote results follow
+        local = [] if append else await asyncio.to_thread(self.app.client.search_local, query)
+        if local and query == self.current_search_query:
+            self.populate_table(local)
+
         try:
-            # We fetch limit+20 each time. inefficient but functional for public API.
-            results = await asyncio.to_thread(self.app.client.search_songs, query, limit=self.current_results_limit)
+            results = await self.search_scheduler.search(
+                query, self.current_results_limit,
+                on_refresh=lambda fresh: self.on_search_refreshed(query, fresh),
+            )
+            if results is None:
+                return  # superseded by a newer query
             if results:
-                for s in results:
-                    if 'videoId' in s: self.results_data[s['videoId']] = s
                 # If appending, we only want to add NEW items, populate_table handles dedup
-                self.populate_table(results, append=append)
-            elif not append:
+                self.populate_table(results, append=append or bool(local))
+            elif not append and not local:
                 self.query_one("#results-table").clear()
                 self.notify("No results found.", severity="warning")
+        except Exception as e:
+            if local:
+                self.notify(f"Search offline, showing library matches ({e})", severity="warning")
+            else:
+                self.notify(f"Search error: {e}", severity="error")
+        finally:
+            self.is_loading_more = False
+
+    @work(exclusive=True, group="load-more")
+    async def load_more_results(self, query):
+        """Append the next page of results (one request per page)."""
+        try:
+            shown = set(self.query_one("#results-table").store.ids)
+            results = await asyncio.to_thread(self.app.client.search_more, query, shown)
+            if query != self.current_search_query:
+                return
+            if results:
+                self.populate_table(results, append=True)
+            else:
+                self.search_exhausted = True
         except Exception as e:
             self.notify(f"Search error: {e}", severity="error")
         finally:
             self.is_loading_more = False
 
+    def on_search_refreshed(self, query, results):
+        """Revalidated results arrived (on the client's refresh thread)."""
+        if results:
+            local = self.app.client.search_local(query)
+            self.app.call_from_thread(self.apply_refreshed_search, query, local + results)
+
+    def apply_refreshed_search(self, query, results):
+        """Swap in revalidated results if the user is still looking at them."""
+        if query != self.current_search_query or not results:
+            return
+        self.populate_table(results)
+
     def on_key(self, event):
         if event.key == "down" and self.focused and self.focused.id == "search-input":
             self.query_one("#results-table").focus()
@@ -472,139 +697,132 @@ class PlayerScreen(Screen):
 
     @work(exclusive=True)
     async def volume_worker(self, volume: int):
-        try: await asyncio.to_thread(self.player.set_volume, volume)
+        player = await self.ready_player()
+        try: await asyncio.to_thread(player.set_volume, volume)
         except: pass
 
     def action_seek_backward(self): self.seek_worker(-10)
     def action_seek_forward(self): self.seek_worker(10)
     @work(exclusive=True)
     async def seek_worker(self, seconds: int):
-        try: await asyncio.to_thread(self.player.seek, seconds)
+        player = await self.ready_player()
+        try: await asyncio.to_thread(player.seek, seconds)
         except: pass
 
     def action_skip_next(self):
-        self.player.skip_next()
+        self.skip_next_worker()
         self.notify("Next song")
 
+    @work(exclusive=True)
+    async def skip_next_worker(self):
+        # May have to resolve the next track if it isn't in mpv yet
+        player = await self.ready_player()
+        try: await asyncio.to_thread(player.skip_next)
+        except Exception as e: self.app.notify(f"Error: {e}", severity="error")
+
     def action_skip_prev(self):
+        if self.player is None:
+            return
         self.player.skip_prev()
         self.notify("Previous song")
 
     def action_add_to_queue(self):
-        table = self.query_one("#results-table")
-        if table.row_count > 0 and table.cursor_row is not None:
-            row_key = table.coordinate_to_cell_key(table.cursor_coordinate).row_key
-            video_id = row_key.value
-            song = self.results_data.get(video_id)
+        video_id = self.query_one("#results-table").selected_id
+        if video_id and self.player is None:
+            self.notify("The player is still starting", severity="warning")
+        elif video_id:
+            song = self.track_for(video_id)
             if song:
-                self.player.enqueue(f"https://music.youtube.com/watch?v={video_id}")
-                self.queued_songs.append(song)
-                self.update_queue_ui()
-                self.notify(f"Added to queue: {song.get('title')}")
+                if self.player.enqueue(f"https://music.youtube.com/watch?v={video_id}") is None:
+                    self.notify("Queueing needs mpv", severity="error")
+                    return
+                self.notify(f"Added to queue: {song.title}")
 
     def action_remove_from_queue(self):
-        if not self.queued_songs:
+        last = self.queue.last() if self.queue is not None else None
+        if last is None:
             self.notify("Queue is already empty", severity="error")
             return
-        last_song = self.queued_songs.pop()
-        video_id = last_song.get('videoId')
-        if self.player.remove_from_queue(f"https://music.youtube.com/watch?v={video_id}"):
-            self.update_queue_ui()
-            next_up = self.queued_songs[0].get('title') if self.queued_songs else "None"
-            self.notify(f"Removed: {last_song.get('title')} | Next: {next_up}", severity="warning")
-        else:
-            self.queued_songs.append(last_song)
-            self.notify("Error removing song", severity="error")
+        self.queue.remove(last[0])
+        head = self.queue.first()
+        next_up = self.queue_title(head[1]) if head else "None"
+        self.notify(f"Removed: {self.queue_title(last[1])} | Next: {next_up}", severity="warning")
+
+    def action_shuffle_queue(self):
+        if self.queue is None or len(self.queue) < 2:
+            return
+        self.queue.shuffle()
+        self.notify("Queue shuffled")
 
     def action_toggle_liked(self):
-        """Toggles favorite status, enforcing API success first."""
+        """Toggles favorite status; YouTube is synced in the background."""
         video_id = self.current_track_id
         if not video_id:
-            table = self.query_one("#results-table")
-            # FIX: Ensure table has rows before checking cursor to avoid CellDoesNotExist
-            if table.row_count > 0 and table.cursor_row is not None:
-                video_id = table.coordinate_to_cell_key(table.cursor_coordinate).row_key.value
+            video_id = self.query_one("#results-table").selected_id
         
         if video_id:
-            song = self.results_data.get(video_id, {"title": "Unknown Song"})
-            self.toggle_like_async(video_id, song)
+            song = self.track_for(video_id)
+            self.toggle_like(video_id, song.as_dict() if song else {"title": "Unknown Song"})
         else:
             self.notify("No song selected", severity="error")
 
-    @work
-    async def toggle_like_async(self, video_id: str, song: dict):
-        """Async worker: API Call -> Then Local Save."""
+    def toggle_like(self, video_id: str, song: dict):
+        """Save the like locally right away; YouTube is updated in the background.
+
+        Runs on the UI loop without awaiting, so rapid toggles of the same
+        song always see the previous toggle's state.
+        """
         title = song.get("title", "Unknown")
         is_liked = video_id in self.local_favorites
-        
-        # 1. Optimistic UI feedback or "Syncing..."
-        action = "Removing..." if is_liked else "Liking..."
-        self.notify(f"{action} {title} (Syncing API...)", timeout=2.0)
-        
+
         try:
-            # 2. Call API
-            if is_liked:
-                await asyncio.to_thread(self.app.client.unlike_song, video_id)
-            else:
-                await asyncio.to_thread(self.app.client.like_song, video_id)
-            
-            # 3. On Authenticated Success: Update Local State
+            # Local state first (one-row WAL transaction), the API call is queued
             if is_liked:
-                del self.local_favorites[video_id]
+                self.local_favorites.remove(video_id)
                 self.notify(f"Removed from Favorites: {title}")
             else:
                 clean_song = {
                     "videoId": video_id,
                     "title": title,
-                    "artists": song.get("artists", [{"name": "Unknown"}])
+                    "artists": song.get("artists") or [{"name": "Unknown"}],
                 }
-                self.local_favorites[video_id] = clean_song
+                for key in ("album", "thumbnails"):
+                    if song.get(key):
+                        clean_song[key] = song[key]
+                self.local_favorites.add(video_id, clean_song)
+                self.app.client.remember_tracks([clean_song])
+                if self.player is not None:
+                    self.player.audio_cache.want(video_id)
                 self.notify(f"Added to Favorites: {title}")
-            
-            # 4. Persist
-            self.save_favorites()
-            
+            self.app.client.set_liked(video_id, not is_liked, is_liked)
         except Exception as e:
-            # 5. On Failure: Revert/Do nothing and Warn
-            logger.error(f"API Sync failed for {video_id}: {e}")
-            self.notify(f"Failed to sync with YouTube. Not saved locally.", severity="error")
-
-    def load_favorites(self):
-        """Load favorites as a dictionary of videoId -> metadata."""
-        if os.path.exists(self.favorites_file):
-            try:
-                with open(self.favorites_file, "r") as f:
-                    data = json.load(f)
-                    # Migration: If it was a list (IDs only) or set, return empty dict or try to fetch?
-                    # For now, if list, just convert to dict with unknown metadata to avoid crash
-                    if isinstance(data, list): 
-                        return {vid: {"title": "Unknown", "videoId": vid} for vid in data}
-                    return data # Expecting dict
-            except: return {}
-        return {}
-
-    def save_favorites(self):
-        """Save the favorites dictionary directly."""
-        with open(self.favorites_file, "w") as f:
-            json.dump(self.local_favorites, f)
+            logger.error(f"Saving favorite failed for {video_id}: {e}")
+            self.notify(f"Could not save favorite: {e}", severity="error")
+
+    def on_rating_result(self, video_id, rating, error):
+        """Called from the rating queue thread once a like is settled."""
+        # A rating queued before signing out fails for want of an account,
+        # which is what guest mode means; no need to say so on every like
+        if error is not None and self.app.client.auth_manager.has_account():
+            self.app.call_from_thread(
+                self.notify, f"Saved locally only, YouTube not updated: {error}", severity="warning"
+            )
 
-    @work(exclusive=True)
+    @work(exclusive=True, group="playlist-load")
     async def load_local_favorites_content(self):
         """Loads and displays the locally stored favorites."""
         try:
-            if not os.path.exists(self.favorites_file):
+            if not len(self.local_favorites):
                 self.notify("No local favorites yet.")
                 return
-            
+
             # local_favorites is now the master source of truth
-            favs = self.local_favorites
-            
-            tracks = []
-            for vid, song in favs.items():
-                song["videoId"] = vid
-                tracks.append(song)
-                self.results_data[vid] = song
-            
+            tracks = await asyncio.to_thread(self.local_favorites.tracks)
+            self.app.client.remember_tracks(
+                [t for t in tracks if t.get("title", "Unknown") != "Unknown"]
+            )
+
+            self.current_search_query = ""
             self.populate_table(tracks)
             self.notify(f"Loaded {len(tracks)} favorites.")
         except Exception as e:
@@ -622,10 +840,7 @@ class PlayerScreen(Screen):
         
         # 2. Fallback: if no song playing, get the highlighted row in the table
         if not video_id:
-            table = self.query_one("#results-table")
-            if table.cursor_row is not None:
-                row_key = table.coordinate_to_cell_key(table.cursor_coordinate).row_key
-                video_id = row_key.value
+            video_id = self.query_one("#results-table").selected_id
 
         if video_id:
             url = f"https://music.youtube.com/watch?v={video_id}"